@@ -6,9 +6,66 @@ load_dotenv()
 
 class Settings:
     MONGO_URI = os.getenv("MONGO_URI")
+    # MongoDB 커넥션 풀 / 타임아웃(ms, 0이면 드라이버 기본값) / 압축(설치된 것만 사용)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_MAX_CONNECTING = int(os.getenv("MONGO_MAX_CONNECTING", "2"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0"))
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+    # 시작 시 인덱스 적용 / 개발용 seed 데이터 생성 (운영에서는 seed 끄기)
+    APPLY_INDEXES_ON_STARTUP = os.getenv("APPLY_INDEXES_ON_STARTUP", "true").lower() == "true"
+    SEED_DATABASE = os.getenv("SEED_DATABASE", "false").lower() == "true"
+    # GET /metrics (Prometheus) 및 요청 지표 미들웨어
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # 요청별 Mongo 명령 수/시간을 Server-Timing 헤더로 (off | header: DB_PROFILE_HEADER가 있는 요청만 | always)
+    DB_PROFILE = os.getenv("DB_PROFILE", "off").lower()
+    DB_PROFILE_HEADER = os.getenv("DB_PROFILE_HEADER", "X-DB-Profile")
+    # 한 요청에서 같은 컬렉션/명령이 이 횟수 이상이면 N+1 의심 경고
+    DB_PROFILE_REPEAT_THRESHOLD = int(os.getenv("DB_PROFILE_REPEAT_THRESHOLD", "5"))
+    # 느린 Mongo 명령 로그 기준(ms, 0이면 끔) / find·aggregate explain 표본 비율 / 분당 explain 상한
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "1.0"))
+    SLOW_QUERY_EXPLAINS_PER_MINUTE = int(os.getenv("SLOW_QUERY_EXPLAINS_PER_MINUTE", "10"))
+    # 목록 조회(GET) 라우트의 읽기 설정 (primary, secondaryPreferred, nearest 등)
+    MONGO_LIST_READ_PREFERENCE = os.getenv("MONGO_LIST_READ_PREFERENCE", "primary")
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+    # Google OAuth HTTP 클라이언트 타임아웃(초) / 커넥션 수, JWKS 기본 캐시 시간(초)
+    GOOGLE_HTTP_CONNECT_TIMEOUT = float(os.getenv("GOOGLE_HTTP_CONNECT_TIMEOUT", "3.0"))
+    GOOGLE_HTTP_READ_TIMEOUT = float(os.getenv("GOOGLE_HTTP_READ_TIMEOUT", "5.0"))
+    GOOGLE_HTTP_MAX_CONNECTIONS = int(os.getenv("GOOGLE_HTTP_MAX_CONNECTIONS", "20"))
+    GOOGLE_JWKS_TTL = int(os.getenv("GOOGLE_JWKS_TTL", "3600"))
     JWT_SECRET = os.getenv("JWT_SECRET")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
+    # 검증된 JWT 캐시 크기 (0이면 비활성화)
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    # 카테고리 캐시 버전 확인 주기 (초)
+    CATEGORY_CACHE_CHECK_INTERVAL = float(os.getenv("CATEGORY_CACHE_CHECK_INTERVAL", "1.0"))
+    # 게시글 카운터 쓰기 합치기 (opt-in)
+    COUNTER_BUFFER_ENABLED = os.getenv("COUNTER_BUFFER_ENABLED", "false").lower() == "true"
+    COUNTER_FLUSH_INTERVAL_MS = int(os.getenv("COUNTER_FLUSH_INTERVAL_MS", "500"))
+    COUNTER_FLUSH_MAX_EVENTS = int(os.getenv("COUNTER_FLUSH_MAX_EVENTS", "1000"))
+    # 이미지 업로드 (최대 크기 / 청크 크기, 바이트)
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    # 참조 없는 업로드 정리 주기 / 유예 시간 (초, 주기가 0이면 비활성화)
+    UPLOAD_GC_INTERVAL = float(os.getenv("UPLOAD_GC_INTERVAL", "600"))
+    UPLOAD_GC_GRACE_SECONDS = int(os.getenv("UPLOAD_GC_GRACE_SECONDS", "3600"))
+    # 썸네일 등 파생 이미지 생성 프로세스 풀 크기 / 대기열 길이 (풀 크기 0이면 비활성화)
+    IMAGE_POOL_SIZE = int(os.getenv("IMAGE_POOL_SIZE", "2"))
+    IMAGE_QUEUE_DEPTH = int(os.getenv("IMAGE_QUEUE_DEPTH", "100"))
+    # 게시글 검색 색인 동기화 주기 (초, 0이면 다른 워커의 쓰기를 반영하지 않음)
+    SEARCH_SYNC_INTERVAL = float(os.getenv("SEARCH_SYNC_INTERVAL", "30"))
+    # 검색 색인에 담는 최근 공개 게시글 수 (워커마다 메모리에 올라감, 게시글 10만 건당 수백 MB)
+    SEARCH_MAX_POSTS = int(os.getenv("SEARCH_MAX_POSTS", "200000"))
+    # 색인 범위보다 오래된 게시글 검색(Mongo 정규식 조회) 시간 상한 (ms)
+    SEARCH_FALLBACK_MAX_TIME_MS = int(os.getenv("SEARCH_FALLBACK_MAX_TIME_MS", "200"))
+    # 인기(hot) 점수 감쇠 갱신 주기(초, 0이면 비활성화) / 갱신 대상 기간(시간, 이보다 오래된 글은 0점)
+    HOT_SWEEP_INTERVAL = float(os.getenv("HOT_SWEEP_INTERVAL", "300"))
+    HOT_WINDOW_HOURS = int(os.getenv("HOT_WINDOW_HOURS", "72"))
 
 settings = Settings()
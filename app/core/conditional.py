@@ -0,0 +1,43 @@
+import hashlib
+from typing import Callable, List, Optional
+from fastapi import HTTPException, Request, Response
+from app.core.versions import get_version, get_versions
+
+def make_etag(version_key: str, version, query: str = "") -> str:
+    """컬렉션 버전 + 쿼리 문자열로 ETag 생성 (같은 버전이라도 쿼리가 다르면 다른 응답)"""
+    query_hash = hashlib.sha1(query.encode(), usedforsecurity=False).hexdigest()[:12]
+    return f'W/"{version_key}-{version}-{query_hash}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되어 있는지 확인 (약한 비교)"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def conditional_get(*version_keys: str, on_versions: Optional[Callable[[List[int]], None]] = None):
+    """목록 조회용 의존성: 컬렉션 버전이 그대로면 데이터 컬렉션을 조회하지 않고 304 반환
+
+    사용 예: @router.get("/", dependencies=[Depends(conditional_get("posts"))])
+    여러 컬렉션에 의존하는 응답은 키를 여러 개 넘긴다 (하나라도 바뀌면 다른 ETag).
+    쓰기 경로에서는 bump_version(version_key)로 버전을 올려야 한다.
+    응답 본문을 캐시에서 만드는 라우트는 on_versions로 읽은 버전을 캐시에 알려, ETag보다 오래된 본문을
+    보내지 않게 한다 (다른 워커의 쓰기를 캐시 확인 주기보다 먼저 반영).
+    """
+    version_key = "+".join(version_keys)
+
+    async def dependency(request: Request, response: Response):
+        if len(version_keys) == 1:
+            versions = [await get_version(version_keys[0])]
+        else:
+            versions = await get_versions(list(version_keys))
+        if on_versions is not None:
+            on_versions(versions)
+        etag = make_etag(version_key, ".".join(map(str, versions)), request.url.query)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -1,62 +1,159 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import importlib.util
+import logging
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from app.config import settings
 from bson import ObjectId
 from datetime import datetime
+from app.core.indexes import apply_indexes
+from app.core.pool_stats import pool_stats
+from app.core.metrics import command_metrics
+from app.core.profiler import query_profiler
+from app.core.slow_queries import slow_query_log
 
-# ✅ MongoDB 연결
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client["safari_db"]
+logger = logging.getLogger(__name__)
+
+DATABASE_NAME = "safari_db"
+# 압축 방식별 필요한 모듈 (설치되지 않은 방식은 건너뜀)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+_client: Optional[AsyncIOMotorClient] = None
+_collections: Dict[Tuple[str, Optional[str]], object] = {}
+# ✅ 요청(라우트)별 읽기 설정: read_preference() 의존성이 설정
+_route_read_preference: ContextVar[Optional[str]] = ContextVar("route_read_preference", default=None)
+
+def available_compressors(names: str) -> list:
+    """MONGO_COMPRESSORS("zstd,snappy,zlib") 중 모듈이 설치된 것만 순서대로"""
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    return [name for name in selected if name in _COMPRESSOR_MODULES and importlib.util.find_spec(_COMPRESSOR_MODULES[name])]
+
+def client_options() -> dict:
+    """Settings의 풀/타임아웃/압축 설정을 AsyncIOMotorClient 옵션으로 변환"""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxConnecting": settings.MONGO_MAX_CONNECTING,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "event_listeners": [pool_stats, command_metrics, query_profiler, slow_query_log],
+    }
+    if settings.MONGO_MAX_IDLE_TIME_MS:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    compressors = available_compressors(settings.MONGO_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+def connect_database() -> AsyncIOMotorClient:
+    """MongoDB 클라이언트 생성 (lifespan 시작 시 호출, 이미 있으면 그대로 사용)"""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(settings.MONGO_URI, **client_options())
+        _collections.clear()
+    return _client
+
+def close_database():
+    """lifespan 종료 시 클라이언트와 커넥션 풀 정리"""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+        _collections.clear()
+
+def get_database() -> AsyncIOMotorDatabase:
+    """현재 DB (lifespan 밖의 스크립트/테스트에서는 처음 사용할 때 연결)"""
+    return connect_database()[DATABASE_NAME]
+
+def _get_collection(name: str, mode: Optional[str]):
+    key = (name, mode)
+    collection = _collections.get(key)
+    if collection is None:
+        database = get_database()
+        if mode is None:
+            collection = database[name]
+        else:
+            preference = make_read_preference(read_pref_mode_from_name(mode), None)
+            collection = database.get_collection(name, read_preference=preference)
+        _collections[key] = collection
+    return collection
+
+class CollectionProxy:
+    """모듈 수준에서 import하는 컬렉션 (클라이언트가 lifespan에서 만들어지므로 사용할 때 실제 컬렉션을 찾음)"""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(_get_collection(self.name, _route_read_preference.get()), attr)
+
+    def __repr__(self):
+        return f"CollectionProxy({self.name!r})"
+
+def read_preference(mode: str):
+    """라우트 의존성: 이 요청의 조회를 mode(예: "secondaryPreferred")로 읽음
+
+    사용 예: @router.get("/", dependencies=[Depends(read_preference("secondaryPreferred"))])
+    """
+    read_pref_mode_from_name(mode)  # ✅ 잘못된 이름은 라우트 정의 시점에 ValueError
+
+    async def dependency():
+        _route_read_preference.set(None if mode == "primary" else mode)
+
+    return dependency
+
+# ✅ 목록 조회 라우트 공통 읽기 설정 (MONGO_LIST_READ_PREFERENCE)
+list_read_preference = read_preference(settings.MONGO_LIST_READ_PREFERENCE)
 
 # ✅ 컬렉션 정의
-users_collection = db["users"]
-posts_collection = db["posts"]
-comments_collection = db["comments"]
-categories_collection = db["categories"]
-programs_collection = db["programs"]
-presets_collection = db["presets"]
+users_collection = CollectionProxy("users")
+posts_collection = CollectionProxy("posts")
+comments_collection = CollectionProxy("comments")
+categories_collection = CollectionProxy("categories")
+programs_collection = CollectionProxy("programs")
+presets_collection = CollectionProxy("presets")
+uploads_collection = CollectionProxy("uploads")  # 업로드 파일(내용 해시) 참조 수
+versions_collection = CollectionProxy("versions")  # 캐시 무효화용 컬렉션별 버전 문서
+post_deletions_collection = CollectionProxy("post_deletions")  # 삭제된 게시글 기록 (다른 워커의 검색 색인 동기화용, TTL)
 
-async def initialize_database():
-    """DB 초기화 및 컬렉션 생성 (필요한 경우 인덱스 추가)"""
-    existing_collections = await db.list_collection_names()
-
-    # ✅ 기본 "미분류" 카테고리 추가
-    uncategorized = await categories_collection.find_one({"name": "미분류"})
-    if not uncategorized:
-        inserted = await categories_collection.insert_one({"name": "미분류", "created_by": "system"})
-        uncategorized_id = inserted.inserted_id  # ✅ 새로 생성 시 ObjectId 저장
-        print(f"✅ 기본 '미분류' 카테고리 추가됨 (ID: {uncategorized_id})")
-    else:
-        uncategorized_id = uncategorized["_id"]  # ✅ 기존 ObjectId 유지
-
-    # ✅ 기본 유저 추가
-    existing_user = await users_collection.find_one({"email": "testuser@example.com"})
-    if not existing_user:
-        user_id = await users_collection.insert_one({
-            "email": "testuser@example.com",
+async def _upsert_seed(collection, query: dict, document: dict) -> ObjectId:
+    """seed 문서를 없을 때만 만들고 _id 반환 (있으면 건드리지 않음, 왕복 1회)"""
+    seeded = await collection.find_one_and_update(
+        query, {"$setOnInsert": document}, upsert=True, projection={"_id": 1}, return_document=ReturnDocument.AFTER
+    )
+    return seeded["_id"]
+
+async def seed_database():
+    """개발/테스트용 기본 데이터 (미분류 카테고리, 테스트 유저/프로그램/게시글/댓글/프리셋)
+
+    서로 참조하지 않는 문서는 동시에 upsert해서 왕복 단계를 3번으로 줄인다.
+    """
+    now = datetime.utcnow()
+    # 1단계: 다른 문서가 참조하는 카테고리 / 유저
+    uncategorized_id, user_id = await asyncio.gather(
+        _upsert_seed(categories_collection, {"name": "미분류"}, {"created_by": "system"}),
+        _upsert_seed(users_collection, {"email": "testuser@example.com"}, {
             "name": "테스트 유저",
-            "created_at": datetime.utcnow(),
-            "oauth_provider": "google"
-        })
-        user_id = user_id.inserted_id  # ✅ ObjectId 저장
-        print(f"✅ 테스트 유저 추가 완료 (ID: {user_id})")
-    else:
-        user_id = existing_user["_id"]
-
-    # ✅ 기본 프로그램 추가
-    existing_program = await programs_collection.find_one({"name": "테스트 프로그램"})
-    if not existing_program:
-        program_id = await programs_collection.insert_one({
-            "name": "테스트 프로그램",
-            "category_id": uncategorized_id,
-            "created_by": "testuser@example.com"
-        })
-        print(f"✅ 테스트 프로그램 추가 완료 (ID: {program_id.inserted_id})")
-
-    # ✅ 기본 게시글 추가
-    existing_post = await posts_collection.find_one({"title": "테스트 게시글"})
-    if not existing_post:
-        inserted_post = await posts_collection.insert_one({
-            "title": "테스트 게시글",
+            "created_at": now,
+            "oauth_provider": "google",
+        }),
+    )
+    # 2단계: 프로그램 / 게시글 / 프리셋
+    _, post_id, _ = await asyncio.gather(
+        programs_collection.update_one(
+            {"name": "테스트 프로그램"},
+            {"$setOnInsert": {"category_id": uncategorized_id, "created_by": "testuser@example.com"}},
+            upsert=True,
+        ),
+        _upsert_seed(posts_collection, {"title": "테스트 게시글"}, {
             "content": "MongoDB 초기화 테스트 중",
             "author_id": user_id,
             "category_id": uncategorized_id,
@@ -65,37 +162,32 @@ async def initialize_database():
             "dislike_count": 0,
             "comment_count": 0,
             "scrap_count": 0,
-            "created_at": datetime.utcnow()
-        })
-        post_id = inserted_post.inserted_id  # ✅ inserted_id 저장
-        print(f"✅ 테스트 게시글 추가 완료 (ID: {post_id})")
-    else:
-        post_id = existing_post["_id"]  # ✅ 기존 ObjectId 유지
-
-    # ✅ 기본 댓글 추가 (수정된 부분)
-    existing_comment = await comments_collection.find_one({"content": "테스트 댓글"})
-    if not existing_comment:
-        inserted_comment = await comments_collection.insert_one({
+            "created_at": now,
+        }),
+        presets_collection.update_one(
+            {"user_id": user_id},
+            {"$setOnInsert": {"name": "기본 프리셋", "categories": [], "created_at": now}},
+            upsert=True,
+        ),
+    )
+    # 3단계: 댓글
+    await comments_collection.update_one(
+        {"content": "테스트 댓글"},
+        {"$setOnInsert": {
             "post_id": post_id,
             "author_id": user_id,
-            "content": "테스트 댓글",
             "like_count": 0,
             "dislike_count": 0,
-            "created_at": datetime.utcnow()
-        })
-        print(f"✅ 테스트 댓글 추가 완료 (ID: {inserted_comment.inserted_id})")
-    else:
-        print(f"✅ 테스트 댓글 이미 있음 (ID: {existing_comment['_id']})")
-
-    # ✅ 기본 프리셋 추가
-    existing_preset = await presets_collection.find_one({"user_id": user_id})
-    if not existing_preset:
-        preset_id = await presets_collection.insert_one({
-            "user_id": user_id,
-            "name": "기본 프리셋",
-            "categories": [],
-            "created_at": datetime.utcnow()
-        })
-        print(f"✅ 기본 프리셋 추가 완료 (ID: {preset_id.inserted_id})")
-    else:
-        print(f"✅ 기본 프리셋 이미 있음 (ID: {existing_preset['_id']})")
+            "created_at": now,
+        }},
+        upsert=True,
+    )
+    logger.info("Seed data ready (uncategorized=%s, user=%s, post=%s)", uncategorized_id, user_id, post_id)
+
+async def initialize_database():
+    """DB 초기화: 인덱스 레지스트리 적용, seed 데이터는 SEED_DATABASE가 켜져 있을 때만"""
+    if settings.APPLY_INDEXES_ON_STARTUP:
+        # ✅ 인덱스 레지스트리 적용 (누락된 인덱스 생성 + 드리프트 로그)
+        await apply_indexes(get_database())
+    if settings.SEED_DATABASE:
+        await seed_database()
@@ -0,0 +1,50 @@
+import io
+import os
+from typing import Dict, Tuple
+from PIL import Image, ImageOps
+
+# ✅ 파생 이미지 정의: 이름 → (긴 변 최대 픽셀, 최대 바이트)
+VARIANTS: Dict[str, Tuple[int, int]] = {
+    "thumb": (320, 40 * 1024),
+    "medium": (1280, 250 * 1024),
+}
+JPEG_QUALITIES = (85, 75, 65, 55, 45, 35)
+
+def variant_filename(blob_name: str, variant: str) -> str:
+    """원본 파일 이름("<hash>.png")에서 파생 이미지 파일 이름("<hash>.thumb.jpg") 생성"""
+    return f"{blob_name.split('.', 1)[0]}.{variant}.jpg"
+
+def _encode_within_budget(image: Image.Image, max_bytes: int) -> bytes:
+    """품질을 낮춰가며 max_bytes 이하가 되는 JPEG 생성 (끝까지 넘으면 최저 품질 결과 사용)"""
+    data = b""
+    for quality in JPEG_QUALITIES:
+        buffer = io.BytesIO()
+        # exif를 넘기지 않으므로 메타데이터(EXIF/GPS)는 저장되지 않음
+        image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        data = buffer.getvalue()
+        if len(data) <= max_bytes:
+            break
+    return data
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def render_variants(source_path: str, folder: str, blob_name: str) -> Dict[str, str]:
+    """원본 이미지로 파생 이미지를 만들고 {variant: 파일 이름} 반환 (프로세스 풀에서 실행)"""
+    results = {}
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)  # ✅ EXIF 회전 정보를 픽셀에 반영한 뒤 EXIF 제거
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        for variant, (max_side, max_bytes) in VARIANTS.items():
+            filename = variant_filename(blob_name, variant)
+            path = os.path.join(folder, filename)
+            if not os.path.exists(path):  # ✅ 같은 원본(내용 해시)은 한 번만 생성
+                resized = image.copy()
+                resized.thumbnail((max_side, max_side), Image.LANCZOS)
+                _write_atomic(path, _encode_within_budget(resized, max_bytes))
+            results[variant] = filename
+    return results
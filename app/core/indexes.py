@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Dict, List, Tuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# ✅ 컬렉션별 인덱스 정의 (이 목록이 인덱스의 단일 기준)
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="users_email_unique", unique=True),
+    ],
+    "posts": [
+        IndexModel(
+            [("is_public", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="posts_public_feed",
+        ),
+        IndexModel(
+            [("is_public", ASCENDING), ("hot_score", DESCENDING), ("_id", DESCENDING)],
+            name="posts_public_hot",
+        ),
+        IndexModel(
+            [("preset_id", ASCENDING), ("is_public", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="posts_preset_feed",
+        ),
+        IndexModel([("updated_at", ASCENDING)], name="posts_updated_at"),  # 검색 색인 동기화
+    ],
+    "categories": [
+        # seed/중복 확인은 name(+created_by)으로 조회. created_by만으로 찾는 조회는 없음
+        # (카테고리 목록/이름 조회는 CategoryCatalog가 메모리에서 처리하므로 created_by 단독 인덱스는 두지 않음)
+        IndexModel([("name", ASCENDING), ("created_by", ASCENDING)], name="categories_name_created_by"),
+    ],
+    "programs": [
+        IndexModel([("category_id", ASCENDING)], name="programs_category_id"),
+    ],
+    "uploads": [
+        IndexModel([("refcount", ASCENDING), ("unreferenced_at", ASCENDING)], name="uploads_gc"),
+    ],
+    "post_deletions": [
+        IndexModel([("deleted_at", ASCENDING)], name="post_deletions_ttl", expireAfterSeconds=86400),
+    ],
+    "presets": [
+        IndexModel([("user_id", ASCENDING)], name="presets_user_id"),
+        IndexModel([("created_by", ASCENDING)], name="presets_created_by"),
+    ],
+}
+
+# 인덱스 정의 비교 시 확인하는 옵션
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+def _normalize_key(key) -> List[Tuple[str, object]]:
+    """인덱스 key를 비교 가능한 형태로 변환 (1.0 → 1)"""
+    items = key.items() if isinstance(key, dict) else key
+    return [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in items]
+
+def _options(spec: dict) -> dict:
+    return {option: spec.get(option, False if option in ("unique", "sparse") else None) for option in _COMPARED_OPTIONS}
+
+def diff_indexes(expected: List[IndexModel], existing: dict):
+    """정의된 인덱스와 실제 인덱스(index_information 결과)를 비교해 (누락, 정의 불일치) 반환"""
+    missing, different = [], []
+    for model in expected:
+        spec = model.document
+        current = existing.get(spec["name"])
+        if current is None:
+            missing.append(model)
+        elif _normalize_key(current["key"]) != _normalize_key(spec["key"]) or _options(current) != _options(spec):
+            different.append(model)
+    return missing, different
+
+async def check_indexes(database) -> Dict[str, dict]:
+    """컬렉션별 인덱스 드리프트 확인 (문제 있는 컬렉션만 반환)"""
+    report = {}
+    existing_collections = set(await database.list_collection_names())
+    # ✅ 컬렉션별 인덱스 정보는 동시에 조회
+    names = [name for name in INDEXES if name in existing_collections]
+    informations = dict(zip(names, await asyncio.gather(*(database[name].index_information() for name in names))))
+    for collection_name, expected in INDEXES.items():
+        existing = informations.get(collection_name, {})
+        missing, different = diff_indexes(expected, existing)
+        if missing or different:
+            report[collection_name] = {
+                "missing": [model.document["name"] for model in missing],
+                "different": [model.document["name"] for model in different],
+            }
+    return report
+
+async def apply_indexes(database):
+    """누락된 인덱스를 생성하고, 정의가 다른 인덱스는 로그로 알림"""
+    report = await check_indexes(database)
+    for collection_name, drift in report.items():
+        for name in drift["different"]:
+            # ✅ 정의가 다른 인덱스는 자동으로 삭제하지 않음 (운영자가 직접 처리)
+            logger.warning("Index drift on %s: '%s' differs from its definition", collection_name, name)
+        if drift["missing"]:
+            models = [model for model in INDEXES[collection_name] if model.document["name"] in drift["missing"]]
+            logger.info("Creating indexes on %s: %s", collection_name, ", ".join(drift["missing"]))
+            try:
+                await database[collection_name].create_indexes(models)
+            except OperationFailure as e:
+                # ✅ 같은 key의 인덱스가 다른 이름으로 있거나 unique 위반 데이터가 있는 경우
+                logger.error("Failed to create indexes on %s: %s", collection_name, e)
+    return report
+
+async def _main(argv) -> int:
+    parser = argparse.ArgumentParser(description="MongoDB 인덱스 확인/적용")
+    parser.add_argument("--check", action="store_true", help="인덱스를 만들지 않고 누락/불일치만 보고")
+    args = parser.parse_args(argv)
+
+    from app.core.database import get_database, close_database
+
+    try:
+        if not args.check:
+            await apply_indexes(get_database())
+            return 0
+        report = await check_indexes(get_database())
+    finally:
+        close_database()
+
+    for collection_name, drift in report.items():
+        for name in drift["missing"]:
+            print(f"❌ {collection_name}: missing index '{name}'")
+        for name in drift["different"]:
+            print(f"⚠️ {collection_name}: index '{name}' differs from its definition")
+    if not report:
+        print("✅ All indexes are up to date")
+    return 1 if report else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class Field:
+    """응답 필드 하나의 정의 (source: 원본 문서 키, 점(.)으로 중첩 키 지정 가능)"""
+    source: Optional[str] = None
+    convert: Optional[Callable[[Any], Any]] = None
+    default: Any = None
+    default_factory: Optional[Callable[[], Any]] = None
+
+def id_str(value) -> Optional[str]:
+    """ObjectId(또는 문자열 ID)를 문자열로, 비어 있으면 None"""
+    return str(value) if value else None
+
+def id_list(value) -> List[str]:
+    """ID 목록을 문자열 목록으로"""
+    return [str(item) for item in value] if value else []
+
+def as_datetime(value) -> Optional[datetime]:
+    """datetime은 그대로 두고(직렬화는 응답 클래스가 처리), ISO 문자열이면 datetime으로"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+# only()로 만든 필드 조합별 매퍼 보관 개수 (클라이언트가 ?fields= 조합으로 메모리를 늘리지 못하게)
+MAX_SUBSETS = 64
+
+class DocumentMapper:
+    """컬렉션 스키마를 한 번 선언하면, 문서 → 응답 dict 변환 함수를 코드로 생성해 한 번에 변환
+
+    문서 전체를 재귀적으로 훑지 않고, 선언된 필드만 고정된 식으로 읽는다.
+    """
+
+    def __init__(self, name: str, fields: Dict[str, Field]):
+        self.name = name
+        self.fields = dict(fields)
+        self._convert = self._compile(self.fields)
+        self._subsets: "OrderedDict[Tuple[str, ...], DocumentMapper]" = OrderedDict()
+
+    def _compile(self, fields: Dict[str, Field]) -> Callable[[dict], dict]:
+        namespace: Dict[str, Any] = {}
+        lines = []
+        for index, (name, spec) in enumerate(fields.items()):
+            source = spec.source or name
+            expr = self._source_expr(source, index, spec, namespace)
+            if spec.convert is not None:
+                namespace[f"_c{index}"] = spec.convert
+                expr = f"_c{index}({expr})"
+            lines.append(f"        {name!r}: {expr},")
+        code = "def map_document(doc):\n    get = doc.get\n    return {\n" + "\n".join(lines) + "\n    }\n"
+        exec(compile(code, f"<mapper {self.name}>", "exec"), namespace)
+        return namespace["map_document"]
+
+    @staticmethod
+    def _source_expr(source: str, index: int, spec: Field, namespace: dict) -> str:
+        head, *rest = source.split(".")
+        if spec.default_factory is not None:
+            namespace[f"_f{index}"] = spec.default_factory
+            expr = f"(get({head!r}) if {head!r} in doc else _f{index}())"
+        elif spec.default is not None:
+            namespace[f"_d{index}"] = spec.default
+            expr = f"get({head!r}, _d{index})"
+        else:
+            expr = f"get({head!r})"
+        for key in rest:  # ✅ 중첩 키: 중간 값이 없으면 None
+            expr = f"({expr} or {{}}).get({key!r})"
+        return expr
+
+    def __call__(self, doc: dict) -> dict:
+        return self._convert(doc)
+
+    def many(self, docs: Iterable[dict]) -> List[dict]:
+        convert = self._convert
+        return [convert(doc) for doc in docs]
+
+    def only(self, names: Iterable[str]) -> "DocumentMapper":
+        """id + 선택한 필드만 변환하는 매퍼 (필드 조합별로 한 번만 생성)
+
+        순서가 달라도 같은 조합이면 같은 매퍼 (선언 순서로 정규화), 최근 MAX_SUBSETS개 조합만 보관한다.
+        """
+        selected = set(names)
+        key = tuple(name for name in self.fields if name in selected and name != "id")
+        mapper = self._subsets.get(key)
+        if mapper is None:
+            fields = {"id": self.fields["id"], **{name: self.fields[name] for name in key}}
+            mapper = self._subsets[key] = DocumentMapper(f"{self.name}[{','.join(key)}]", fields)
+            if len(self._subsets) > MAX_SUBSETS:
+                self._subsets.popitem(last=False)
+        else:
+            self._subsets.move_to_end(key)
+        return mapper
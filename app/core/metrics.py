@@ -0,0 +1,243 @@
+import bisect
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+from pymongo import monitoring
+from app.core.pool_stats import pool_stats
+
+# ✅ Prometheus 텍스트 형식 지표 (GET /metrics)
+#
+# 기록은 스레드별 shard dict에만 쓰므로 lock이 없다 (이벤트 루프 스레드와 pymongo 스레드가 서로 막지 않음).
+# 수집(render_metrics) 시에만 shard를 합친다.
+
+_REGISTRY: List["_Metric"] = []
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        _REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        """현재 스레드 전용 {라벨 값 tuple: 값} (처음 기록할 때 생성)"""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            self._shards.append(values)  # list.append는 GIL 아래에서 원자적
+            return values
+
+    @abstractmethod
+    def _merged(self) -> Dict[tuple, object]:
+        """모든 shard를 합친 {라벨 값 tuple: 값}"""
+
+    def _sample_lines(self) -> List[str]:
+        merged = self._merged()
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(merged.items())
+        ]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._sample_lines()]
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _merged(self) -> Dict[tuple, float]:
+        totals: Dict[tuple, float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def value(self, labels: tuple = ()) -> float:
+        return self._merged().get(labels, 0)
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (shard 값: 버킷별 개수 + [+Inf 개수, 합계])"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: tuple, value: float):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect.bisect_left(self.buckets, value)] += 1  # ✅ le(이하) 버킷
+        entry[-1] += value
+
+    def _merged(self) -> Dict[tuple, list]:
+        totals: Dict[tuple, list] = {}
+        for shard in list(self._shards):
+            for labels, entry in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(entry))
+                for i, count in enumerate(list(entry)):
+                    total[i] += count
+        return totals
+
+    def _sample_lines(self) -> List[str]:
+        lines = []
+        for labels, entry in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), entry):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(entry[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+class CallbackMetric(_Metric):
+    """수집 시점에 함수로 값을 읽는 지표 (커넥션 풀 상태 등 이미 다른 곳에서 세는 값)"""
+
+    def __init__(self, name: str, documentation: str, kind: str, read: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.kind = kind
+        self.read = read
+
+    def _merged(self) -> Dict[tuple, float]:
+        return {(): self.read()}
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# ─── HTTP ────────────────────────────────────────────────────────────────
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+# 진행 중 요청 수: 미들웨어는 이벤트 루프 스레드에서만 돌므로 정수 하나로 충분
+_in_flight = 0
+CallbackMetric("http_requests_in_flight", "HTTP requests currently being served", "gauge", lambda: _in_flight)
+
+# ─── MongoDB ─────────────────────────────────────────────────────────────
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ("collection", "command"), buckets=DB_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter("mongodb_command_failures_total", "Failed MongoDB commands", ("collection", "command"))
+
+for _name, _kind, _key in (
+    ("mongodb_pool_open_connections", "gauge", "open_connections"),
+    ("mongodb_pool_checked_out", "gauge", "checked_out"),
+    ("mongodb_pool_waiting", "gauge", "waiting"),
+    ("mongodb_pool_checkouts_total", "counter", "checkouts"),
+    ("mongodb_pool_checkout_failures_total", "counter", "checkout_failures"),
+    ("mongodb_pool_clears_total", "counter", "pool_clears"),
+):
+    CallbackMetric(_name, f"Connection pool {_key.replace('_', ' ')}", _kind, lambda key=_key: pool_stats.snapshot()[key])
+
+# ─── 게시글 ──────────────────────────────────────────────────────────────
+POST_REACTIONS = Counter("post_reactions_total", "Post reactions", ("reaction",))
+POST_SCRAPS = Counter("post_scraps_total", "Post scrap count changes", ("action",))
+POST_UPLOADS = Counter("post_uploads_total", "Post image uploads (stored: new file, deduplicated: same content existed)", ("result",))
+POST_UPLOAD_BYTES = Counter("post_upload_bytes_written_total", "Bytes written to disk for post image uploads")
+
+# 표준 메서드 외에는 "OTHER"로 묶음 (임의의 메서드 이름으로 라벨이 늘지 않게)
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+def route_template(scope: dict) -> str:
+    """라우팅된 요청의 경로 템플릿 ("/post/{post_id}"), 라우트가 없으면 "<unmatched>" (라벨 수 제한)
+
+    FastAPI가 고른 라우트의 path_format을 그대로 쓴다. include_router prefix를 라우트에 복사하지 않는 FastAPI
+    버전에서는 라우팅 결과(effective route)에 prefix까지 포함된 path가 있으므로 그쪽을 우선한다.
+    """
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    template = getattr(effective, "path", None) or getattr(scope.get("route"), "path_format", None)
+    if template:
+        return template
+    if "app_root_path" in scope:  # ✅ Mount(/static)는 root_path에 prefix를 남김
+        return scope["root_path"] + "/{path}"
+    return "<unmatched>"
+
+class MetricsMiddleware:
+    """요청 수 / 지연 시간 / 진행 중 요청 수 기록 (순수 ASGI 미들웨어, 요청당 수 µs)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+        status = 500  # 응답 시작 전에 예외가 나면 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        global _in_flight
+        _in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            _in_flight -= 1
+            route = route_template(scope)
+            HTTP_REQUESTS.inc((method, route, str(status)))
+            HTTP_LATENCY.observe((method, route), duration)
+
+def command_collection(event) -> str:
+    """명령 대상 컬렉션 이름 (find/insert/aggregate 등은 명령 값, getMore는 collection 필드)"""
+    target = event.command.get(event.command_name)
+    if isinstance(target, str):
+        return target
+    collection = event.command.get("collection")
+    return collection if isinstance(collection, str) else "-"
+
+class CommandMetrics(monitoring.CommandListener):
+    """MongoDB 명령별 지연 시간 / 실패 수 (started에서 컬렉션을 기억해 두고 끝날 때 기록)"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event):
+        self._pending[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def succeeded(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_LATENCY.observe((collection, event.command_name), event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_LATENCY.observe((collection, event.command_name), event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.inc((collection, event.command_name))
+
+command_metrics = CommandMetrics()
@@ -0,0 +1,142 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+from app.config import settings
+from app.core.metrics import command_collection, route_template
+
+logger = logging.getLogger(__name__)
+
+# ✅ 요청 단위 Mongo 명령 기록 (DB_PROFILE=always, 또는 header 모드에서 X-DB-Profile 헤더가 있는 요청만)
+#
+# motor는 드라이버 호출 시 contextvar를 복사해 실행 스레드로 넘기므로, 요청에서 set한 프로파일 객체를
+# CommandListener(pymongo 스레드)에서도 그대로 볼 수 있다.
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+# 요청 프로파일이 끝날 때 호출 ("METHOD /route", 프로파일) → capture_query_profiles()가 사용
+_observers: List[Callable[[str, "QueryProfile"], None]] = []
+
+class QueryProfile:
+    """한 요청(또는 블록)에서 실행된 Mongo 명령 목록"""
+    __slots__ = ("commands",)
+
+    def __init__(self):
+        # (컬렉션, 명령, 소요 ms, 성공 여부) — 동시에 실행된 명령도 list.append라 안전
+        self.commands: List[Tuple[str, str, float, bool]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.commands)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(duration for _, _, duration, _ in self.commands)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """같은 컬렉션/명령이 threshold번 이상 반복된 경우 (N+1 의심)"""
+        counts = Counter(f"{collection}.{command}" for collection, command, _, _ in self.commands)
+        return [(key, count) for key, count in counts.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        counts = Counter(f"{collection}.{command}" for collection, command, _, _ in self.commands)
+        return ", ".join(f"{key} x{count}" for key, count in counts.most_common())
+
+    def server_timing(self, repeat_threshold: int) -> str:
+        """Server-Timing 헤더 값 (db: 명령 수/총 시간, db-repeat: 반복된 명령)"""
+        metrics = [f'db;dur={self.total_ms:.2f};desc="{self.count} commands"']
+        metrics += [f'db-repeat;desc="{key} x{count}"' for key, count in self.repeated(repeat_threshold)]
+        return ", ".join(metrics)
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """블록 안(같은 컨텍스트)에서 실행된 Mongo 명령 기록"""
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+@contextmanager
+def capture_query_profiles() -> Iterator[List[Tuple[str, QueryProfile]]]:
+    """블록 동안 끝난 요청별 프로파일 + 블록에서 직접 호출한 서비스의 프로파일("<direct>") 수집
+
+    TestClient는 앱을 다른 스레드에서 실행하므로 요청 프로파일은 observer로 받는다 (DB_PROFILE이 꺼져 있으면 요청은 기록되지 않음).
+    """
+    captured: List[Tuple[str, QueryProfile]] = []
+    observer = lambda label, profile: captured.append((label, profile))
+    _observers.append(observer)
+    try:
+        with profile_queries() as direct:
+            yield captured
+    finally:
+        _observers.remove(observer)
+        if direct.count:
+            captured.append(("<direct>", direct))
+
+class QueryProfiler(monitoring.CommandListener):
+    """프로파일이 켜진 컨텍스트에서 실행된 명령만 기록 (꺼져 있으면 contextvar 조회 한 번)"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[object, int], Tuple[QueryProfile, str]] = {}
+
+    def started(self, event):
+        profile = _current_profile.get()
+        if profile is not None:
+            self._pending[(event.connection_id, event.request_id)] = (profile, command_collection(event))
+
+    def succeeded(self, event):
+        self._finish(event, True)
+
+    def failed(self, event):
+        self._finish(event, False)
+
+    def _finish(self, event, ok: bool):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is not None:
+            profile, collection = pending
+            profile.commands.append((collection, event.command_name, event.duration_micros / 1000, ok))
+
+query_profiler = QueryProfiler()
+
+def _profile_requested(scope) -> bool:
+    mode = settings.DB_PROFILE
+    if mode == "always":
+        return True
+    if mode != "header":
+        return False
+    header = settings.DB_PROFILE_HEADER.lower().encode("latin-1")
+    return any(name == header for name, _ in scope["headers"])
+
+class QueryProfilerMiddleware:
+    """프로파일 대상 요청에 Server-Timing 헤더를 붙이고, 같은 명령이 반복되면 경고 로그 (N+1 탐지)
+
+    스트리밍 응답처럼 헤더를 보낸 뒤 실행되는 명령은 헤더에는 빠지고 로그/observer에만 반영된다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        threshold = settings.DB_PROFILE_REPEAT_THRESHOLD
+        with profile_queries() as profile:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", profile.server_timing(threshold))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                label = f"{scope['method']} {route_template(scope)}"
+                repeated = profile.repeated(threshold)
+                if repeated:
+                    logger.warning("Repeated DB commands on %s (%d commands): %s", label, profile.count, profile.summary())
+                for observer in list(_observers):
+                    observer(label, profile)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ✅ 인기 점수 = max(가중 반응 수, 0) / (경과 시간(시간) + 2) ^ GRAVITY (HN 방식)
+HOT_WEIGHTS = {"like_count": 1, "dislike_count": -1, "comment_count": 2, "scrap_count": 3}
+HOT_GRAVITY = 1.8
+HOT_SORT = [("hot_score", -1), ("_id", -1)]
+
+def hot_score(post: dict, now: Optional[datetime] = None) -> float:
+    """게시글 인기 점수 (hot_score_expression과 같은 계산)"""
+    now = now or datetime.utcnow()
+    points = sum(weight * (post.get(field) or 0) for field, weight in HOT_WEIGHTS.items())
+    age_hours = max((now - post["created_at"]).total_seconds(), 0) / 3600
+    return max(points, 0) / (age_hours + 2) ** HOT_GRAVITY
+
+def hot_score_expression() -> dict:
+    """서버에서 현재 시각($$NOW) 기준으로 hot_score를 계산하는 집계 식"""
+    points = {"$add": [
+        {"$multiply": [weight, {"$ifNull": [f"${field}", 0]}]} for field, weight in HOT_WEIGHTS.items()
+    ]}
+    age_hours = {"$divide": [{"$max": [{"$subtract": ["$$NOW", "$created_at"]}, 0]}, 3_600_000]}
+    return {"$divide": [{"$max": [points, 0]}, {"$pow": [{"$add": [age_hours, 2]}, HOT_GRAVITY]}]}
+
+def counter_update(deltas: Dict[str, int]) -> List[dict]:
+    """카운터 증감과 hot_score 재계산을 한 번에 하는 파이프라인 업데이트 ($inc 대신)"""
+    return [
+        {"$set": {field: {"$add": [{"$ifNull": [f"${field}", 0]}, delta]} for field, delta in deltas.items()}},
+        {"$set": {"hot_score": hot_score_expression()}},
+    ]
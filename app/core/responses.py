@@ -0,0 +1,36 @@
+from typing import Any, Optional
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(value: Any):
+    """orjson이 기본으로 처리하지 못하는 타입 변환 (datetime/dict/list는 orjson이 직접 처리)"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답 (datetime, ObjectId 지원)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def copy_dependency_headers(target: Response, response: Optional[Response]) -> Response:
+    """Response를 직접 반환하면 의존성에서 설정한 헤더(ETag 등)가 합쳐지지 않으므로 직접 복사"""
+    if response is not None:
+        target.headers.raw.extend(
+            (key, value) for key, value in response.headers.raw if key != b"content-length"
+        )
+    return target
+
+def trusted_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """서비스가 만든(형태가 보장된) 결과를 response_model 재검증 없이 바로 직렬화"""
+    return copy_dependency_headers(FastJSONResponse(content, status_code=status_code), response)
+
+def encoded_json(body: bytes, response: Optional[Response] = None) -> Response:
+    """이미 JSON으로 인코딩된 본문(캐시 등)을 그대로 응답"""
+    return copy_dependency_headers(Response(body, media_type="application/json"), response)
@@ -0,0 +1,150 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from itertools import islice
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+def words(text: str) -> List[str]:
+    """정규화(NFKC, 소문자)한 단어 목록"""
+    return _WORD_PATTERN.findall(unicodedata.normalize("NFKC", text or "").lower())
+
+def tokenize(text: str) -> List[str]:
+    """문자 bigram 토큰화 ("테스트 게시글" → 테스, 스트, 게시, 시글), 한 글자 단어는 그대로"""
+    tokens = []
+    for word in words(text):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+class InvertedIndex:
+    """bigram 역색인 + BM25 순위 (문서 추가/삭제를 점진적으로 반영)
+
+    삭제된 문서는 posting에 남겨 두고 조회 시 건너뛴다. 정리(compact_terms)는 호출하는 쪽에서
+    needs_compaction을 보고 term 묶음 단위로 나눠 실행한다 (이벤트 루프를 오래 막지 않게).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2, max_candidates: int = 5000):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.max_candidates = max_candidates
+        self._postings: Dict[str, Dict[int, int]] = {}  # term → {문서 번호: tf}
+        self._numbers: Dict[Hashable, int] = {}  # 문서 key → 문서 번호
+        self._docs: Dict[int, Tuple[Hashable, int]] = {}  # 문서 번호 → (key, 길이)
+        self._next_number = 0
+        self._total_length = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key) -> bool:
+        return key in self._numbers
+
+    def add(self, key: Hashable, title: str, content: str):
+        """문서 추가 (이미 있으면 교체)"""
+        self.remove(key)
+        counts = Counter(tokenize(content))
+        for term in tokenize(title):
+            counts[term] += self.title_weight  # ✅ 제목 일치에 가중치
+        length = sum(counts.values())
+        if not length:
+            return
+        number = self._next_number
+        self._next_number += 1
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[number] = tf
+        self._numbers[key] = number
+        self._docs[number] = (key, length)
+        self._total_length += length
+
+    def remove(self, key: Hashable):
+        number = self._numbers.pop(key, None)
+        if number is None:
+            return
+        _, length = self._docs.pop(number)
+        self._total_length -= length
+        self._dead += 1
+
+    def evict_oldest(self, count: int) -> List[Hashable]:
+        """가장 오래전에 색인된 문서 count개 제거하고 key 목록 반환 (색인 크기 상한 유지)"""
+        keys = [key for key, _ in islice(self._docs.values(), count)]
+        for key in keys:
+            self.remove(key)
+        return keys
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._dead > max(1000, len(self._docs))
+
+    def begin_compaction(self) -> List[str]:
+        """정리할 term 목록 (이후 삭제되는 문서는 다음 정리 대상으로 다시 셈)"""
+        self._dead = 0
+        return list(self._postings)
+
+    def compact_terms(self, terms: Iterable[str]):
+        """주어진 term들의 posting에서 삭제된 문서 정리"""
+        docs = self._docs
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            alive = {number: tf for number, tf in posting.items() if number in docs}
+            if alive:
+                self._postings[term] = alive
+            else:
+                del self._postings[term]
+
+    def compact(self):
+        """삭제된 문서의 posting 전체 정리"""
+        self.compact_terms(self.begin_compaction())
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[Hashable, float]], int]:
+        """질의의 모든 bigram을 포함하는 문서를 BM25 점수순으로 반환 ((key, 점수) 목록, 전체 일치 수)"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._docs:
+            return [], 0
+        postings = []
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                return [], 0
+            postings.append(posting)
+        postings.sort(key=len)  # ✅ 가장 드문 term부터 교집합
+
+        docs = self._docs
+        candidates = [number for number in postings[0] if number in docs]
+        for posting in postings[1:]:
+            candidates = [number for number in candidates if number in posting]
+            if not candidates:
+                return [], 0
+
+        total = len(candidates)
+        if total > self.max_candidates:
+            # ✅ 너무 넓은 질의는 최근 색인된 문서 max_candidates개만 점수 계산 (지연 상한)
+            candidates = candidates[-self.max_candidates:]
+
+        total_docs = len(docs)
+        average_length = self._total_length / total_docs
+        weights = [
+            (posting, math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5)))
+            for posting in postings
+        ]
+        k1, b = self.k1, self.b
+        scored = []
+        for number in candidates:
+            norm = k1 * (1 - b + b * docs[number][1] / average_length)
+            score = 0.0
+            for posting, idf in weights:
+                tf = posting[number]
+                score += idf * tf * (k1 + 1) / (tf + norm)
+            scored.append((score, number))
+
+        top = heapq.nlargest(offset + limit, scored)  # ✅ 같은 점수면 최근에 색인된 문서 먼저
+        return [(docs[number][0], score) for score, number in top[offset:]], total
@@ -1,6 +1,11 @@
+import time
+import hashlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Annotated, Optional
 from jose import jwt
-from fastapi import Request
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer
 from app.config import settings
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(hours=1)):
@@ -20,10 +25,75 @@ def decode_access_token(token: str):
     except Exception:
         return None
 
+class TokenCache:
+    """검증이 끝난 토큰의 payload를 보관하는 LRU (토큰 원문 대신 digest를 키로, 토큰의 exp까지만 유효)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: dict):
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.maxsize <= 0:
+            return  # ✅ 만료 시간이 없는 토큰은 캐시하지 않음
+        self._entries[self._key(token)] = (payload, expires_at)
+        self._entries.move_to_end(self._key(token))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+def verify_access_token(token: str) -> Optional[dict]:
+    """캐시를 거쳐 JWT 검증 (캐시에 없을 때만 서명 검증)"""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_access_token(token)
+        if payload:
+            token_cache.put(token, payload)
+    return payload
+
 def get_current_user(request: Request):
     """쿠키에서 JWT 토큰 자동 추출"""
     token = request.cookies.get("Authorization")
     if not token:
         return None
     token = token.replace("Bearer ", "")
-    return decode_access_token(token)
+    return verify_access_token(token)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+async def require_current_user(request: Request, bearer_token: Optional[str] = Depends(oauth2_scheme)) -> dict:
+    """Authorization 헤더(Bearer) 또는 Authorization 쿠키의 토큰으로 현재 사용자 payload 반환"""
+    token = bearer_token
+    if not token:
+        cookie = request.cookies.get("Authorization")
+        token = cookie.replace("Bearer ", "") if cookie else None
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+    payload = verify_access_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+# ✅ 라우트에서 `user: CurrentUser`로 사용
+CurrentUser = Annotated[dict, Depends(require_current_user)]
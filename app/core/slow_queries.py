@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import orjson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import monitoring
+from app.config import settings
+from app.core.metrics import CallbackMetric, Counter, command_collection
+
+logger = logging.getLogger(__name__)
+# ✅ explain 결과는 별도 로거로 (핸들러/레벨을 따로 지정할 수 있는 부채널)
+plan_logger = logging.getLogger(__name__ + ".plans")
+
+SLOW_QUERIES = Counter("mongodb_slow_queries_total", "MongoDB commands slower than SLOW_QUERY_MS", ("collection", "command"))
+
+# explain 대상 명령과, explain으로 감쌀 때 빼야 하는 세션/드라이버 필드
+_EXPLAINABLE = {"find", "aggregate"}
+_DRIVER_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern", "apiVersion", "apiStrict", "apiDeprecationErrors"}
+# 명령별 조건이 들어 있는 필드
+_FILTER_FIELDS = {"find": "filter", "aggregate": "pipeline", "count": "query", "distinct": "query", "findAndModify": "query"}
+_STATEMENT_FIELDS = {"update": "updates", "delete": "deletes"}
+
+def query_shape(value):
+    """값을 타입 이름으로 바꾼 조건 모양 ({"email": "a@b.c"} → {"email": "?str"}, 키와 연산자는 유지)
+
+    배열은 원소 모양의 중복을 없애 길이가 달라도 같은 모양이 되게 한다 ($in 목록 등).
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return f"?{type(value).__name__}"
+
+def command_filter(command_name: str, command: dict):
+    """명령에서 조건 부분 (update/delete는 문장별 q 목록)"""
+    field = _FILTER_FIELDS.get(command_name)
+    if field:
+        return command.get(field)
+    field = _STATEMENT_FIELDS.get(command_name)
+    if field:
+        return [statement.get("q") for statement in command.get(field) or ()]
+    return None
+
+def returned_count(reply: dict) -> Optional[int]:
+    """응답 문서 수 (커서 명령은 이번 배치 크기, 쓰기는 n)"""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if batch is not None:
+            return len(batch)
+    n = reply.get("n")
+    return n if isinstance(n, int) else None
+
+def summarize_plan(explain: dict) -> dict:
+    """executionStats explain에서 로그에 남길 값만 (선택된 계획의 stage 목록, 검사한 키/문서 수)"""
+    stats = explain.get("executionStats") or {}
+    planner = explain.get("queryPlanner") or {}
+    if not stats and explain.get("stages"):  # aggregate: 첫 stage($cursor)에 find 단계 정보
+        cursor_stage = explain["stages"][0].get("$cursor", {})
+        stats = cursor_stage.get("executionStats") or {}
+        planner = cursor_stage.get("queryPlanner") or {}
+    stages = []
+    plan = planner.get("winningPlan") or {}
+    plan = plan.get("queryPlan", plan)
+    while plan:
+        stage = plan.get("stage")
+        stages.append(f"{stage}({plan['indexName']})" if plan.get("indexName") else stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return {
+        "stages": stages,
+        "n_returned": stats.get("nReturned"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "execution_ms": stats.get("executionTimeMillis"),
+    }
+
+class SlowQueryLog(monitoring.CommandListener):
+    """SLOW_QUERY_MS보다 오래 걸린 명령을 구조화된 로그로 남기고, find/aggregate는 explain을 비동기로 수집
+
+    - 조건 값은 타입 이름으로 가림 (모양만 기록)
+    - explain은 같은 모양(컬렉션+명령+조건 모양)당 한 번, 표본 비율과 분당 상한 안에서만 실행
+    - 리스너는 pymongo 스레드에서 호출되므로 explain 작업은 이벤트 루프의 큐로 넘긴다
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float, explains_per_minute: int, queue_depth: int = 100, seen_shapes: int = 1000):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.explains_per_minute = explains_per_minute
+        self.queue_depth = queue_depth
+        self.seen_shapes = seen_shapes
+        self._pending: Dict[Tuple[object, int], Tuple[str, dict]] = {}
+        self._explained: "OrderedDict[str, None]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._database: Optional[AsyncIOMotorDatabase] = None
+        self._window_started = 0.0
+        self._window_explains = 0
+        self.stats = {"slow": 0, "explained": 0, "deduplicated": 0, "rate_limited": 0, "dropped": 0, "failed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    async def start(self, database: AsyncIOMotorDatabase):
+        """explain 작업자 시작 (시작하지 않으면 느린 명령 로그만 남음)"""
+        if self._worker is not None or not self.enabled or self.explains_per_minute <= 0:
+            return
+        self._database = database
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._worker = asyncio.create_task(self._work())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        self._loop = None
+        self._queue = None
+        self._database = None
+
+    def started(self, event):
+        if self.enabled:
+            self._pending[(event.connection_id, event.request_id)] = (command_collection(event), event.command)
+
+    def succeeded(self, event):
+        self._finish(event, event.reply)
+
+    def failed(self, event):
+        self._finish(event, None)
+
+    def _finish(self, event, reply: Optional[dict]):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+        collection, command = pending
+        command_name = event.command_name
+        shape = query_shape(command_filter(command_name, command))
+        entry = {
+            "collection": collection,
+            "command": command_name,
+            "filter_shape": shape,
+            "sort": command.get("sort"),
+            "duration_ms": round(duration_ms, 2),
+            "returned": returned_count(reply) if reply is not None else None,
+            "failed": reply is None,
+        }
+        self.stats["slow"] += 1
+        SLOW_QUERIES.inc((collection, command_name))
+        logger.warning("Slow MongoDB command %s", orjson.dumps(entry, default=str).decode())
+        if command_name in _EXPLAINABLE and reply is not None:
+            shape_key = orjson.dumps([collection, command_name, shape, command.get("sort")], default=str).decode()
+            self._schedule_explain(shape_key, event.database_name, command)
+
+    def _schedule_explain(self, shape_key: str, database_name: str, command: dict):
+        loop = self._loop
+        if loop is None:
+            return
+        if shape_key in self._explained:
+            # ✅ LRU 순서 갱신은 이벤트 루프에서만 (OrderedDict를 두 스레드에서 바꾸지 않게)
+            self._call_soon(loop, self._touch, shape_key)
+            return
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        explain_command = {key: value for key, value in command.items() if key not in _DRIVER_FIELDS}
+        self._call_soon(loop, self._enqueue, (shape_key, database_name, explain_command))
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback, argument):
+        try:
+            loop.call_soon_threadsafe(callback, argument)
+        except RuntimeError:  # 루프가 이미 닫힘
+            pass
+
+    def _enqueue(self, job):
+        if self._queue is None:
+            return
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+
+    def _take_explain_slot(self) -> bool:
+        """분당 explain 상한 (이벤트 루프에서만 호출)"""
+        now = time.monotonic()
+        if now - self._window_started >= 60:
+            self._window_started = now
+            self._window_explains = 0
+        if self._window_explains >= self.explains_per_minute:
+            return False
+        self._window_explains += 1
+        return True
+
+    def _touch(self, shape_key: str):
+        """이미 explain한 모양을 가장 최근 사용으로 (이벤트 루프에서만 호출)"""
+        if shape_key in self._explained:
+            self._explained.move_to_end(shape_key)
+
+    def _remember(self, shape_key: str):
+        self._explained[shape_key] = None
+        if len(self._explained) > self.seen_shapes:
+            self._explained.popitem(last=False)
+
+    async def _work(self):
+        while True:
+            shape_key, database_name, command = await self._queue.get()
+            try:
+                if shape_key in self._explained:
+                    self._explained.move_to_end(shape_key)
+                    self.stats["deduplicated"] += 1
+                    continue
+                if not self._take_explain_slot():
+                    self.stats["rate_limited"] += 1
+                    continue
+                self._remember(shape_key)
+                database = self._database.client[database_name]
+                explain = await database.command({"explain": command, "verbosity": "executionStats"})
+                self.stats["explained"] += 1
+                plan_logger.info("Query plan %s", orjson.dumps({"shape": shape_key, **summarize_plan(explain)}).decode())
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Failed to explain slow query")
+            finally:
+                self._queue.task_done()
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_MS, settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE, settings.SLOW_QUERY_EXPLAINS_PER_MINUTE
+)
+
+# ✅ explain 수집 상태 (수집 시점에 stats를 읽음)
+for _key in ("explained", "deduplicated", "rate_limited", "dropped", "failed"):
+    CallbackMetric(
+        f"mongodb_slow_query_explains_{_key}_total", f"Slow query explains {_key.replace('_', ' ')}", "counter",
+        lambda key=_key: slow_query_log.stats[key],
+    )
@@ -0,0 +1,67 @@
+import os
+import re
+from mimetypes import guess_type
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+# 정적 파일 디렉터리 (실행 위치와 무관하게 app/static) / 마운트 경로
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "/static"
+
+# 내용 해시로 만든 파일 이름 ("<sha256>.png", "<sha256>.thumb.jpg")은 내용이 절대 바뀌지 않음
+CONTENT_FILENAME_PATTERN = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,10}){0,2}$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# 미리 압축해 둔 파일 (우선순위 순)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Accept-Encoding 헤더에서 허용된(q > 0) 인코딩 목록 추출"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if token and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.lower())
+    return accepted
+
+class CachedStaticFiles(StaticFiles):
+    """내용 기반 파일 이름이면 immutable 캐시 + 강한 ETag, 사전 압축(.br/.gz) 파일이 있으면 우선 제공"""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        filename = os.path.basename(full_path)
+        immutable = bool(CONTENT_FILENAME_PATTERN.match(filename))
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "vary": "Accept-Encoding",
+        }
+
+        path, encoding = full_path, None
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        for candidate, suffix in PRECOMPRESSED:
+            if candidate not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            path, encoding, stat_result = f"{full_path}{suffix}", candidate, compressed_stat
+            headers["content-encoding"] = candidate
+            break
+
+        if immutable:
+            # ✅ 파일 이름 자체가 내용 해시이므로 그대로 강한 ETag로 사용 (인코딩별로 구분)
+            headers["etag"] = f'"{filename}{"." + encoding if encoding else ""}"'
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=guess_type(filename)[0] or "application/octet-stream",
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
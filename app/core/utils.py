@@ -1,20 +1,79 @@
-from bson import ObjectId
+import base64
+import json
+from bson import ObjectId, errors
 from datetime import datetime
+from typing import Dict, List
+from pymongo.errors import BulkWriteError
 
-def convert_objectid(data):
-    """MongoDB의 ObjectId 및 datetime을 문자열로 변환하는 함수"""
-    
-    if isinstance(data, list):
-        return [convert_objectid(item) for item in data]
+def encode_cursor(created_at: datetime, obj_id: ObjectId) -> str:
+    """(created_at, _id) 위치를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(obj_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-    if isinstance(data, dict):
-        return {key if key != "_id" else "id": convert_objectid(value) for key, value in data.items()}  # ✅ `dict comprehension` 최적화
+def decode_cursor(cursor: str):
+    """커서 문자열을 (created_at, ObjectId)로 디코딩 (잘못된 커서는 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, errors.InvalidId):
+        raise ValueError("Invalid cursor")
 
-    if isinstance(data, ObjectId):
-        return str(data)  # ✅ ObjectId → 문자열 변환
+def encode_score_cursor(score: float, obj_id: ObjectId) -> str:
+    """(점수, _id) 위치를 커서 문자열로 인코딩 (sort=hot)"""
+    raw = json.dumps({"s": score, "id": str(obj_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-    if isinstance(data, datetime):
-        return data.isoformat()  # ✅ datetime → ISO 8601 문자열 변환 (예: "2024-02-10T12:00:00")
+def decode_score_cursor(cursor: str):
+    """점수 커서를 (score, ObjectId)로 디코딩 (잘못된 커서는 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(data["s"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, errors.InvalidId):
+        raise ValueError("Invalid cursor")
 
-    return data
+def encode_feed_cursor(created_at: datetime, obj_id: ObjectId, exhausted: List[str]) -> str:
+    """여러 프리셋 피드의 위치 (마지막 게시글 위치 + 더 이상 글이 없는 프리셋 목록)"""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(obj_id), "x": exhausted}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
+def decode_feed_cursor(cursor: str):
+    """피드 커서를 (created_at, ObjectId, 소진된 프리셋 목록)으로 디코딩 (잘못된 커서는 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        exhausted = data.get("x", [])
+        if not isinstance(exhausted, list) or not all(isinstance(item, str) for item in exhausted):
+            raise ValueError("Invalid cursor")
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"]), exhausted
+    except (ValueError, KeyError, TypeError, AttributeError, errors.InvalidId):
+        raise ValueError("Invalid cursor")
+
+async def filter_existing_ids(collection, ids: List[str]) -> List[str]:
+    """ID 목록 중 컬렉션에 실제로 존재하는 ID만 원래 순서대로 반환 (`$in` 쿼리 한 번)"""
+    parsed = []
+    for id_str in ids:
+        try:
+            parsed.append((id_str, ObjectId(id_str)))
+        except (errors.InvalidId, TypeError):
+            continue  # ✅ 잘못된 형식의 ID는 제외
+
+    if not parsed:
+        return []
+
+    unique_ids = list(dict.fromkeys(obj_id for _, obj_id in parsed))
+    docs = await collection.find({"_id": {"$in": unique_ids}}, {"_id": 1}).to_list(None)
+    found = {doc["_id"] for doc in docs}
+    return [id_str for id_str, obj_id in parsed if obj_id in found]
+
+def bulk_write_errors(error: BulkWriteError) -> Dict[int, str]:
+    """insert_many/bulk_write(ordered=False) 실패에서 {작업 위치: 오류 메시지} 추출"""
+    return {write_error["index"]: write_error.get("errmsg", "Write failed") for write_error in error.details.get("writeErrors", [])}
+
+def parse_object_ids(ids: List[str]) -> List[ObjectId]:
+    """ID 문자열 목록을 ObjectId 목록으로 변환 (잘못된 ID가 있으면 ValueError)"""
+    try:
+        return [ObjectId(id_str) for id_str in ids]
+    except (errors.InvalidId, TypeError):
+        raise ValueError("Invalid ID format")
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from typing import List
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.core.database import versions_collection
+
+# ✅ 목록 캐시(ETag)용 버전 키
+POSTS = "posts"
+CATEGORIES = "categories"
+PROGRAMS = "programs"
+PRESETS = "presets"
+
+async def get_version(name: str) -> int:
+    """컬렉션(또는 캐시)의 현재 버전 조회 (없으면 0)"""
+    doc = await versions_collection.find_one({"_id": name})
+    return doc["version"] if doc else 0
+
+async def get_versions(names: List[str]) -> List[int]:
+    """여러 버전을 한 번에 조회 (names 순서대로, 없으면 0)"""
+    docs = await versions_collection.find({"_id": {"$in": names}}).to_list(None)
+    versions = {doc["_id"]: doc["version"] for doc in docs}
+    return [versions.get(name, 0) for name in names]
+
+async def bump_version(name: str) -> int:
+    """버전을 1 증가시키고 새 버전을 반환"""
+    doc = await versions_collection.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+async def acquire_lease(name: str, holder: str, seconds: float) -> bool:
+    """여러 워커 중 한 곳에서만 실행할 작업의 임대 획득/연장 (versions의 "lease:<name>" 문서)
+
+    만료됐거나 이미 holder가 가진 임대만 갱신한다. 다른 워커가 가진 임대면 upsert가 같은 _id로
+    삽입을 시도하다 DuplicateKeyError가 나므로 False.
+    """
+    now = datetime.utcnow()
+    try:
+        await versions_collection.update_one(
+            {"_id": f"lease:{name}", "$or": [{"holder": holder}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"holder": holder, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
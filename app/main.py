@@ -1,31 +1,86 @@
 # main.py
 from fastapi import FastAPI
-from app.routes import auth, post, categories, programs, presets
-from app.core.database import initialize_database
+from app.routes import auth, post, categories, programs, presets, system, metrics
+from app.core.database import initialize_database, connect_database, close_database, get_database
+from app.services.category_catalog import category_catalog
+from app.services.counter_buffer import counter_buffer
+from app.services.upload_service import run_upload_gc
+from app.services.post_service import run_hot_sweep
+from app.services.image_service import derivative_pipeline
+from app.services.google_oauth import google_oauth
+from app.services.search_service import post_search
+from app.config import settings
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi.staticfiles import StaticFiles
+from app.core.static import CachedStaticFiles, STATIC_DIR, STATIC_URL
+from app.core.responses import FastJSONResponse
+from app.core.metrics import MetricsMiddleware
+from app.core.profiler import QueryProfilerMiddleware
+from app.core.slow_queries import slow_query_log
 import os
+from typing import Optional
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await initialize_database()
-    yield
+    tasks = []
+    connect_database()  # ✅ MongoDB 클라이언트/커넥션 풀은 앱 수명과 함께
+    try:
+        await slow_query_log.start(get_database())  # ✅ 느린 find/aggregate의 explain 수집
+        await initialize_database()
+        await category_catalog.load()  # ✅ 카테고리 캐시 로드
+        await counter_buffer.start()
+        await derivative_pipeline.start()  # ✅ 썸네일 생성 프로세스 풀
+        await google_oauth.start()  # ✅ Google OAuth 커넥션 풀 + JWKS
+        await post_search.start()  # ✅ 검색 색인은 백그라운드로 구축
+        if settings.UPLOAD_GC_INTERVAL > 0:  # ✅ 참조 없는 업로드 파일 주기적 정리
+            tasks.append(asyncio.create_task(run_upload_gc(settings.UPLOAD_GC_INTERVAL)))
+        if settings.HOT_SWEEP_INTERVAL > 0:  # ✅ 인기 점수 시간 감쇠 주기적 반영
+            tasks.append(asyncio.create_task(run_hot_sweep(settings.HOT_SWEEP_INTERVAL)))
+        yield
+    finally:
+        # ✅ 시작 중 실패해도 이미 시작한 것까지 정리 (시작하지 않은 서비스의 stop/close는 아무것도 하지 않음)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await post_search.stop()
+        await derivative_pipeline.stop()
+        await google_oauth.close()
+        await counter_buffer.stop()  # ✅ 종료 전 남은 카운터 반영
+        await slow_query_log.stop()
+        close_database()
 
-app = FastAPI(lifespan=lifespan, redirect_slashes=False)
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-STATIC_DIR = os.path.join(BASE_DIR, "static")
+async def root():
+    return {"message": "Welcome to Safari Community!"}
 
-if not os.path.exists(STATIC_DIR):
-    os.makedirs(STATIC_DIR)
+def create_app() -> FastAPI:
+    """앱 생성 (import만으로는 디렉터리/DB 클라이언트를 만들지 않음)
 
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+    uvicorn app.main:create_app --factory 로 실행하거나, app.main.app 을 처음 참조할 때 만들어진다.
+    """
+    application = FastAPI(lifespan=lifespan, redirect_slashes=False, default_response_class=FastJSONResponse)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    application.mount(STATIC_URL, CachedStaticFiles(directory=STATIC_DIR), name="static")
 
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(post.router, prefix="/post", tags=["post"])
-app.include_router(categories.router, prefix="/categories", tags=["categories"])
-app.include_router(programs.router, prefix="/programs", tags=["programs"])
-app.include_router(presets.router, prefix="/presets", tags=["presets"])
+    application.include_router(auth.router, prefix="/auth", tags=["auth"])
+    application.include_router(system.router, prefix="/system", tags=["system"])
+    application.include_router(post.router, prefix="/post", tags=["post"])
+    application.include_router(categories.router, prefix="/categories", tags=["categories"])
+    application.include_router(programs.router, prefix="/programs", tags=["programs"])
+    application.include_router(presets.router, prefix="/presets", tags=["presets"])
+    application.add_api_route("/", root, methods=["GET"])
+    application.add_middleware(QueryProfilerMiddleware)  # ✅ DB_PROFILE 설정은 요청마다 확인 (테스트에서 켤 수 있도록)
+    if settings.METRICS_ENABLED:
+        application.include_router(metrics.router, tags=["metrics"])
+        application.add_middleware(MetricsMiddleware)  # ✅ 라우트별 요청 수 / 지연 시간
+    return application
 
-@app.get("/")
-async def root():
-    return {"message": "Welcome to Safari Community!"}
+_app: Optional[FastAPI] = None
+
+def __getattr__(name: str):
+    """기존 실행 방식(uvicorn app.main:app, from app.main import app) 호환: 처음 참조할 때 한 번만 생성"""
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Response, Request, Depends
 from fastapi.responses import JSONResponse
-from app.services.auth_service import get_google_login_url, authenticate_google_user, logout_user, get_authenticated_user
+from app.services.auth_service import get_google_login_url, authenticate_google_user, logout_user
+from app.core.security import CurrentUser
 from app.schemas.auth import OAuthLoginResponse, OAuthCallbackResponse, LogoutResponse, UserResponse
 
 router = APIRouter()
@@ -22,7 +23,6 @@ async def logout(response: Response):
 
 # ✅ 현재 로그인한 사용자 정보 조회
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(request: Request):
+async def get_current_user(user: CurrentUser):
     """현재 로그인한 사용자 정보 가져오기"""
-    token = request.cookies.get("Authorization")
-    return {"email": get_authenticated_user(token)}
+    return {"email": user["email"]}
@@ -1,29 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
-from app.core.security import decode_access_token
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from app.core.security import CurrentUser
+from app.core.conditional import conditional_get
+from app.core.database import list_read_preference
+from app.core.responses import trusted_json, encoded_json, copy_dependency_headers
+from app.services.category_tree import category_tree
+from app.services.category_catalog import category_catalog
+from app.core.versions import CATEGORIES, PROGRAMS
 from app.services.category_service import (
-    create_category, get_categories, get_category, update_category, delete_category
+    create_category, get_categories, get_category, update_category, delete_category, create_categories, update_categories
 )
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryListResponse
-from app.schemas.base import ResponseModel
+from app.schemas.category import (
+    CategoryCreate, CategoryUpdate, CategoryBulkUpdateItem, CategoryResponse, CategoryListResponse, CategoryTreeResponse
+)
+from app.schemas.base import ResponseModel, BulkRequest, BulkResponse, validate_bulk_items, bulk_response
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ✅ 카테고리 생성
 @router.post("/", response_model=CategoryResponse)
-async def create_category_route(category: CategoryCreate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    category_id = await create_category(category.name, payload["email"])
+async def create_category_route(category: CategoryCreate, user: CurrentUser):
+    category_id = await create_category(category.name, user["email"])
     return CategoryResponse(id=category_id, name=category.name)
 
+# ✅ 카테고리 대량 생성 (항목별 검증/결과)
+@router.post("/bulk", response_model=BulkResponse)
+async def create_categories_route(request: BulkRequest, user: CurrentUser):
+    valid, results = validate_bulk_items(CategoryCreate, request.items)
+    results += await create_categories([(index, category.name) for index, category in valid], user["email"])
+    return trusted_json(bulk_response(results))
+
+# ✅ 카테고리 대량 수정
+@router.put("/bulk", response_model=BulkResponse)
+async def update_categories_route(request: BulkRequest, user: CurrentUser):
+    valid, results = validate_bulk_items(CategoryBulkUpdateItem, request.items)
+    results += await update_categories([(index, category.id, category.name) for index, category in valid])
+    return trusted_json(bulk_response(results))
+
 # ✅ 모든 카테고리 조회
-@router.get("/", response_model=CategoryListResponse)
-async def get_categories_route():
-    return CategoryListResponse(categories=await get_categories())
+@router.get("/", response_model=CategoryListResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(CATEGORIES, on_versions=category_catalog.observe_versions))])
+async def get_categories_route(response: Response):
+    return trusted_json({"categories": await get_categories()}, response)
+
+# ✅ 카테고리 트리 (카테고리별 프로그램 포함, 집계 1회 + 캐시, stream=true면 카테고리 단위로 전송)
+@router.get("/tree", response_model=CategoryTreeResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(CATEGORIES, PROGRAMS, on_versions=category_tree.observe_versions))])
+async def get_category_tree_route(response: Response, stream: bool = False):
+    if stream:
+        return copy_dependency_headers(StreamingResponse(category_tree.stream(), media_type="application/json"), response)
+    return encoded_json(await category_tree.body(), response)
 
 # ✅ 특정 카테고리 조회
 @router.get("/{category_id}", response_model=CategoryResponse)
@@ -36,11 +60,7 @@ async def get_category_route(category_id: str):
 
 # ✅ 카테고리 수정
 @router.put("/{category_id}", response_model=CategoryResponse)
-async def update_category_route(category_id: str, category: CategoryUpdate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def update_category_route(category_id: str, category: CategoryUpdate, user: CurrentUser):
     updated_category = await update_category(category_id, category.name)
     if not updated_category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -49,10 +69,6 @@ async def update_category_route(category_id: str, category: CategoryUpdate, toke
 
 # ✅ 카테고리 삭제
 @router.delete("/{category_id}", response_model=ResponseModel)
-async def delete_category_route(category_id: str, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def delete_category_route(category_id: str, user: CurrentUser):
     await delete_category(category_id)
     return ResponseModel(message="Category deleted successfully")
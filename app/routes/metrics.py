@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+# ✅ Prometheus 수집용 (텍스트 형식 0.0.4)
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
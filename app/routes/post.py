@@ -1,81 +1,140 @@
 # routes/post.py
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.security import OAuth2PasswordBearer
-from app.core.security import decode_access_token
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Response
+from app.core.security import CurrentUser
+from app.core.conditional import conditional_get
+from app.core.database import list_read_preference
+from app.core.responses import trusted_json
+from app.core.versions import POSTS
 from app.schemas import post
 from app.services.post_service import (
     create_post, get_posts, get_post, save_image, update_post, delete_post, 
-    update_post_reactions, update_scrap_count
+    update_post_reactions, update_scrap_count, parse_post_fields, search_posts,
+    get_preset_feed, parse_preset_ids
 )
-from app.schemas.post import PostResponse, PostListResponse
+from app.services.search_service import post_search
+from app.services.upload_service import UploadTooLarge
+from app.schemas.post import PostResponse, AnyPostResponse, AnyPostListResponse, PostSearchResponse
 from app.schemas.base import ResponseModel
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+def post_fieldset(
+    fields: Optional[str] = Query(None, description="쉼표로 구분한 필드 목록 (예: title,like_count)"),
+    view: str = Query("full", pattern="^(full|summary)$"),
+):
+    """fields / view 쿼리 파라미터 검증"""
+    if fields and view != "full":
+        raise HTTPException(status_code=400, detail="Use either fields or view, not both")
+    try:
+        return parse_post_fields(fields), view
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # 게시글 생성
 @router.post("/", response_model=PostResponse)
 async def create_post_route(
+    user: CurrentUser,
     title: str = Form(..., min_length=1, max_length=100),
     content: str = Form(..., min_length=1),
     preset_id: Optional[str] = Form(None),
     is_public: bool = Form(True),
-    token: str = Depends(oauth2_scheme),
     file: Optional[UploadFile] = File(None)
 ):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    post_data = await create_post(
-        title=title,
-        content=content,
-        preset_id=preset_id,
-        is_public=is_public,
-        created_by=payload["email"],
-        file=file
-    )
-    return PostResponse(**post_data)
+    try:
+        post_data = await create_post(
+            title=title,
+            content=content,
+            preset_id=preset_id,
+            is_public=is_public,
+            created_by=user["email"],
+            file=file
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return post_data
 
 # 게시글 좋아요 / 싫어요
 @router.post("/{post_id}/reaction", response_model=ResponseModel)
-async def update_post_reactions_route(post_id: str, like: bool, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def update_post_reactions_route(post_id: str, like: bool, user: CurrentUser):
     await update_post_reactions(post_id, like)
     return ResponseModel(message="Reaction updated successfully")
 
-# 게시글 목록 조회
-@router.get("/", response_model=PostListResponse)
-async def get_posts_route():
-    return PostListResponse(posts=await get_posts())
+# 게시글 목록 조회 (response_model은 문서화용, 응답은 서비스 결과를 그대로 직렬화)
+@router.get("/", response_model=AnyPostListResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(POSTS))])
+async def get_posts_route(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    sort: str = Query("latest", pattern="^(latest|hot)$"),
+    fieldset: tuple = Depends(post_fieldset),
+):
+    fields, view = fieldset
+    try:
+        posts, next_cursor = await get_posts(cursor, limit, fields, view, sort)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return trusted_json({"posts": posts, "next_cursor": next_cursor}, response)
+
+# 여러 프리셋의 최신 게시글 피드
+@router.get("/feed", response_model=AnyPostListResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(POSTS))])
+async def get_preset_feed_route(
+    response: Response,
+    preset_ids: str = Query(..., description="쉼표로 구분한 프리셋 ID 목록"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fieldset: tuple = Depends(post_fieldset),
+):
+    fields, view = fieldset
+    try:
+        selected = parse_preset_ids(preset_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        posts, next_cursor = await get_preset_feed(selected, cursor, limit, fields, view)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return trusted_json({"posts": posts, "next_cursor": next_cursor}, response)
+
+# 게시글 검색 (제목/본문, 점수순)
+@router.get("/search", response_model=PostSearchResponse, dependencies=[Depends(list_read_preference)])
+async def search_posts_route(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+):
+    if not post_search.ready:
+        raise HTTPException(status_code=503, detail="Search index is not ready")
+    posts, total, partial = await search_posts(q, limit, offset)
+    # 부분 색인이면 오래된 글의 일치 수는 알 수 없으므로 페이지가 가득 찼으면 다음 페이지가 있다고 봄
+    has_more = offset + limit < total or (partial and len(posts) == limit)
+    next_offset = offset + limit if has_more else None
+    return trusted_json({"posts": posts, "total": total, "partial": partial, "next_offset": next_offset})
 
 # 특정 게시글 조회
-@router.get("/{post_id}", response_model=PostResponse)
-async def get_post_route(post_id: str):
-    post = await get_post(post_id)
+@router.get("/{post_id}", response_model=AnyPostResponse)
+async def get_post_route(post_id: str, fieldset: tuple = Depends(post_fieldset)):
+    fields, view = fieldset
+    post = await get_post(post_id, fields, view)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return PostResponse(**post)
+    return trusted_json(post)
 
 # 게시글 수정 (Form 데이터로 처리)
 @router.put("/{post_id}", response_model=PostResponse)
 async def update_post_route(
     post_id: str,
+    user: CurrentUser,
     title: Optional[str] = Form(None),
     content: Optional[str] = Form(None),
     preset_id: Optional[str] = Form(None),
     is_public: Optional[bool] = Form(None),
-    file: Optional[UploadFile] = File(None),
-    token: str = Depends(oauth2_scheme)
+    file: Optional[UploadFile] = File(None)
 ):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    image_url = await save_image(file) if file else None
+    try:
+        image_url = await save_image(file) if file else None
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     updated_post = await update_post(
         post_id=post_id,
@@ -87,22 +146,16 @@ async def update_post_route(
     )
     if not updated_post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return PostResponse(**updated_post)
+    return updated_post
 
 # 게시글 삭제
 @router.delete("/{post_id}", response_model=ResponseModel)
-async def delete_post_route(post_id: str, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def delete_post_route(post_id: str, user: CurrentUser):
     await delete_post(post_id)
     return ResponseModel(message="Post deleted successfully")
 
 # 게시글 스크랩
 @router.post("/{post_id}/scrap", response_model=ResponseModel)
-async def update_scrap_count_route(post_id: str, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def update_scrap_count_route(post_id: str, user: CurrentUser):
     await update_scrap_count(post_id, 1)
     return ResponseModel(message="Post scrapped successfully")
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
-from app.core.security import decode_access_token
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.core.security import CurrentUser
+from app.core.conditional import conditional_get
+from app.core.database import list_read_preference
+from app.core.responses import trusted_json
+from app.core.versions import PRESETS
 from app.services.preset_service import (
     create_preset, get_presets, get_preset, update_preset, delete_preset
 )
@@ -9,34 +12,20 @@ from app.schemas.base import ResponseModel
 from datetime import datetime
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Fucking API
 # ✅ 프리셋 생성
 @router.post("/", response_model=PresetResponse)
-async def create_preset_route(preset: PresetCreate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def create_preset_route(preset: PresetCreate, user: CurrentUser):
     preset_data = await create_preset(
-        preset.name, preset.description, preset.category_ids, payload["email"], preset.is_public
-    )
-    
-    return PresetResponse(
-        id=preset_data["_id"],  # ✅ ObjectId 변환된 값 사용
-        name=preset_data["name"],
-        description=preset_data["description"],
-        category_ids=preset_data["category_ids"],
-        created_by=preset_data["created_by"],
-        is_public=preset_data["is_public"],
-        created_at=preset_data["created_at"],
+        preset.name, preset.description, preset.category_ids, user["email"], preset.is_public
     )
+    return preset_data
 
 # ✅ 모든 프리셋 조회
-@router.get("/", response_model=PresetListResponse)
-async def get_presets_route():
-    return PresetListResponse(presets=await get_presets())
+@router.get("/", response_model=PresetListResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(PRESETS))])
+async def get_presets_route(response: Response):
+    return trusted_json({"presets": await get_presets()}, response)
 
 # ✅ 특정 프리셋 조회
 @router.get("/{preset_id}", response_model=PresetResponse)
@@ -49,11 +38,7 @@ async def get_preset_route(preset_id: str):
 
 # ✅ 프리셋 수정
 @router.put("/{preset_id}", response_model=PresetResponse)
-async def update_preset_route(preset_id: str, preset: PresetUpdate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def update_preset_route(preset_id: str, preset: PresetUpdate, user: CurrentUser):
     updated_preset = await update_preset(preset_id, preset.name, preset.description, preset.category_ids, preset.is_public)
     if not updated_preset:
         raise HTTPException(status_code=404, detail="Preset not found")
@@ -62,10 +47,6 @@ async def update_preset_route(preset_id: str, preset: PresetUpdate, token: str =
 
 # ✅ 프리셋 삭제
 @router.delete("/{preset_id}", response_model=ResponseModel)
-async def delete_preset_route(preset_id: str, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def delete_preset_route(preset_id: str, user: CurrentUser):
     await delete_preset(preset_id)
     return ResponseModel(message="Preset deleted successfully")
\ No newline at end of file
@@ -1,34 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
 from bson import ObjectId, errors
-from app.core.security import decode_access_token
-from app.core.utils import convert_objectid
+from app.core.security import CurrentUser
+from app.core.conditional import conditional_get
+from app.core.database import list_read_preference
+from app.core.responses import trusted_json
+from app.core.versions import PROGRAMS
+from app.core.utils import parse_object_ids
 from app.services.program_service import (
-    create_program, get_programs, get_program, update_program, delete_program
+    create_program, get_programs, get_program, update_program, delete_program, create_programs, update_programs
 )
-from app.services.category_service import get_or_create_uncategorized, get_category
-from app.schemas.program import ProgramCreate, ProgramUpdate, ProgramResponse, ProgramListResponse
-from app.schemas.base import ResponseModel
+from app.services.category_service import get_or_create_uncategorized, category_exists
+from app.schemas.program import ProgramCreate, ProgramUpdate, ProgramBulkUpdateItem, ProgramResponse, ProgramListResponse
+from app.schemas.base import ResponseModel, BulkRequest, BulkResponse, validate_bulk_items, bulk_response
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # ✅ 프로그램 생성
 @router.post("/", response_model=ProgramResponse)
-async def create_program_route(program: ProgramCreate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def create_program_route(program: ProgramCreate, user: CurrentUser):
     # ✅ "미분류" 카테고리 자동 배정
-    category_id = program.category_id if program.category_id else await get_or_create_uncategorized(payload["email"])
+    category_id = program.category_id if program.category_id else await get_or_create_uncategorized(user["email"])
 
-    program_id = await create_program(program.name, category_id, payload["email"])
+    program_id = await create_program(program.name, category_id, user["email"])
     return ProgramResponse(id=program_id, name=program.name, category_id=category_id if category_id else None)
 
-# ✅ 모든 프로그램 조회
-@router.get("/", response_model=ProgramListResponse)
-async def get_programs_route(category_id: str = None):
+# ✅ 프로그램 대량 생성 (항목별 검증/결과)
+@router.post("/bulk", response_model=BulkResponse)
+async def create_programs_route(request: BulkRequest, user: CurrentUser):
+    valid, results = validate_bulk_items(ProgramCreate, request.items)
+    uncategorized_id = None
+    if any(not program.category_id for _, program in valid):
+        uncategorized_id = await get_or_create_uncategorized(user["email"])  # ✅ "미분류"는 한 번만 조회
+
+    programs = []
+    for index, program in valid:
+        if program.category_id and not await category_exists(program.category_id):
+            results.append({"index": index, "error": "Category not found"})
+            continue
+        programs.append((index, program.name, program.category_id or uncategorized_id))
+    results += await create_programs(programs, user["email"])
+    return trusted_json(bulk_response(results))
+
+# ✅ 프로그램 대량 수정
+@router.put("/bulk", response_model=BulkResponse)
+async def update_programs_route(request: BulkRequest, user: CurrentUser):
+    valid, results = validate_bulk_items(ProgramBulkUpdateItem, request.items)
+    updates = []
+    for index, program in valid:
+        if program.category_id and not await category_exists(program.category_id):
+            results.append({"index": index, "error": "Category not found"})
+            continue
+        updates.append((index, program.id, program.name, program.category_id))
+    results += await update_programs(updates)
+    return trusted_json(bulk_response(results))
+
+# ✅ 모든 프로그램 조회 (ids=a,b,c 로 여러 개를 한 번에 조회)
+@router.get("/", response_model=ProgramListResponse, dependencies=[Depends(list_read_preference), Depends(conditional_get(PROGRAMS))])
+async def get_programs_route(response: Response, category_id: str = None, ids: Optional[str] = None):
     # ✅ category_id가 존재하면 ObjectId 변환 시도
     if category_id is not None:
         try:
@@ -36,7 +65,16 @@ async def get_programs_route(category_id: str = None):
         except errors.InvalidId:
             raise HTTPException(status_code=400, detail="Invalid category ID format")
 
-    return ProgramListResponse(programs=await get_programs(category_id))
+    program_ids = None
+    if ids is not None:
+        try:
+            program_ids = parse_object_ids([item.strip() for item in ids.split(",") if item.strip()])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid program ID format")
+        if len(program_ids) > 1000:
+            raise HTTPException(status_code=400, detail="Too many IDs (max 1000)")
+
+    return trusted_json({"programs": await get_programs(category_id, program_ids)}, response)
 
 # ✅ 특정 프로그램 조회
 @router.get("/{program_id}", response_model=ProgramResponse)
@@ -48,11 +86,7 @@ async def get_program_route(program_id: str):
     return program
 
 @router.put("/{program_id}", response_model=ProgramResponse)
-async def update_program_route(program_id: str, program: ProgramUpdate, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def update_program_route(program_id: str, program: ProgramUpdate, user: CurrentUser):
     # ✅ category_id가 있으면 유효성 검증
     if program.category_id:
         try:
@@ -61,23 +95,18 @@ async def update_program_route(program_id: str, program: ProgramUpdate, token: s
             raise HTTPException(status_code=400, detail="Invalid category ID format")
 
         # ✅ 해당 category_id가 존재하는지 확인
-        category_exists = await get_category(program.category_id)
-        if not category_exists:
+        if not await category_exists(program.category_id):
             raise HTTPException(status_code=404, detail="Category not found")
 
     updated_program = await update_program(program_id, program.name, program.category_id)
     if not updated_program:
         raise HTTPException(status_code=404, detail="Program not found")
 
-    return convert_objectid(updated_program)  # ✅ 변환 적용
+    return updated_program
 
 
 # ✅ 프로그램 삭제
 @router.delete("/{program_id}", response_model=ResponseModel)
-async def delete_program_route(program_id: str, token: str = Depends(oauth2_scheme)):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
+async def delete_program_route(program_id: str, user: CurrentUser):
     await delete_program(program_id)
     return ResponseModel(message="Program deleted successfully")
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from app.core.pool_stats import pool_stats
+
+router = APIRouter()
+
+# ✅ MongoDB 커넥션 풀 상태 (사용 중 / 대기 / 체크아웃 대기 시간)
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    return pool_stats.snapshot()
@@ -1,7 +1,38 @@
-from pydantic import BaseModel
-from typing import Optional, Dict
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 # ✅ 공통 응답 모델
 class ResponseModel(BaseModel):
     message: str
     data: Optional[Dict] = None  # 추가 데이터가 있을 경우 포함 가능
+
+# ✅ 대량 요청/응답 모델 (항목별 검증, 항목별 결과)
+class BulkRequest(BaseModel):
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+class BulkItemResult(BaseModel):
+    index: int  # 요청 items 안의 위치
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+def validate_bulk_items(model: Type[BaseModel], items: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, BaseModel]], List[dict]]:
+    """항목마다 model로 검증해 (통과한 (index, 모델) 목록, 실패한 항목 결과 목록) 반환"""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            message = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            errors.append({"index": index, "error": message})
+    return valid, errors
+
+def bulk_response(results: List[dict]) -> dict:
+    """항목별 결과를 index 순으로 정리한 BulkResponse 형태의 dict"""
+    results = sorted(results, key=lambda result: result["index"])
+    failed = sum(1 for result in results if result.get("error"))
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from app.schemas.program import ProgramResponse
 
 # ✅ 카테고리 생성 요청
 class CategoryCreate(BaseModel):
@@ -9,6 +10,10 @@ class CategoryCreate(BaseModel):
 class CategoryUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=50)
 
+# ✅ 카테고리 대량 수정 항목 (새 이름 + 대상 ID)
+class CategoryBulkUpdateItem(CategoryCreate):
+    id: str
+
 # ✅ 카테고리 응답 모델
 class CategoryResponse(BaseModel):
     id: str
@@ -16,3 +21,13 @@ class CategoryResponse(BaseModel):
 
 class CategoryListResponse(BaseModel):
     categories: List[CategoryResponse]
+
+# ✅ 카테고리 트리 (카테고리별 프로그램 포함)
+class CategoryTreeNode(BaseModel):
+    id: str
+    name: str
+    program_count: int
+    programs: List[ProgramResponse]
+
+class CategoryTreeResponse(BaseModel):
+    categories: List[CategoryTreeNode]
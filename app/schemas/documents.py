@@ -0,0 +1,64 @@
+# schemas/documents.py
+# ✅ 컬렉션별 문서 → 응답 dict 매핑 (각 컬렉션의 응답 필드는 여기서만 선언)
+from datetime import datetime
+from app.core.mapping import DocumentMapper, Field, id_str, id_list, as_datetime
+
+_ID = Field(source="_id", convert=str)
+
+POST_MAPPER = DocumentMapper("post", {
+    "id": _ID,
+    "title": Field(),
+    "content": Field(),
+    "preset_id": Field(convert=id_str),
+    "image_url": Field(),
+    "image_variants": Field(),
+    "thumbnail_url": Field(source="image_variants.thumb"),
+    "is_public": Field(),
+    "like_count": Field(default=0),
+    "dislike_count": Field(default=0),
+    "comment_count": Field(default=0),
+    "scrap_count": Field(default=0),
+    "created_at": Field(convert=as_datetime),
+    "updated_at": Field(convert=as_datetime),
+})
+
+# view=summary: 본문 대신 snippet
+POST_SUMMARY_MAPPER = DocumentMapper("post_summary", {
+    "id": _ID,
+    "snippet": Field(default=""),
+    "thumbnail_url": Field(source="image_variants.thumb"),
+    **{name: POST_MAPPER.fields[name] for name in (
+        "title", "preset_id", "image_url",
+        "like_count", "dislike_count", "comment_count", "scrap_count",
+        "created_at",
+    )},
+})
+
+PRESET_MAPPER = DocumentMapper("preset", {
+    "id": _ID,
+    "name": Field(default=""),
+    "description": Field(default=""),
+    "category_ids": Field(convert=id_list),
+    "created_by": Field(default=""),
+    "is_public": Field(default=False),
+    "created_at": Field(convert=as_datetime, default_factory=datetime.utcnow),
+})
+
+PROGRAM_MAPPER = DocumentMapper("program", {
+    "id": _ID,
+    "name": Field(),
+    "category_id": Field(convert=id_str),
+})
+
+CATEGORY_MAPPER = DocumentMapper("category", {
+    "id": _ID,
+    "name": Field(),
+})
+
+# 카테고리 트리: $lookup으로 붙인 programs 포함
+CATEGORY_TREE_MAPPER = DocumentMapper("category_tree", {
+    "id": _ID,
+    "name": Field(),
+    "program_count": Field(source="programs", convert=len, default=()),
+    "programs": Field(convert=PROGRAM_MAPPER.many, default=()),
+})
@@ -1,7 +1,7 @@
 # schemas/post.py
 from pydantic import BaseModel, Field
 from fastapi import Form
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 def PostCreate(
@@ -26,6 +26,8 @@ class PostResponse(BaseModel):
     content: str
     preset_id: Optional[str]
     image_url: Optional[str]
+    image_variants: Optional[Dict[str, str]] = None  # 파생 이미지 URL (thumb, medium)
+    thumbnail_url: Optional[str] = None
     is_public: bool
     like_count: int = 0
     dislike_count: int = 0
@@ -34,6 +36,55 @@ class PostResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+# 게시글 요약 응답 모델 (view=summary, 본문 대신 snippet)
+class PostSummaryResponse(BaseModel):
+    id: str
+    title: str
+    snippet: str
+    preset_id: Optional[str] = None
+    image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    like_count: int = 0
+    dislike_count: int = 0
+    comment_count: int = 0
+    scrap_count: int = 0
+    created_at: datetime
+
+# 게시글 부분 응답 모델 (fields=로 선택한 필드만 포함)
+class PostPartialResponse(BaseModel):
+    id: str
+    title: Optional[str] = None
+    content: Optional[str] = None
+    preset_id: Optional[str] = None
+    image_url: Optional[str] = None
+    is_public: Optional[bool] = None
+    like_count: Optional[int] = None
+    dislike_count: Optional[int] = None
+    comment_count: Optional[int] = None
+    scrap_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
 # 게시글 목록 응답 모델
 class PostListResponse(BaseModel):
     posts: List[PostResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
+class PostSummaryListResponse(BaseModel):
+    posts: List[PostSummaryResponse]
+    next_cursor: Optional[str] = None
+
+class PostPartialListResponse(BaseModel):
+    posts: List[PostPartialResponse]
+    next_cursor: Optional[str] = None
+
+# 게시글 검색 응답 모델 (점수순, offset 페이지네이션)
+class PostSearchResponse(BaseModel):
+    posts: List[PostSummaryResponse]
+    total: int  # 색인 안의 전체 일치 수
+    partial: bool = False  # 색인이 최근 게시글만 담음: 더 오래된 글은 total에 빠지고 결과 뒤에 최신순으로 이어짐
+    next_offset: Optional[int] = None  # 다음 페이지 offset (마지막 페이지면 None)
+
+# 조회 라우트 응답 모델 (view/fields에 따라 달라짐)
+AnyPostResponse = Union[PostResponse, PostSummaryResponse, PostPartialResponse]
+AnyPostListResponse = Union[PostListResponse, PostSummaryListResponse, PostPartialListResponse]
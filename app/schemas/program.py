@@ -11,6 +11,10 @@ class ProgramUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=50)
     category_id: Optional[str] = None
 
+# ✅ 프로그램 대량 수정 항목 (ProgramUpdate + 대상 ID)
+class ProgramBulkUpdateItem(ProgramUpdate):
+    id: str
+
 # ✅ 프로그램 응답 모델
 class ProgramResponse(BaseModel):
     id: str
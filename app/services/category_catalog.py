@@ -0,0 +1,71 @@
+import time
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.core.database import categories_collection
+from app.schemas.documents import CATEGORY_MAPPER
+from app.core.versions import get_version, bump_version, CATEGORIES as VERSION_KEY
+
+class CategoryCatalog:
+    """카테고리 전체를 메모리에 올려두는 캐시 (쓰기 시 버전 증가로 무효화)"""
+
+    def __init__(self, check_interval: float = settings.CATEGORY_CACHE_CHECK_INTERVAL):
+        self.version: Optional[int] = None
+        self.check_interval = check_interval
+        self._checked_at = 0.0
+        self._by_id: Dict[str, dict] = {}
+        self._by_name: Dict[Tuple[str, str], dict] = {}
+        self._categories: List[dict] = []
+        self._lock = asyncio.Lock()
+
+    def _build(self, docs: List[dict], version: int):
+        """조회한 문서로 캐시 재구성"""
+        by_id, by_name, categories = {}, {}, []
+        for doc in docs:
+            category = CATEGORY_MAPPER(doc)
+            by_id[category["id"]] = category
+            by_name.setdefault((doc["name"], doc.get("created_by")), category)
+            categories.append(category)
+        self._by_id, self._by_name, self._categories = by_id, by_name, categories
+        self.version = version
+        self._checked_at = time.monotonic()
+
+    async def load(self):
+        """버전을 먼저 읽고 전체 카테고리를 다시 로드 (중간에 쓰기가 있으면 다음 확인 때 다시 로드됨)"""
+        async with self._lock:
+            version = await get_version(VERSION_KEY)
+            docs = await categories_collection.find({}, {"name": 1, "created_by": 1}).to_list(None)
+            self._build(docs, version)
+
+    async def refresh_if_stale(self):
+        """check_interval마다 버전 문서 하나만 확인하고, 바뀌었으면 다시 로드"""
+        if self.version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if self.version is None or await get_version(VERSION_KEY) != self.version:
+            await self.load()
+        else:
+            self._checked_at = time.monotonic()
+
+    def observe_versions(self, versions: List[int]):
+        """conditional_get이 읽은 버전이 캐시와 다르면 다음 조회 때 바로 다시 확인 (확인 주기를 기다리지 않음)"""
+        if self.version is not None and versions[0] != self.version:
+            self._checked_at = float("-inf")
+
+    async def invalidate(self):
+        """쓰기 후 호출: 버전을 올려 다른 워커에도 알리고 즉시 다시 로드"""
+        await bump_version(VERSION_KEY)
+        await self.load()
+
+    def all(self) -> List[dict]:
+        return list(self._categories)
+
+    def get(self, category_id: str) -> Optional[dict]:
+        return self._by_id.get(category_id)
+
+    def exists(self, category_id: str) -> bool:
+        return category_id in self._by_id
+
+    def find_by_name(self, name: str, created_by: str) -> Optional[dict]:
+        return self._by_name.get((name, created_by))
+
+category_catalog = CategoryCatalog()
@@ -1,33 +1,82 @@
 from app.core.database import categories_collection, programs_collection
 from bson import ObjectId, errors
-from app.core.utils import convert_objectid
+from typing import List, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.utils import bulk_write_errors, filter_existing_ids
+from app.schemas.documents import CATEGORY_MAPPER
+from app.services.category_catalog import category_catalog
+from app.services.category_tree import category_tree
+
+async def _categories_changed():
+    """카테고리 쓰기 후 호출: 카탈로그 캐시(버전 증가 포함)와 카테고리 트리 캐시 무효화"""
+    category_tree.invalidate()
+    await category_catalog.invalidate()
 
 async def create_category(name: str, created_by: str):
     """카테고리 생성"""
     category = {"name": name, "created_by": created_by}
     result = await categories_collection.insert_one(category)
+    await _categories_changed()  # ✅ 캐시 무효화
     return str(result.inserted_id)
 
+async def create_categories(names: List[Tuple[int, str]], created_by: str) -> List[dict]:
+    """카테고리 여러 개를 insert_many(ordered=False) 한 번으로 생성 ((요청 위치, 이름) 목록 → 항목별 결과)"""
+    if not names:
+        return []
+    docs = [{"name": name, "created_by": created_by} for _, name in names]
+    failed = {}
+    try:
+        await categories_collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed = bulk_write_errors(e)
+    await _categories_changed()  # ✅ 캐시 무효화 (한 번만)
+    return [
+        {"index": index, "error": failed[position]} if position in failed else {"index": index, "id": str(doc["_id"])}
+        for position, ((index, _), doc) in enumerate(zip(names, docs))
+    ]
+
+async def update_categories(updates: List[Tuple[int, str, str]]) -> List[dict]:
+    """카테고리 이름 여러 개를 bulk_write(ordered=False) 한 번으로 수정 ((요청 위치, ID, 새 이름) 목록 → 항목별 결과)"""
+    existing = set(await filter_existing_ids(categories_collection, [category_id for _, category_id, _ in updates]))
+    results, operations, positions = [], [], []
+    for index, category_id, name in updates:
+        if category_id not in existing:
+            results.append({"index": index, "error": "Category not found"})
+            continue
+        operations.append(UpdateOne({"_id": ObjectId(category_id)}, {"$set": {"name": name}}))
+        positions.append((index, category_id))
+
+    failed = {}
+    if operations:
+        try:
+            await categories_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = bulk_write_errors(e)
+        await _categories_changed()
+    results.extend(
+        {"index": index, "error": failed[position]} if position in failed else {"index": index, "id": category_id}
+        for position, (index, category_id) in enumerate(positions)
+    )
+    return results
+
 async def get_categories():
-    """모든 카테고리 조회"""
-    categories = await categories_collection.find().to_list(100)
-    
-    # ✅ ObjectId -> str 변환 + 필드명 `_id` → `id` 변경
-    return [{"id": str(cat["_id"]), "name": cat["name"]} for cat in categories]
+    """모든 카테고리 조회 (캐시)"""
+    await category_catalog.refresh_if_stale()
+    return category_catalog.all()
 
 
 async def get_category(category_id: str):
-    """특정 카테고리 조회"""
-    try:
-        obj_id = ObjectId(category_id)
-    except errors.InvalidId:
-        return None
+    """특정 카테고리 조회 (캐시)"""
+    await category_catalog.refresh_if_stale()
+    category = category_catalog.get(category_id)
+    return dict(category) if category else None
 
-    category = await categories_collection.find_one({"_id": obj_id})
-    if category:
-        return {"id": str(category["_id"]), "name": category["name"]}
-    
-    return None
+
+async def category_exists(category_id: str) -> bool:
+    """카테고리 존재 여부 확인 (캐시, O(1))"""
+    await category_catalog.refresh_if_stale()
+    return category_catalog.exists(category_id)
 
 
 async def update_category(category_id: str, new_name: str):
@@ -36,26 +85,27 @@ async def update_category(category_id: str, new_name: str):
     await categories_collection.update_one({"_id": obj_id}, {"$set": {"name": new_name}})
     
     category = await categories_collection.find_one({"_id": obj_id})
-    if category:
-        return {"id": str(category["_id"]), "name": category["name"]}
-    
-    return None
+    await _categories_changed()  # ✅ 캐시 무효화
+    return CATEGORY_MAPPER(category) if category else None
 
 
 async def delete_category(category_id: str):
     """카테고리 삭제"""
     obj_id = ObjectId(category_id)
     await categories_collection.delete_one({"_id": obj_id})
+    await _categories_changed()  # ✅ 캐시 무효화
 
 async def get_or_create_uncategorized(email: str):
     """사용자의 '미분류' 카테고리를 찾거나 없으면 생성"""
-    category = await categories_collection.find_one({"name": "미분류", "created_by": "system"})
+    await category_catalog.refresh_if_stale()
+    category = category_catalog.find_by_name("미분류", "system")
 
     if not category:
         new_category = {"name": "미분류", "created_by": "system"}
         result = await categories_collection.insert_one(new_category)
+        await _categories_changed()  # ✅ 캐시 무효화
         category_id = str(result.inserted_id)
     else:
-        category_id = str(category["_id"])
+        category_id = category["id"]
 
     return category_id
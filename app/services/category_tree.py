@@ -0,0 +1,103 @@
+import time
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+import orjson
+from app.config import settings
+from app.core.database import categories_collection
+from app.core.versions import get_versions, CATEGORIES, PROGRAMS
+from app.schemas.documents import CATEGORY_TREE_MAPPER
+
+# ✅ 카테고리마다 프로그램을 붙이는 단일 집계 (category_id가 문자열/ObjectId 어느 쪽으로 저장돼도 일치, programs_category_id 인덱스 사용)
+TREE_PIPELINE = [
+    {"$sort": {"name": 1, "_id": 1}},
+    {"$addFields": {"_program_keys": ["$_id", {"$toString": "$_id"}]}},
+    {"$lookup": {"from": "programs", "localField": "_program_keys", "foreignField": "category_id", "as": "programs"}},
+    {"$project": {"name": 1, "programs._id": 1, "programs.name": 1, "programs.category_id": 1}},
+]
+_PREFIX = b'{"categories":['
+_SUFFIX = b"]}"
+
+class CategoryTree:
+    """카테고리 트리를 JSON으로 인코딩해 캐시 (카테고리/프로그램 버전이 바뀌면 다시 집계)"""
+
+    def __init__(self, check_interval: float = settings.CATEGORY_CACHE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.versions: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._chunks: List[bytes] = []  # 카테고리별 인코딩 결과
+        self._body: Optional[bytes] = None
+        self._generation = 0  # invalidate()마다 증가 (그 전에 시작한 집계 결과는 캐시하지 않음)
+        self._lock = asyncio.Lock()
+
+    async def _current_versions(self) -> Tuple[int, int]:
+        return tuple(await get_versions([CATEGORIES, PROGRAMS]))
+
+    async def _is_fresh(self) -> bool:
+        """check_interval마다 버전 문서만 확인"""
+        if self.versions is None:
+            return False
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return True
+        if await self._current_versions() != self.versions:
+            return False
+        self._checked_at = time.monotonic()
+        return True
+
+    def _store(self, chunks: List[bytes], versions: Tuple[int, int], generation: int):
+        if generation != self._generation:
+            return
+        self._chunks = chunks
+        self._body = _PREFIX + b",".join(chunks) + _SUFFIX
+        self.versions = versions
+        self._checked_at = time.monotonic()
+
+    async def body(self) -> bytes:
+        """트리 전체 JSON (캐시가 최신이면 집계 없이 반환)"""
+        if await self._is_fresh():
+            return self._body
+        async with self._lock:
+            if not await self._is_fresh():
+                # ✅ 버전을 먼저 읽음: 집계 중 쓰기가 있으면 다음 확인 때 다시 집계됨
+                generation = self._generation
+                versions = await self._current_versions()
+                chunks = [
+                    orjson.dumps(CATEGORY_TREE_MAPPER(doc))
+                    async for doc in categories_collection.aggregate(TREE_PIPELINE)
+                ]
+                self._store(chunks, versions, generation)
+                if generation != self._generation:
+                    return _PREFIX + b",".join(chunks) + _SUFFIX
+            return self._body
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """트리를 카테고리 단위로 흘려보냄 (캐시가 없으면 집계 커서에서 바로 보내면서 캐시 채움)"""
+        if await self._is_fresh():
+            chunks = self._chunks
+            yield _PREFIX
+            for index, chunk in enumerate(chunks):
+                yield b"," + chunk if index else chunk
+            yield _SUFFIX
+            return
+
+        generation = self._generation
+        versions = await self._current_versions()
+        chunks = []
+        yield _PREFIX
+        async for doc in categories_collection.aggregate(TREE_PIPELINE):
+            chunk = orjson.dumps(CATEGORY_TREE_MAPPER(doc))
+            yield b"," + chunk if chunks else chunk
+            chunks.append(chunk)
+        yield _SUFFIX
+        self._store(chunks, versions, generation)
+
+    def observe_versions(self, versions: List[int]):
+        """conditional_get이 읽은 버전이 캐시와 다르면 다음 조회 때 바로 다시 확인 (확인 주기를 기다리지 않음)"""
+        if self.versions is not None and tuple(versions) != self.versions:
+            self._checked_at = float("-inf")
+
+    def invalidate(self):
+        """쓰기 후 호출: 다음 조회 때 다시 집계 (다른 워커는 버전 확인으로 반영)"""
+        self.versions = None
+        self._generation += 1
+
+category_tree = CategoryTree()
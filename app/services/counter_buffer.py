@@ -0,0 +1,179 @@
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.config import settings
+from app.core.database import posts_collection
+from app.core.metrics import CallbackMetric
+from app.core.ranking import counter_update
+from app.core.versions import bump_version, POSTS
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ("like_count", "dislike_count", "comment_count", "scrap_count")
+
+class CounterBuffer:
+    """게시글 카운터 증감을 메모리에 모았다가 문서별 업데이트 하나로 합쳐 bulk_write 하는 버퍼
+
+    목록 ETag(POSTS 버전)는 flush 단위로만 올라간다. 대기 중인 증감은 ETag에 반영되지 않으므로,
+    304를 받은 클라이언트는 최대 COUNTER_FLUSH_INTERVAL_MS 동안 이전 카운터 값을 볼 수 있다 (의도된 동작).
+    """
+
+    def __init__(self, collection, enabled: bool, interval_ms: int, max_events: int):
+        self.collection = collection
+        self.enabled = enabled
+        self.interval = interval_ms / 1000
+        self.max_events = max_events
+        self._pending: Dict[ObjectId, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # flush 중(bulk_write 응답 전)인 증감 값: 응답 전까지 overlay에 계속 포함 (flush가 겹칠 수 있어 목록)
+        self._in_flight: List[Dict[ObjectId, Dict[str, int]]] = []
+        self._events = 0
+        self._oldest_event_at: Optional[float] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        # ✅ 모니터링용 지표
+        self.stats = {
+            "flushes": 0,
+            "flushed_events": 0,
+            "last_flush_documents": 0,
+            "last_flush_events": 0,
+            "last_flush_lag_ms": 0.0,
+            "max_flush_lag_ms": 0.0,
+            "flush_errors": 0,
+        }
+
+    def add(self, obj_id: ObjectId, field: str, delta: int):
+        """증감 값 누적 (max_events에 도달하면 즉시 flush 예약)"""
+        self._pending[obj_id][field] += delta
+        self._events += 1
+        if self._oldest_event_at is None:
+            self._oldest_event_at = time.monotonic()
+        if self._events >= self.max_events and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    def pending(self, obj_id: ObjectId) -> Dict[str, int]:
+        """아직 DB에 반영되지 않은 증감 값 (flush 중인 값 포함)"""
+        totals: Dict[str, int] = defaultdict(int)
+        for buffer in (*self._in_flight, self._pending):
+            for field, delta in buffer.get(obj_id, {}).items():
+                totals[field] += delta
+        return {field: delta for field, delta in totals.items() if delta}
+
+    def overlay(self, obj_id: ObjectId, post: dict) -> dict:
+        """조회 결과에 대기 중인 증감 값을 더해서 반환
+
+        bulk_write가 DB에 적용된 뒤 응답을 받기 전의 짧은 구간에는 같은 증감이 두 번 더해질 수 있다
+        (빠지는 것보다 낫다고 보고 응답을 받을 때까지 포함).
+        """
+        for field, delta in self.pending(obj_id).items():
+            if post.get(field) is not None:
+                post[field] += delta
+        return post
+
+    async def flush(self):
+        """대기 중인 증감 값을 문서별 업데이트 하나(증감 + hot_score 재계산)로 합쳐 bulk_write"""
+        if not self._pending:
+            return
+        pending, events, oldest = self._pending, self._events, self._oldest_event_at
+        self._pending = defaultdict(lambda: defaultdict(int))
+        self._events = 0
+        self._oldest_event_at = None
+        self._in_flight.append(pending)
+
+        operations = [
+            UpdateOne({"_id": obj_id}, counter_update({field: delta for field, delta in fields.items() if delta}))
+            for obj_id, fields in pending.items()
+            if any(fields.values())
+        ]
+        try:
+            if operations:
+                await self.collection.bulk_write(operations, ordered=False)
+        except Exception:
+            # ✅ 실패한 증감 값은 다음 flush에서 다시 시도
+            self.stats["flush_errors"] += 1
+            logger.exception("Counter flush failed (%d documents)", len(operations))
+            for obj_id, fields in pending.items():
+                for field, delta in fields.items():
+                    self._pending[obj_id][field] += delta
+            self._events += events
+            if self._oldest_event_at is None or (oldest is not None and oldest < self._oldest_event_at):
+                self._oldest_event_at = oldest
+            return
+        finally:
+            self._in_flight.remove(pending)
+
+        if operations:
+            try:
+                await bump_version(POSTS)  # ✅ flush 단위로 목록 ETag 무효화
+            except Exception:
+                # 카운터는 이미 반영됨: 목록 ETag만 다음 쓰기까지 이전 값으로 남음
+                logger.exception("Failed to bump posts version after counter flush")
+
+        lag_ms = (time.monotonic() - oldest) * 1000 if oldest is not None else 0.0
+        self.stats["flushes"] += 1
+        self.stats["flushed_events"] += events
+        self.stats["last_flush_documents"] = len(operations)
+        self.stats["last_flush_events"] = events
+        self.stats["last_flush_lag_ms"] = lag_ms
+        self.stats["max_flush_lag_ms"] = max(self.stats["max_flush_lag_ms"], lag_ms)
+
+    async def _run(self):
+        """interval마다 flush (stop()이 _stopping을 설정하면 진행 중인 flush를 마치고 종료)"""
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Counter flush loop failed")
+
+    async def start(self):
+        """주기적 flush 시작 (비활성화 상태면 아무것도 하지 않음)"""
+        if self.enabled and self._loop_task is None:
+            self._stopping = asyncio.Event()
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기적 flush 종료 후 남은 값 모두 반영
+
+        bulk_write 도중에 task를 취소하면 쓰기가 반영됐는지 알 수 없으므로, 취소하지 않고 루프가
+        진행 중인 flush를 마치고 끝날 때까지 기다린다.
+        """
+        if self._loop_task is not None:
+            self._stopping.set()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+
+counter_buffer = CounterBuffer(
+    posts_collection,
+    enabled=settings.COUNTER_BUFFER_ENABLED,
+    interval_ms=settings.COUNTER_FLUSH_INTERVAL_MS,
+    max_events=settings.COUNTER_FLUSH_MAX_EVENTS,
+)
+
+# ✅ /metrics로 flush 크기/지연 노출 (수집 시점에 stats를 읽음)
+for _name, _kind, _key in (
+    ("counter_buffer_flushes_total", "counter", "flushes"),
+    ("counter_buffer_flushed_events_total", "counter", "flushed_events"),
+    ("counter_buffer_flush_errors_total", "counter", "flush_errors"),
+    ("counter_buffer_last_flush_documents", "gauge", "last_flush_documents"),
+    ("counter_buffer_last_flush_events", "gauge", "last_flush_events"),
+):
+    CallbackMetric(_name, f"Post counter buffer {_key.replace('_', ' ')}", _kind, lambda key=_key: counter_buffer.stats[key])
+for _name, _key in (
+    ("counter_buffer_last_flush_lag_seconds", "last_flush_lag_ms"),
+    ("counter_buffer_max_flush_lag_seconds", "max_flush_lag_ms"),
+):
+    CallbackMetric(
+        _name, f"Post counter buffer {_key[:-3].replace('_', ' ')} (oldest event to write)", "gauge",
+        lambda key=_key: counter_buffer.stats[key] / 1000,
+    )
@@ -0,0 +1,142 @@
+# service/google_oauth.py
+import re
+import time
+import asyncio
+from typing import Optional
+import httpx
+from fastapi import HTTPException
+from jose import jwt, JWTError
+from app.config import settings
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+# ID 토큰의 email_verified는 bool 또는 문자열로 올 수 있음
+_VERIFIED_VALUES = (True, "true")
+# 알 수 없는 kid로 JWKS를 다시 받는 최소 간격 (초)
+JWKS_MIN_REFRESH_INTERVAL = 30
+
+class GoogleOAuthClient:
+    """앱 수명 동안 재사용하는 Google OAuth HTTP 클라이언트 (커넥션 풀 + 로컬 ID 토큰 검증)"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._jwks: Optional[dict] = None
+        self._jwks_expires_at = 0.0
+        self._jwks_fetched_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+
+    async def start(self):
+        """lifespan 시작 시 호출: 클라이언트 생성 후 JWKS 미리 로드"""
+        if self._http is None:
+            self._http = self._create_http()
+        try:
+            await self._get_jwks()
+        except httpx.HTTPError:
+            pass  # ✅ 시작 시 실패해도 첫 로그인 때 다시 시도
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _create_http(self) -> httpx.AsyncClient:
+        """타임아웃과 커넥션 풀이 설정된 클라이언트 생성"""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.GOOGLE_HTTP_READ_TIMEOUT,
+                connect=settings.GOOGLE_HTTP_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+            ),
+            transport=self.transport,
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """lifespan 밖(테스트 등)에서는 처음 사용할 때 생성"""
+        if self._http is None:
+            self._http = self._create_http()
+        return self._http
+
+    async def _get_jwks(self, force: bool = False) -> dict:
+        """Google 공개키(JWKS) 조회 (Cache-Control max-age 동안 캐시)"""
+        now = time.monotonic()
+        if not force and self._jwks is not None and now < self._jwks_expires_at:
+            return self._jwks
+        async with self._jwks_lock:
+            now = time.monotonic()
+            if self._jwks is not None:
+                # ✅ 다른 요청이 방금 갱신했거나, 강제 갱신이 너무 잦으면 기존 키 사용
+                if not force and now < self._jwks_expires_at:
+                    return self._jwks
+                if force and now - self._jwks_fetched_at < JWKS_MIN_REFRESH_INTERVAL:
+                    return self._jwks
+            response = await self.http.get(GOOGLE_JWKS_URL)
+            response.raise_for_status()
+            match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+            ttl = int(match.group(1)) if match else settings.GOOGLE_JWKS_TTL
+            self._jwks = response.json()
+            self._jwks_fetched_at = now
+            self._jwks_expires_at = now + ttl
+            return self._jwks
+
+    async def verify_id_token(self, id_token: str, access_token: Optional[str] = None) -> dict:
+        """ID 토큰을 로컬에서 검증하고 claims 반환 (서명, aud, iss, exp, at_hash)"""
+        kid = jwt.get_unverified_header(id_token).get("kid")
+        jwks = await self._get_jwks()
+        if kid not in {key.get("kid") for key in jwks.get("keys", [])}:
+            jwks = await self._get_jwks(force=True)  # ✅ 키 교체 직후일 수 있으므로 한 번 갱신
+        claims = jwt.decode(
+            id_token,
+            jwks,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_CLIENT_ID,
+            access_token=access_token,
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise JWTError("Invalid issuer")
+        return claims
+
+    async def fetch_user_info(self, code: str, redirect_uri: str) -> dict:
+        """인가 코드로 토큰을 받아 사용자 정보(email, name) 반환 (ID 토큰이 있으면 userinfo 호출 생략)"""
+        data = {
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "code": code,
+            "grant_type": "authorization_code",
+            "redirect_uri": redirect_uri,
+        }
+        try:
+            # 🔹 Google OAuth2 토큰 요청
+            token_response = await self.http.post(GOOGLE_TOKEN_URL, data=data)
+            token_data = token_response.json()
+            access_token = token_data.get("access_token")
+            if not access_token:
+                raise HTTPException(status_code=400, detail="OAuth 인증 실패")
+
+            id_token = token_data.get("id_token")
+            if id_token:
+                try:
+                    claims = await self.verify_id_token(id_token, access_token)
+                except JWTError:
+                    raise HTTPException(status_code=400, detail="OAuth 인증 실패")
+                # ✅ 확인되지 않은 이메일로는 기존 계정에 로그인할 수 없게
+                if claims.get("email_verified") not in _VERIFIED_VALUES:
+                    raise HTTPException(status_code=400, detail="이메일 인증이 필요함")
+                return {"email": claims.get("email"), "name": claims.get("name")}
+
+            # 🔹 ID 토큰이 없으면 userinfo 엔드포인트로 조회
+            user_info_response = await self.http.get(GOOGLE_USERINFO_URL, headers={"Authorization": f"Bearer {access_token}"})
+            user_info = user_info_response.json()
+            if user_info.get("verified_email") not in _VERIFIED_VALUES:
+                raise HTTPException(status_code=400, detail="이메일 인증이 필요함")
+            return user_info
+        except (httpx.HTTPError, ValueError):
+            raise HTTPException(status_code=502, detail="Google OAuth 서버에 연결할 수 없음")
+
+google_oauth = GoogleOAuthClient()
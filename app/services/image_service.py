@@ -0,0 +1,88 @@
+# service/image_service.py
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from bson import ObjectId
+from app.config import settings
+from app.core.database import posts_collection
+from app.core.images import render_variants
+from app.core.versions import bump_version, POSTS
+from app.services import upload_service
+
+logger = logging.getLogger(__name__)
+
+class DerivativePipeline:
+    """업로드 이미지의 썸네일/중간 크기 파생 이미지를 프로세스 풀에서 생성"""
+
+    def __init__(self, pool_size: int, queue_depth: int):
+        self.pool_size = pool_size
+        self.queue_depth = queue_depth
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"rendered": 0, "dropped": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self):
+        if self.running or self.pool_size <= 0:
+            return
+        # ✅ spawn: 이벤트 루프/DB 클라이언트 스레드를 가진 프로세스를 fork하지 않음
+        self._executor = ProcessPoolExecutor(self.pool_size, mp_context=multiprocessing.get_context("spawn"))
+        self._queue = asyncio.Queue(maxsize=self.queue_depth)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.pool_size)]
+
+    async def stop(self):
+        if not self.running:
+            return
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._queue = None
+
+    def enqueue(self, post_id: ObjectId, image_url: Optional[str]) -> bool:
+        """파생 이미지 생성 작업 등록 (큐가 가득 차면 버리고 원본만 사용)"""
+        blob_name = upload_service.blob_name_from_url(image_url)
+        if not self.running or not blob_name:
+            return False
+        try:
+            self._queue.put_nowait((post_id, image_url, blob_name))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning("Derivative queue full, skipping %s", blob_name)
+            return False
+        return True
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            post_id, image_url, blob_name = await self._queue.get()
+            try:
+                variants = await loop.run_in_executor(
+                    self._executor, render_variants,
+                    f"{upload_service.UPLOAD_FOLDER}/{blob_name}", upload_service.UPLOAD_FOLDER, blob_name,
+                )
+                # ✅ 그 사이 이미지가 바뀐 게시글에는 기록하지 않음
+                result = await posts_collection.update_one(
+                    {"_id": post_id, "image_url": image_url},
+                    {"$set": {"image_variants": {
+                        variant: f"{upload_service.UPLOAD_URL}/{filename}" for variant, filename in variants.items()
+                    }}},
+                )
+                if result.modified_count:
+                    await bump_version(POSTS)  # ✅ 목록 ETag 무효화 (image_variants가 목록 응답에 포함됨)
+                self.stats["rendered"] += 1
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Failed to render derivatives for %s", blob_name)
+            finally:
+                self._queue.task_done()
+
+derivative_pipeline = DerivativePipeline(settings.IMAGE_POOL_SIZE, settings.IMAGE_QUEUE_DEPTH)
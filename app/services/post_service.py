@@ -1,20 +1,29 @@
 # service/post_service.py
-import os
 from fastapi import UploadFile
-from app.core.database import posts_collection
+from pymongo import ReturnDocument
+from app.core.database import posts_collection, post_deletions_collection
+from app.core.utils import (
+    encode_cursor, decode_cursor, encode_score_cursor, decode_score_cursor, encode_feed_cursor, decode_feed_cursor
+)
+from app.core.metrics import POST_REACTIONS, POST_SCRAPS
+from app.core.ranking import HOT_SORT, counter_update, hot_score_expression
+from app.config import settings
+from app.core.versions import acquire_lease, bump_version, POSTS
+from app.schemas.documents import POST_MAPPER, POST_SUMMARY_MAPPER
+from app.services.counter_buffer import counter_buffer
+from app.services.upload_service import save_image, release_upload
+from app.services.image_service import derivative_pipeline
+from app.services.search_service import post_search
 from bson import ObjectId, errors
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List
+import asyncio
+import heapq
+import logging
+import os
+import socket
 
-UPLOAD_FOLDER = "static/uploads"
-
-async def save_image(file: UploadFile) -> str:
-    """이미지를 저장하고 경로를 반환"""
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    file_location = f"{UPLOAD_FOLDER}/{file.filename}"
-    with open(file_location, "wb") as buffer:
-        buffer.write(await file.read())
-    return f"/{file_location}"
+logger = logging.getLogger(__name__)
 
 async def create_post(title: str, content: str, preset_id: Optional[str], is_public: bool, created_by: str, file: Optional[UploadFile] = None):
     """게시글 생성"""
@@ -30,63 +39,215 @@ async def create_post(title: str, content: str, preset_id: Optional[str], is_pub
         "dislike_count": 0,
         "comment_count": 0,
         "scrap_count": 0,
+        "hot_score": 0.0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
     }
-    result = await posts_collection.insert_one(post)
-    return {
-        "id": str(result.inserted_id),
-        **post
+    try:
+        result = await posts_collection.insert_one(post)  # ✅ post에 _id가 채워짐
+    except BaseException:
+        await release_upload(image_url)  # ✅ save_image가 잡은 참조를 놓음 (GC 대상)
+        raise
+    derivative_pipeline.enqueue(result.inserted_id, image_url)  # ✅ 썸네일 생성은 백그라운드로
+    post_search.index_post(post)  # ✅ 검색 색인 반영
+    await bump_version(POSTS)  # ✅ 목록 ETag 무효화
+    return POST_MAPPER(post)
+
+FEED_SORT = [("created_at", -1), ("_id", -1)]
+# ✅ sort= 값별 (정렬 키, 정렬, 커서 인코딩, 커서 디코딩)
+FEED_ORDERS = {
+    "latest": ("created_at", FEED_SORT, encode_cursor, decode_cursor),
+    "hot": ("hot_score", HOT_SORT, encode_score_cursor, decode_score_cursor),
+}
+
+def build_feed_query(cursor: Optional[str] = None, sort: str = "latest") -> dict:
+    """공개 피드 조회 조건 생성 (커서가 있으면 해당 위치 이후만 조회)"""
+    query = {"is_public": True}
+    if cursor:
+        key, _, _, decode = FEED_ORDERS[sort]
+        value, obj_id = decode(cursor)
+        # ✅ (정렬 키, _id) 내림차순 기준으로 커서보다 뒤에 있는 문서만
+        query["$or"] = [
+            {key: {"$lt": value}},
+            {key: value, "_id": {"$lt": obj_id}},
+        ]
+    return query
+
+# ✅ fields= 로 선택 가능한 게시글 필드
+POST_FIELDS = (
+    "title", "content", "preset_id", "image_url", "is_public",
+    "like_count", "dislike_count", "comment_count", "scrap_count",
+    "created_at", "updated_at",
+)
+# ✅ view=summary 에서 내려주는 필드 (본문 대신 snippet)
+SUMMARY_FIELDS = (
+    "title", "preset_id", "image_url",
+    "like_count", "dislike_count", "comment_count", "scrap_count",
+    "created_at",
+)
+SNIPPET_LENGTH = 200
+
+def parse_post_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """fields 쿼리 파라미터("title,like_count")를 필드 목록으로 변환 (알 수 없는 필드는 ValueError)"""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in POST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(selected))
+
+def build_post_projection(fields: Optional[List[str]] = None, view: str = "full") -> Optional[dict]:
+    """선택된 필드/뷰를 Mongo projection으로 변환 (전체 조회면 None)"""
+    if view == "summary":
+        projection = {field: 1 for field in SUMMARY_FIELDS}
+        # ✅ 본문 전체 대신 서버에서 자른 snippet만 전송
+        projection["snippet"] = {"$substrCP": ["$content", 0, SNIPPET_LENGTH]}
+        projection["image_variants.thumb"] = 1
+        return projection
+    if fields:
+        return {field: 1 for field in fields}
+    return None
+
+def _post_to_dict(post: dict, fields: Optional[List[str]] = None, view: str = "full") -> dict:
+    """Mongo 문서를 응답용 dict로 변환"""
+    if counter_buffer.enabled:
+        counter_buffer.overlay(post["_id"], post)  # ✅ 아직 반영되지 않은 카운터 증감 포함
+    if view == "summary":
+        return POST_SUMMARY_MAPPER(post)
+    if fields:
+        return POST_MAPPER.only(fields)(post)
+    return POST_MAPPER(post)
+
+async def get_posts(cursor: Optional[str] = None, limit: int = 20, fields: Optional[List[str]] = None, view: str = "full", sort: str = "latest"):
+    """공개된 게시글 조회 (keyset 페이지네이션, sort=latest|hot)"""
+    key, order, encode, _ = FEED_ORDERS[sort]
+    query = build_feed_query(cursor, sort)
+    projection = build_post_projection(fields, view)
+    if projection is not None:
+        # ✅ 다음 커서 생성을 위해 정렬 키는 항상 조회
+        projection.setdefault(key, 1)
+    # ✅ 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+    posts = await posts_collection.find(query, projection).sort(order).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode(posts[-1].get(key) or 0, posts[-1]["_id"])
+
+    return [_post_to_dict(post, fields, view) for post in posts], next_cursor
+
+MAX_FEED_PRESETS = 50
+_EPOCH = datetime(1970, 1, 1)
+
+def parse_preset_ids(preset_ids: str) -> List[str]:
+    """preset_ids 쿼리 파라미터("a,b,c")를 중복 없는 목록으로 변환 (비었거나 너무 많으면 ValueError)"""
+    selected = list(dict.fromkeys(item.strip() for item in preset_ids.split(",") if item.strip()))
+    if not selected:
+        raise ValueError("preset_ids is required")
+    if len(selected) > MAX_FEED_PRESETS:
+        raise ValueError(f"Too many presets (max {MAX_FEED_PRESETS})")
+    return selected
+
+def _feed_key(post: dict):
+    """힙 정렬 키: (created_at, _id) 내림차순이 먼저 나오도록 부호를 뒤집음"""
+    return (_EPOCH - post["created_at"], -int.from_bytes(post["_id"].binary, "big"))
+
+async def _next_or_none(cursor) -> Optional[dict]:
+    try:
+        return await cursor.next()
+    except StopAsyncIteration:
+        return None
+
+async def get_preset_feed(preset_ids: List[str], cursor: Optional[str] = None, limit: int = 20, fields: Optional[List[str]] = None, view: str = "full"):
+    """여러 프리셋의 최신 공개 게시글을 프리셋별 인덱스 커서의 k-way merge로 조회
+
+    프리셋마다 posts_preset_feed 인덱스를 타는 커서를 열고, 힙에서 가장 최근 글을 하나씩 꺼내 페이지가 차면 멈춘다.
+    """
+    position, exhausted = {}, set()
+    if cursor:
+        created_at, obj_id, done = decode_feed_cursor(cursor)
+        exhausted = set(done) & set(preset_ids)
+        position = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": obj_id}},
+        ]}
+
+    projection = build_post_projection(fields, view)
+    if projection is not None:
+        projection.setdefault("created_at", 1)
+    active = [preset_id for preset_id in preset_ids if preset_id not in exhausted]
+    # ✅ 커서마다 최대 limit+1개, 첫 배치는 페이지를 프리셋 수로 나눈 정도만 받아 옴
+    batch = max(2, (limit + 1) // max(len(active), 1) + 1)
+    cursors = {
+        preset_id: posts_collection.find({"preset_id": preset_id, "is_public": True, **position}, projection)
+        .sort(FEED_SORT).limit(limit + 1).batch_size(batch)
+        for preset_id in active
     }
+    try:
+        heads = await asyncio.gather(*(_next_or_none(preset_cursor) for preset_cursor in cursors.values()))
+        heap = []
+        for preset_id, head in zip(cursors, heads):
+            if head is None:
+                exhausted.add(preset_id)
+            else:
+                heap.append((_feed_key(head), preset_id, head))
+        heapq.heapify(heap)
 
-async def get_posts():
-    """모든 공개된 게시글 조회"""
-    posts = await posts_collection.find({"is_public": True}).sort("created_at", -1).to_list(100)
-    return [
-        {
-            "id": str(post["_id"]),
-            "title": post["title"],
-            "content": post["content"],
-            "preset_id": post.get("preset_id", None),
-            "image_url": post.get("image_url"),
-            "is_public": post["is_public"],
-            "like_count": post["like_count"],
-            "dislike_count": post["dislike_count"],
-            "comment_count": post["comment_count"],
-            "scrap_count": post["scrap_count"],
-            "created_at": post["created_at"],
-            "updated_at": post["updated_at"],
-        }
-        for post in posts
-    ]
-
-async def get_post(post_id: str):
+        posts = []
+        while heap and len(posts) <= limit:
+            _, preset_id, post = heapq.heappop(heap)
+            posts.append(post)
+            if len(posts) > limit:
+                break  # ✅ 다음 페이지 존재 여부만 확인하고 더 읽지 않음
+            following = await _next_or_none(cursors[preset_id])
+            if following is None:
+                exhausted.add(preset_id)
+            else:
+                heapq.heappush(heap, (_feed_key(following), preset_id, following))
+    finally:
+        for preset_cursor in cursors.values():
+            await preset_cursor.close()
+
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_feed_cursor(posts[-1]["created_at"], posts[-1]["_id"], sorted(exhausted))
+    return [_post_to_dict(post, fields, view) for post in posts], next_cursor
+
+async def get_post(post_id: str, fields: Optional[List[str]] = None, view: str = "full"):
     """특정 게시글 조회"""
     try:
         obj_id = ObjectId(post_id)
     except errors.InvalidId:
         return None
-    post = await posts_collection.find_one({"_id": obj_id})
+    post = await posts_collection.find_one({"_id": obj_id}, build_post_projection(fields, view))
     if not post:
         return None
-    return {
-        "id": str(post["_id"]),
-        "title": post["title"],
-        "content": post["content"],
-        "preset_id": post.get("preset_id"),
-        "image_url": post.get("image_url"),
-        "is_public": post["is_public"],
-        "like_count": post["like_count"],
-        "dislike_count": post["dislike_count"],
-        "comment_count": post["comment_count"],
-        "scrap_count": post["scrap_count"],
-        "created_at": post["created_at"],
-        "updated_at": post["updated_at"],
-    }
+    return _post_to_dict(post, fields, view)
+
+async def search_posts(query: str, limit: int = 20, offset: int = 0):
+    """검색 색인으로 찾은 공개 게시글을 점수순 요약(view=summary)으로 반환 (목록, 색인 안의 전체 일치 수, 부분 색인 여부)
+
+    색인이 최근 게시글만 담고 있으면(부분 색인) 색인 결과 뒤에 더 오래된 글을 최신순으로 이어 붙인다.
+    """
+    post_ids, total = post_search.search(query, limit, offset)
+    projection = build_post_projection(view="summary")
+    results = []
+    if post_ids:
+        # ✅ 색인 반영 전 삭제/비공개 전환된 게시글은 여기서 걸러짐
+        posts = await posts_collection.find({"_id": {"$in": post_ids}, "is_public": True}, projection).to_list(len(post_ids))
+        by_id = {post["_id"]: post for post in posts}
+        results = [_post_to_dict(by_id[post_id], view="summary") for post_id in post_ids if post_id in by_id]
+    partial = post_search.indexed_since is not None
+    if partial and offset + limit > total:
+        # 이 페이지에서 색인 결과가 끝난 뒤 자리를 오래된 글로 채움
+        older = await post_search.search_older(query, max(0, offset - total), offset + limit - max(offset, total), projection)
+        results += [_post_to_dict(post, view="summary") for post in older]
+    return results, total, partial
 
 async def update_post(post_id: str, title: Optional[str], content: Optional[str], preset_id: Optional[str], is_public: Optional[bool], image_url: Optional[str] = None):
-    """게시글 수정"""
-    obj_id = ObjectId(post_id)
+    """게시글 수정 (image_url은 save_image가 돌려준 경로: 참조 1개를 넘겨받음)"""
     update_fields = {}
 
     if title is not None:
@@ -99,24 +260,45 @@ async def update_post(post_id: str, title: Optional[str], content: Optional[str]
         update_fields["is_public"] = is_public
     if image_url is not None:
         update_fields["image_url"] = image_url
+        update_fields["image_variants"] = None  # 새 이미지의 파생 이미지는 백그라운드에서 다시 생성
 
     update_fields["updated_at"] = datetime.utcnow()
 
-    if update_fields:
-        await posts_collection.update_one({"_id": obj_id}, {"$set": update_fields})
-
-    updated_post = await posts_collection.find_one({"_id": obj_id})
+    # ✅ 수정 전 문서를 받아 이미지 참조 변경을 처리하고, 수정 후 문서는 직접 계산 (왕복 1회)
+    try:
+        obj_id = ObjectId(post_id)
+        previous_post = await posts_collection.find_one_and_update(
+            {"_id": obj_id}, {"$set": update_fields}, return_document=ReturnDocument.BEFORE
+        )
+    except BaseException:
+        await release_upload(image_url)
+        raise
+    if not previous_post:
+        await release_upload(image_url)  # ✅ save_image가 잡은 참조를 놓음
+        return None
+    await bump_version(POSTS)
 
-    if updated_post:
-        updated_post["id"] = str(updated_post["_id"])
-        del updated_post["_id"]
+    updated_post = {**previous_post, **update_fields}
+    post_search.index_post(updated_post)
+    if image_url is not None:
+        # ✅ 새 이미지 참조는 save_image가 이미 잡았으므로 이전 이미지 참조만 놓음 (같은 이미지면 참조 수 그대로)
+        await release_upload(previous_post.get("image_url"))
+        derivative_pipeline.enqueue(obj_id, image_url)
 
-    return updated_post
+    return _post_to_dict(updated_post)
 
 async def delete_post(post_id: str):
     """게시글 삭제"""
     obj_id = ObjectId(post_id)
-    await posts_collection.delete_one({"_id": obj_id})
+    deleted_post = await posts_collection.find_one_and_delete({"_id": obj_id}, projection={"image_url": 1})
+    if deleted_post:
+        await release_upload(deleted_post.get("image_url"))  # ✅ 업로드 참조 수 감소
+        post_search.remove_post(obj_id)
+        # ✅ 다른 워커의 검색 색인도 지우도록 삭제 기록 (updated_at 동기화로는 보이지 않음)
+        await post_deletions_collection.update_one(
+            {"_id": obj_id}, {"$set": {"deleted_at": datetime.utcnow()}}, upsert=True
+        )
+        await bump_version(POSTS)
 
 async def update_post_reactions(post_id: str, like: bool):
     """게시글 좋아요/싫어요 업데이트"""
@@ -125,10 +307,12 @@ async def update_post_reactions(post_id: str, like: bool):
     except errors.InvalidId:
         return None
     update_field = "like_count" if like else "dislike_count"
-    await posts_collection.update_one(
-        {"_id": obj_id},
-        {"$inc": {update_field: 1}}
-    )
+    POST_REACTIONS.inc(("like" if like else "dislike",))
+    if counter_buffer.enabled:
+        counter_buffer.add(obj_id, update_field, 1)
+        return
+    await posts_collection.update_one({"_id": obj_id}, counter_update({update_field: 1}))
+    await bump_version(POSTS)
 
 async def update_comment_count(post_id: str, change: int):
     """댓글 수 업데이트 (+1 or -1)"""
@@ -136,12 +320,51 @@ async def update_comment_count(post_id: str, change: int):
         obj_id = ObjectId(post_id)
     except errors.InvalidId:
         return None
-    await posts_collection.update_one(
-        {"_id": obj_id},
-        {"$inc": {"comment_count": change}}
-    )
+    if counter_buffer.enabled:
+        counter_buffer.add(obj_id, "comment_count", change)
+        return
+    await posts_collection.update_one({"_id": obj_id}, counter_update({"comment_count": change}))
+    await bump_version(POSTS)
 
 async def update_scrap_count(post_id: str, increment: int):
     """스크랩 수 업데이트"""
     obj_id = ObjectId(post_id)
-    await posts_collection.update_one({"_id": obj_id}, {"$inc": {"scrap_count": increment}})
+    POST_SCRAPS.inc(("added" if increment > 0 else "removed",))
+    if counter_buffer.enabled:
+        counter_buffer.add(obj_id, "scrap_count", increment)
+        return
+    await posts_collection.update_one({"_id": obj_id}, counter_update({"scrap_count": increment}))
+    await bump_version(POSTS)
+
+async def refresh_hot_scores(window_hours: Optional[int] = None) -> int:
+    """최근 window_hours 안의 공개 게시글 hot_score를 현재 시각 기준으로 다시 계산 (감쇠 반영)
+
+    기간이 지난 글은 0점으로 내리고, hot_score가 없는 글은 채운다. 모두 posts_public_hot/posts_public_feed 인덱스 범위만 읽는다.
+    """
+    window_hours = settings.HOT_WINDOW_HOURS if window_hours is None else window_hours
+    cutoff = datetime.utcnow() - timedelta(hours=window_hours)
+    recompute = [{"$set": {"hot_score": hot_score_expression()}}]
+    recent = await posts_collection.update_many({"is_public": True, "created_at": {"$gte": cutoff}}, recompute)
+    expired = await posts_collection.update_many(
+        {"is_public": True, "hot_score": {"$gt": 0}, "created_at": {"$lt": cutoff}}, {"$set": {"hot_score": 0.0}}
+    )
+    missing = await posts_collection.update_many({"is_public": True, "hot_score": None}, recompute)
+    modified = recent.modified_count + expired.modified_count + missing.modified_count
+    if modified:
+        await bump_version(POSTS)
+    return modified
+
+async def run_hot_sweep(interval: float):
+    """interval초마다 hot_score 감쇠 갱신 (lifespan에서 task로 실행)
+
+    모든 워커가 실행하지만 "hot_sweep" 임대를 가진 워커 하나만 갱신한다. 임대는 interval의 두 배 동안
+    유효하므로, 가진 워커가 죽으면 늦어도 다음다음 주기에 다른 워커가 이어받는다.
+    """
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await acquire_lease("hot_sweep", holder, interval * 2):
+                await refresh_hot_scores()
+        except Exception:
+            logger.exception("Hot score sweep failed")
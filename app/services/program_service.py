@@ -1,71 +1,83 @@
 from app.core.database import programs_collection
-from bson import ObjectId, errors, Optional
-from app.core.utils import convert_objectid
+from bson import ObjectId, errors
+from typing import List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.utils import bulk_write_errors, filter_existing_ids
+from app.schemas.documents import PROGRAM_MAPPER
+from app.core.versions import bump_version, PROGRAMS
+from app.services.category_tree import category_tree
+
+async def _programs_changed():
+    """프로그램 쓰기 후 호출: 목록 버전 증가 + 카테고리 트리 캐시 무효화"""
+    await bump_version(PROGRAMS)
+    category_tree.invalidate()
 
 async def create_program(name: str, category_id: str, created_by: str):
     """프로그램 생성"""
     program = {"name": name, "category_id": category_id, "created_by": created_by}
     result = await programs_collection.insert_one(program)
+    await _programs_changed()  # ✅ 목록 ETag / 카테고리 트리 무효화
     return str(result.inserted_id)
 
-async def get_programs(category_id: str = None):
-    """모든 프로그램 조회"""
-    query = {"category_id": category_id} if category_id else {}
-    programs = await programs_collection.find(query).to_list(100)
-
-    # ✅ ObjectId를 문자열로 변환 후 반환
+async def create_programs(programs: List[Tuple[int, str, str]], created_by: str) -> List[dict]:
+    """프로그램 여러 개를 insert_many(ordered=False) 한 번으로 생성 ((요청 위치, 이름, 카테고리 ID) 목록 → 항목별 결과)"""
+    if not programs:
+        return []
+    docs = [{"name": name, "category_id": category_id, "created_by": created_by} for _, name, category_id in programs]
+    failed = {}
+    try:
+        await programs_collection.insert_many(docs, ordered=False)  # ✅ insert_many가 각 문서에 _id를 채움
+    except BulkWriteError as e:
+        failed = bulk_write_errors(e)
+    await _programs_changed()
     return [
-        {
-            "id": str(program["_id"]),  # ObjectId -> str 변환
-            "name": program["name"],
-            "category_id": str(program["category_id"]) if program.get("category_id") else None
-        }
-        for program in programs
+        {"index": index, "error": failed[position]} if position in failed else {"index": index, "id": str(doc["_id"])}
+        for position, ((index, _, _), doc) in enumerate(zip(programs, docs))
     ]
 
-
-async def get_program(program_id: str):
-    """특정 프로그램 조회"""
-    try:
-        obj_id = ObjectId(program_id)
-    except errors.InvalidId:
-        return None
-
-    program = await programs_collection.find_one({"_id": obj_id})
-    if not program:
-        return None
-
-    return {
-        "id": str(program["_id"]),
-        "name": program["name"],
-        "category_id": str(program["category_id"]) if program.get("category_id") else None
-    }
-
-
-from app.core.database import programs_collection
-from bson import ObjectId, errors, Optional
-from app.core.utils import convert_objectid
-
-async def create_program(name: str, category_id: str, created_by: str):
-    """프로그램 생성"""
-    program = {"name": name, "category_id": category_id, "created_by": created_by}
-    result = await programs_collection.insert_one(program)
-    return str(result.inserted_id)
-
-async def get_programs(category_id: str = None):
-    """모든 프로그램 조회"""
+async def update_programs(updates: List[Tuple[int, str, Optional[str], Optional[str]]]) -> List[dict]:
+    """프로그램 여러 개를 bulk_write(ordered=False) 한 번으로 수정 ((요청 위치, ID, 이름, 카테고리 ID) 목록 → 항목별 결과)"""
+    existing = set(await filter_existing_ids(programs_collection, [program_id for _, program_id, _, _ in updates]))
+    results, operations, positions = [], [], []
+    for index, program_id, name, category_id in updates:
+        if program_id not in existing:
+            results.append({"index": index, "error": "Program not found"})
+            continue
+        update_fields = {}
+        if name:
+            update_fields["name"] = name
+        if category_id:
+            update_fields["category_id"] = category_id
+        if update_fields:
+            operations.append(UpdateOne({"_id": ObjectId(program_id)}, {"$set": update_fields}))
+            positions.append((index, program_id))
+        else:
+            results.append({"index": index, "id": program_id})
+
+    failed = {}
+    if operations:
+        try:
+            await programs_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed = bulk_write_errors(e)
+        await _programs_changed()
+    results.extend(
+        {"index": index, "error": failed[position]} if position in failed else {"index": index, "id": program_id}
+        for position, (index, program_id) in enumerate(positions)
+    )
+    return results
+
+async def get_programs(category_id: str = None, ids: Optional[List[ObjectId]] = None):
+    """모든 프로그램 조회 (ids가 있으면 해당 프로그램만 요청 순서대로)"""
     query = {"category_id": category_id} if category_id else {}
-    programs = await programs_collection.find(query).to_list(100)
+    if ids is None:
+        programs = await programs_collection.find(query).to_list(100)
+        return PROGRAM_MAPPER.many(programs)
 
-    # ✅ ObjectId를 문자열로 변환 후 반환
-    return [
-        {
-            "id": str(program["_id"]),  # ObjectId -> str 변환
-            "name": program["name"],
-            "category_id": str(program["category_id"]) if program.get("category_id") else None
-        }
-        for program in programs
-    ]
+    query["_id"] = {"$in": ids}
+    by_id = {program["_id"]: program for program in await programs_collection.find(query).to_list(None)}
+    return PROGRAM_MAPPER.many(by_id[obj_id] for obj_id in dict.fromkeys(ids) if obj_id in by_id)
 
 
 async def get_program(program_id: str):
@@ -78,12 +90,7 @@ async def get_program(program_id: str):
     program = await programs_collection.find_one({"_id": obj_id})
     if not program:
         return None
-
-    return {
-        "id": str(program["_id"]),
-        "name": program["name"],
-        "category_id": str(program["category_id"]) if program.get("category_id") else None
-    }
+    return PROGRAM_MAPPER(program)
 
 
 async def update_program(program_id: str, new_name: str, new_category_id: Optional[str]):
@@ -98,17 +105,14 @@ async def update_program(program_id: str, new_name: str, new_category_id: Option
 
     if update_fields:
         await programs_collection.update_one({"_id": obj_id}, {"$set": update_fields})
+        await _programs_changed()
 
     updated_program = await programs_collection.find_one({"_id": obj_id})
-    return convert_objectid(updated_program)  # ✅ 변환 적용하여 `id` 필드 반환
+    return PROGRAM_MAPPER(updated_program) if updated_program else None
 
 async def delete_program(program_id: str):
     """프로그램 삭제"""
     obj_id = ObjectId(program_id)
     await programs_collection.delete_one({"_id": obj_id})
+    await _programs_changed()
 
-
-async def delete_program(program_id: str):
-    """프로그램 삭제"""
-    obj_id = ObjectId(program_id)
-    await programs_collection.delete_one({"_id": obj_id})
@@ -0,0 +1,158 @@
+# service/search_service.py
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from pymongo.errors import ExecutionTimeout
+from app.config import settings
+from app.core.database import posts_collection, post_deletions_collection
+from app.core.search import InvertedIndex, words
+
+logger = logging.getLogger(__name__)
+
+# 색인에 필요한 필드
+_INDEX_PROJECTION = {"title": 1, "content": 1, "is_public": 1}
+# 동기화 구간을 조금씩 겹쳐 읽어 늦게 커밋된 쓰기를 놓치지 않음 (다시 색인해도 결과는 같음)
+_SYNC_OVERLAP = timedelta(seconds=5)
+
+class PostSearch:
+    """공개 게시글 제목/본문의 bigram 역색인 (시작 시 백그라운드로 구축, 쓰기마다 점진 반영)
+
+    색인은 워커 프로세스마다 따로 가지므로, 다른 워커의 쓰기는 updated_at 기준 주기적 동기화로,
+    삭제는 post_deletions 기록으로 반영한다. 메모리 색인이라 최근 공개 게시글 max_posts개까지만 담고,
+    indexed_since(색인 범위 시작 작성 시각)보다 오래된 글은 search_older()의 제한된 Mongo 조회로 찾는다.
+    """
+
+    def __init__(self, sync_interval: float, max_posts: int, compact_batch: int = 2000):
+        self.sync_interval = sync_interval
+        self.max_posts = max_posts
+        self.compact_batch = compact_batch
+        self.index = InvertedIndex()
+        self.ready = False
+        self.indexed_since: Optional[datetime] = None  # None이면 공개 게시글 전체가 색인됨
+        self._synced_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._compact_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._task, self._compact_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._task = self._compact_task = None
+
+    async def _run(self):
+        try:
+            await self.build()
+        except Exception:
+            logger.exception("Failed to build search index")
+            return
+        while self.sync_interval > 0:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Search index sync failed")
+
+    async def build(self, batch_size: int = 1000):
+        """최근 공개 게시글 max_posts개로 색인 구축 (오래된 글부터 추가, batch_size개마다 이벤트 루프에 양보)"""
+        started_at = datetime.utcnow()
+        index = InvertedIndex()
+        query = {"is_public": True}
+        # ✅ 상한 경계의 작성 시각 (posts_public_feed 인덱스만 읽음)
+        boundary = await posts_collection.find(query, {"created_at": 1}).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).skip(self.max_posts - 1).limit(1).to_list(1)
+        if boundary:
+            query["created_at"] = {"$gte": boundary[0]["created_at"]}
+        count = 0
+        cursor = posts_collection.find(query, _INDEX_PROJECTION).sort([("created_at", 1), ("_id", 1)]).batch_size(batch_size)
+        async for post in cursor:
+            index.add(post["_id"], post.get("title", ""), post.get("content", ""))
+            count += 1
+            if count % batch_size == 0:
+                await asyncio.sleep(0)
+        self.index = index
+        self.indexed_since = boundary[0]["created_at"] if boundary else None
+        self._synced_at = started_at - _SYNC_OVERLAP
+        self.ready = True
+        logger.info("Search index built: %d posts", count)
+
+    async def sync(self):
+        """마지막 동기화 이후 수정/삭제된 게시글만 다시 반영"""
+        started_at = datetime.utcnow()
+        async for post in posts_collection.find({"updated_at": {"$gte": self._synced_at}}, _INDEX_PROJECTION):
+            self.index_post(post)
+        async for deletion in post_deletions_collection.find({"deleted_at": {"$gte": self._synced_at}}, {"_id": 1}):
+            self.remove_post(deletion["_id"])
+        self._synced_at = started_at - _SYNC_OVERLAP
+
+    def index_post(self, post: dict):
+        """게시글 생성/수정 후 호출 (비공개면 색인에서 제외)"""
+        if post.get("is_public"):
+            self.index.add(post["_id"], post.get("title", ""), post.get("content", ""))
+            if len(self.index) > self.max_posts:
+                self._evict(len(self.index) - self.max_posts)
+        else:
+            self.index.remove(post["_id"])
+        self._schedule_compaction()
+
+    def _evict(self, count: int):
+        """오래전에 색인된 글을 빼고, 빠진 글의 작성 시각(ObjectId 시각)까지 색인 범위 시작을 당김"""
+        for post_id in self.index.evict_oldest(count):
+            if isinstance(post_id, ObjectId):
+                created_at = post_id.generation_time.replace(tzinfo=None)
+                if self.indexed_since is None or created_at > self.indexed_since:
+                    self.indexed_since = created_at
+
+    def remove_post(self, post_id: ObjectId):
+        self.index.remove(post_id)
+        self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        if self.index.needs_compaction and (self._compact_task is None or self._compact_task.done()):
+            self._compact_task = asyncio.get_running_loop().create_task(self.compact())
+
+    async def compact(self):
+        """삭제된 문서의 posting을 compact_batch개 term씩 나눠 정리 (묶음 사이에 이벤트 루프에 양보)"""
+        index = self.index
+        terms = index.begin_compaction()
+        for start in range(0, len(terms), self.compact_batch):
+            index.compact_terms(terms[start:start + self.compact_batch])
+            await asyncio.sleep(0)
+
+    def search(self, query: str, limit: int, offset: int) -> Tuple[List[ObjectId], int]:
+        """질의와 일치하는 게시글 ID를 점수순으로 반환 (ID 목록, 색인 안의 전체 일치 수)"""
+        hits, total = self.index.search(query, limit, offset)
+        return [post_id for post_id, _ in hits], total
+
+    async def search_older(self, query: str, skip: int, limit: int, projection: dict) -> List[dict]:
+        """색인 범위(indexed_since)보다 오래된 공개 게시글에서 질의 단어를 모두 포함하는 글을 최신순으로 조회
+
+        점수 없이 posts_public_feed 인덱스 순서로 훑고, SEARCH_FALLBACK_MAX_TIME_MS를 넘으면 빈 결과.
+        """
+        query_words = words(query)
+        if self.indexed_since is None or not query_words:
+            return []
+        conditions = [
+            {"$or": [{field: {"$regex": re.escape(word), "$options": "i"}} for field in ("title", "content")]}
+            for word in query_words
+        ]
+        cursor = posts_collection.find(
+            {"is_public": True, "created_at": {"$lt": self.indexed_since}, "$and": conditions}, projection
+        ).sort([("created_at", -1), ("_id", -1)]).skip(skip).limit(limit).max_time_ms(settings.SEARCH_FALLBACK_MAX_TIME_MS)
+        try:
+            posts = await cursor.to_list(limit)
+        except ExecutionTimeout:
+            logger.warning("Search fallback for older posts timed out: %r", query)
+            return []
+        # ✅ 수정되어 다시 색인된 오래된 글은 색인 결과에 이미 포함
+        return [post for post in posts if post["_id"] not in self.index]
+
+post_search = PostSearch(settings.SEARCH_SYNC_INTERVAL, settings.SEARCH_MAX_POSTS)
@@ -0,0 +1,185 @@
+# service/upload_service.py
+import os
+import re
+import asyncio
+import hashlib
+import logging
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import UploadFile
+from app.config import settings
+from pymongo import ReturnDocument
+from app.core.database import uploads_collection
+from app.core.images import VARIANTS, variant_filename
+from app.core.static import STATIC_DIR, STATIC_URL
+from app.core.metrics import POST_UPLOADS, POST_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 업로드 저장 위치는 /static 마운트 디렉터리 안 (실행 위치(CWD)와 무관) / 응답에 쓰는 URL 경로
+UPLOAD_FOLDER = os.path.join(STATIC_DIR, "uploads")
+UPLOAD_URL = f"{STATIC_URL}/uploads"
+# 내용 해시(sha256)로 만든 파일 이름: "<64자리 hex><확장자>"
+CONTENT_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,10})?$")
+_EXTENSION_PATTERN = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+class UploadTooLarge(ValueError):
+    """업로드가 UPLOAD_MAX_BYTES를 넘음 (라우트에서 413으로 변환)"""
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _commit_upload(buffer, tmp_path: str, file_location: str):
+    """임시 파일을 닫고 최종 위치로 원자적으로 이동"""
+    buffer.close()
+    os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 정적 파일 권한으로
+    os.replace(tmp_path, file_location)
+
+def _safe_extension(filename: Optional[str]) -> str:
+    """원본 파일 이름에서 안전한 확장자만 추출 (없으면 빈 문자열)"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    return extension if _EXTENSION_PATTERN.match(extension) else ""
+
+def blob_name_from_url(image_url: Optional[str]) -> Optional[str]:
+    """이미지 URL에서 업로드 파일 이름 추출 (업로드 폴더 밖이면 None)"""
+    prefix = f"{UPLOAD_URL}/"
+    if not image_url or not image_url.startswith(prefix):
+        return None
+    return image_url[len(prefix):]
+
+async def _hash_upload(file: UploadFile) -> str:
+    """업로드를 청크 단위로 읽으며 sha256 계산 (최대 크기를 넘으면 바로 중단)"""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > settings.UPLOAD_MAX_BYTES:
+            raise UploadTooLarge("File too large")
+        digest.update(chunk)
+    return digest.hexdigest()
+
+async def _write_upload(file: UploadFile, file_location: str):
+    """업로드를 임시 파일에 스트리밍한 뒤 원자적으로 최종 위치로 이동"""
+    # ✅ 디스크 I/O는 이벤트 루프 밖(스레드)에서 실행
+    fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=UPLOAD_FOLDER, suffix=".part")
+    buffer = os.fdopen(fd, "wb")
+    try:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(buffer.write, chunk)
+            POST_UPLOAD_BYTES.inc(amount=len(chunk))
+        await asyncio.to_thread(_commit_upload, buffer, tmp_path, file_location)  # ✅ 완성된 파일만 보이도록 rename
+    except BaseException:
+        buffer.close()
+        await asyncio.to_thread(_remove_quietly, tmp_path)
+        raise
+
+async def save_image(file: UploadFile) -> str:
+    """이미지를 내용 해시 이름으로 저장하고 경로를 반환 (같은 내용이 이미 있으면 쓰기 생략)
+
+    반환한 경로는 참조 1개를 가진 상태다: 게시글에 연결하지 못하면 호출한 쪽에서 release_upload 해야 한다.
+    """
+    await asyncio.to_thread(os.makedirs, UPLOAD_FOLDER, exist_ok=True)
+
+    digest = await _hash_upload(file)
+    name = f"{digest}{_safe_extension(file.filename)}"
+    file_location = f"{UPLOAD_FOLDER}/{name}"
+    image_url = f"{UPLOAD_URL}/{name}"
+
+    # ✅ 파일 확인 전에 참조부터 잡음 (그 뒤로는 GC가 이 파일을 지우지 않음)
+    inserted = await _retain(name)
+    try:
+        # 새 참조 문서면 GC가 직전에 지웠을 수 있으므로 항상 다시 씀 (내용 주소 이름이라 내용은 같음)
+        if not inserted and await asyncio.to_thread(os.path.exists, file_location):
+            POST_UPLOADS.inc(("deduplicated",))
+        else:
+            await file.seek(0)
+            await _write_upload(file, file_location)
+            POST_UPLOADS.inc(("stored",))
+    except BaseException:
+        await release_upload(image_url)  # ✅ 쓰기 실패: 참조를 놓아 GC 대상으로
+        raise
+    return image_url
+
+async def _retain(name: str) -> bool:
+    """참조 수 +1 (GC 표시 해제), 문서를 새로 만들었으면 True"""
+    previous = await uploads_collection.find_one_and_update(
+        {"_id": name},
+        {
+            "$inc": {"refcount": 1},
+            "$unset": {"unreferenced_at": ""},
+            "$setOnInsert": {"created_at": datetime.utcnow()},
+        },
+        upsert=True,
+        projection={"_id": 1},
+        return_document=ReturnDocument.BEFORE,
+    )
+    return previous is None
+
+async def release_upload(image_url: Optional[str]):
+    """게시글이 이미지 참조를 끊을 때 참조 수 -1 (0이 되면 GC 대상으로 표시)"""
+    name = blob_name_from_url(image_url)
+    if not name:
+        return
+    await uploads_collection.update_one(
+        {"_id": name, "refcount": {"$gt": 0}},
+        [{"$set": {
+            "refcount": {"$subtract": ["$refcount", 1]},
+            "unreferenced_at": {"$cond": [{"$lte": ["$refcount", 1]}, "$$NOW", "$$REMOVE"]},
+        }}],
+    )
+
+async def collect_unreferenced_uploads(batch_size: int = 100, grace_seconds: Optional[int] = None) -> int:
+    """참조가 없어진 지 grace_seconds가 지난 파일을 batch_size개씩 삭제하고 삭제한 개수 반환"""
+    grace_seconds = settings.UPLOAD_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    candidates = await uploads_collection.find(
+        {"refcount": {"$lte": 0}, "unreferenced_at": {"$lte": cutoff}}, {"_id": 1}
+    ).to_list(batch_size)
+
+    removed = 0
+    for candidate in candidates:
+        if await _collect(candidate["_id"]):
+            removed += 1
+    return removed
+
+def _move_quietly(path: str, destination: str) -> bool:
+    try:
+        os.replace(path, destination)
+        return True
+    except FileNotFoundError:
+        return False
+
+async def _collect(name: str) -> bool:
+    """참조 없는 업로드 하나 삭제 (그 사이 다시 참조되면 파일을 되돌리고 False)"""
+    # ✅ 조건부 삭제: 그 사이 다시 참조된 파일은 건너뜀
+    deleted = await uploads_collection.find_one_and_delete({"_id": name, "refcount": {"$lte": 0}}, projection={"_id": 1})
+    if not deleted or not CONTENT_NAME_PATTERN.match(name):
+        return False
+    path = f"{UPLOAD_FOLDER}/{name}"
+    tombstone = f"{path}.{uuid.uuid4().hex}.gc"
+    moved = await asyncio.to_thread(_move_quietly, path, tombstone)
+    # ✅ 문서 삭제 뒤 save_image가 새로 참조했으면 그쪽이 방금 쓴 파일일 수 있으므로 되돌림 (내용이 같음)
+    if await uploads_collection.find_one({"_id": name}, {"_id": 1}):
+        if moved:
+            await asyncio.to_thread(os.replace, tombstone, path)
+        return False
+    if moved:
+        await asyncio.to_thread(_remove_quietly, tombstone)
+    for variant in VARIANTS:  # ✅ 파생 이미지도 함께 삭제
+        await asyncio.to_thread(_remove_quietly, f"{UPLOAD_FOLDER}/{variant_filename(name, variant)}")
+    return True
+
+async def run_upload_gc(interval: float):
+    """interval초마다 참조 없는 업로드를 배치로 정리 (lifespan에서 task로 실행)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            while await collect_unreferenced_uploads() > 0:
+                pass
+        except Exception:
+            logger.exception("Upload GC failed")
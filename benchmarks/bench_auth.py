@@ -0,0 +1,59 @@
+"""인증 오버헤드 마이크로벤치마크: 매 요청 JWT 서명 검증 vs 검증된 토큰 캐시
+
+    python -m benchmarks.bench_auth [--iterations 20000]
+
+함수 단위(verify)와 ASGI 요청 단위(CurrentUser 의존성이 있는 빈 라우트) 모두 측정한다.
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from fastapi import FastAPI
+from app.config import settings
+from app.core import security
+
+def per_call_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+async def per_request_us(token: str, requests: int) -> float:
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(user: security.CurrentUser):
+        return {"email": user["email"]}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        await client.get("/whoami", headers=headers)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/whoami", headers=headers)
+        return (time.perf_counter() - start) / requests * 1e6
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    settings.JWT_SECRET = settings.JWT_SECRET or "bench-secret"
+    settings.JWT_ALGORITHM = settings.JWT_ALGORITHM or "HS256"
+    token = security.create_access_token({"email": "bench@example.com"})
+
+    uncached = per_call_us(lambda: security.decode_access_token(token), args.iterations)
+    security.verify_access_token(token)
+    cached = per_call_us(lambda: security.verify_access_token(token), args.iterations)
+    print(f"verify   uncached {uncached:8.2f}us | cached {cached:8.2f}us | saved {uncached - cached:8.2f}us/call")
+
+    security.token_cache.maxsize = 0
+    security.token_cache.clear()
+    uncached = await per_request_us(token, args.requests)
+    security.token_cache.maxsize = settings.TOKEN_CACHE_SIZE
+    cached = await per_request_us(token, args.requests)
+    print(f"request  uncached {uncached:8.2f}us | cached {cached:8.2f}us | saved {uncached - cached:8.2f}us/request")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""프로그램 10k개 생성: 단건 호출(POST /programs/ 와 같은 경로) vs 대량 생성(POST /programs/bulk 와 같은 경로)
+
+    MONGO_URI=... python -m benchmarks.bench_bulk [--count 10000] [--chunk 1000]
+
+실제 MongoDB가 필요하며, 만든 문서는 created_by 표시로 구분해 끝나면 삭제한다.
+"""
+import argparse
+import asyncio
+import time
+from app.core.database import programs_collection
+from app.services.category_catalog import category_catalog
+from app.services.category_service import get_or_create_uncategorized
+from app.services.program_service import create_program, create_programs
+
+MARKER = "bench-bulk@example.com"
+
+async def single(count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        # ✅ 기존 라우트와 같은 순서: 미분류 카테고리 확인 후 insert_one
+        category_id = await get_or_create_uncategorized(MARKER)
+        await create_program(f"program-{i}", category_id, MARKER)
+    return time.perf_counter() - start
+
+async def bulk(count: int, chunk: int) -> float:
+    start = time.perf_counter()
+    category_id = await get_or_create_uncategorized(MARKER)
+    for offset in range(0, count, chunk):
+        await create_programs(
+            [(i, f"program-{i}", category_id) for i in range(offset, min(offset + chunk, count))], MARKER
+        )
+    return time.perf_counter() - start
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    args = parser.parse_args()
+
+    await category_catalog.load()
+    try:
+        single_seconds = await single(args.count)
+        bulk_seconds = await bulk(args.count, args.chunk)
+    finally:
+        await programs_collection.delete_many({"created_by": MARKER})
+
+    print(f"single {single_seconds:7.2f}s ({args.count / single_seconds:8.0f} programs/s)")
+    print(f"bulk   {bulk_seconds:7.2f}s ({args.count / bulk_seconds:8.0f} programs/s) | x{single_seconds / bulk_seconds:5.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""문서 → 응답 dict 변환 비용 비교: 재귀 convert_objectid vs 컴파일된 DocumentMapper
+
+    python -m benchmarks.bench_mapping [--docs 10000] [--rounds 5]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from app.schemas.documents import POST_MAPPER, PRESET_MAPPER
+
+def convert_objectid(data):
+    """이전 core/utils.convert_objectid (비교용)"""
+    if isinstance(data, list):
+        return [convert_objectid(item) for item in data]
+    if isinstance(data, dict):
+        return {key if key != "_id" else "id": convert_objectid(value) for key, value in data.items()}
+    if isinstance(data, ObjectId):
+        return str(data)
+    if isinstance(data, datetime):
+        return data.isoformat()
+    return data
+
+def make_posts(count: int):
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "title": f"게시글 {i}",
+        "content": "사파리 프리셋 공유 " * 40,
+        "preset_id": str(ObjectId()),
+        "created_by": "bench@example.com",
+        "image_url": f"/static/uploads/{'a' * 64}.jpg",
+        "image_variants": {"thumb": f"/static/uploads/{'a' * 64}.thumb.jpg", "medium": f"/static/uploads/{'a' * 64}.medium.jpg"},
+        "is_public": True,
+        "like_count": i, "dislike_count": 0, "comment_count": i % 7, "scrap_count": i % 3,
+        "created_at": now - timedelta(minutes=i), "updated_at": now - timedelta(minutes=i),
+    } for i in range(count)]
+
+def make_presets(count: int):
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(), "name": f"프리셋 {i}", "description": "설명",
+        "category_ids": [str(ObjectId()) for _ in range(5)],
+        "created_by": "bench@example.com", "is_public": True, "created_at": now,
+    } for i in range(count)]
+
+def per_doc_us(func, docs, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(docs)
+        best = min(best, time.perf_counter() - start)
+    return best / len(docs) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, docs, mapper in (("post", make_posts(args.docs), POST_MAPPER), ("preset", make_presets(args.docs), PRESET_MAPPER)):
+        legacy = per_doc_us(convert_objectid, docs, args.rounds)
+        compiled = per_doc_us(mapper.many, docs, args.rounds)
+        print(f"{name:7s} convert_objectid {legacy:6.2f}us/doc | mapper {compiled:6.2f}us/doc | x{legacy / compiled:4.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""게시글 검색 색인 구축/질의 지연 측정 (합성 한국어 게시글)
+
+    python -m benchmarks.bench_search [--docs 100000] [--queries 200]
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+from app.core.search import InvertedIndex
+
+WORDS = (
+    "사파리 프리셋 설정 공유 자동 저장 탭 그룹 북마크 확장 프로그램 개발자 도구 "
+    "캐시 쿠키 비공개 브라우징 읽기 목록 단축키 테스트 게시글 업데이트 오류 해결 "
+    "아이폰 아이패드 맥북 동기화 알림 광고 차단 성능 배터리 메모리 화면 글꼴"
+).split()
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+
+def make_vocabulary(rng: random.Random, size: int):
+    """자주 쓰는 단어 + 합성 단어, Zipf 분포 가중치"""
+    vocabulary = list(WORDS) + ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    return vocabulary, cum_weights
+
+def make_text(rng: random.Random, vocabulary, weights, words: int) -> str:
+    return " ".join(rng.choices(vocabulary, cum_weights=weights, k=words))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary, weights = make_vocabulary(rng, args.vocabulary)
+    index = InvertedIndex()
+    corpus = [(make_text(rng, vocabulary, weights, 4), make_text(rng, vocabulary, weights, args.words)) for _ in range(args.docs)]
+    start = time.perf_counter()
+    for number, (title, content) in enumerate(corpus):
+        index.add(number, title, content)
+    print(f"build    {args.docs} docs in {time.perf_counter() - start:6.1f}s")
+
+    # ✅ 질의 단어도 같은 분포에서 뽑음 (흔한 단어 질의 포함)
+    queries = [" ".join(rng.choices(vocabulary, cum_weights=weights, k=2)) for _ in range(args.queries)]
+    timings, totals = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, total = index.search(query, limit=20)
+        timings.append((time.perf_counter() - start) * 1e3)
+        totals.append(total)
+    timings.sort()
+    print(f"query    p50 {statistics.median(timings):7.2f}ms | p95 {timings[int(len(timings) * 0.95)]:7.2f}ms | "
+          f"avg matches {statistics.mean(totals):8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""게시글 100개 페이지의 응답 직렬화 비용 비교
+
+    python -m benchmarks.bench_serialization [--iterations 300]
+
+- legacy : 서비스 dict → PostResponse(**post) → response_model 재검증 → jsonable_encoder → json.dumps
+- model  : 서비스 dict → PostListResponse 검증 → response_model 재검증 → pydantic dump_json (현재 FastAPI 기본 경로)
+- trusted: 서비스 dict → orjson (FastJSONResponse, 검증 없음)
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app.core.responses import FastJSONResponse
+from app.schemas.post import PostListResponse, PostResponse
+
+def make_page(size: int) -> dict:
+    now = datetime.utcnow()
+    posts = []
+    for i in range(size):
+        obj_id = ObjectId()
+        posts.append({
+            "id": str(obj_id),
+            "title": f"게시글 {i}",
+            "content": "사파리 프리셋 공유 " * 40,
+            "preset_id": str(ObjectId()),
+            "image_url": f"/static/uploads/{'a' * 64}.jpg",
+            "image_variants": {"thumb": f"/static/uploads/{'a' * 64}.thumb.jpg"},
+            "thumbnail_url": f"/static/uploads/{'a' * 64}.thumb.jpg",
+            "is_public": True,
+            "like_count": i,
+            "dislike_count": 0,
+            "comment_count": i % 7,
+            "scrap_count": i % 3,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(minutes=i),
+        })
+    return {"posts": posts, "next_cursor": "eyJ0IjoiMjAyNC0wMi0xMFQxMjowMDowMCIsImlkIjoiNjVjN2EwZjAifQ"}
+
+def per_call_ms(func, iterations: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e3
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--size", type=int, default=100)
+    args = parser.parse_args()
+
+    page = make_page(args.size)
+    adapter = TypeAdapter(PostListResponse)
+
+    def legacy():
+        model = PostListResponse(posts=[PostResponse(**post) for post in page["posts"]], next_cursor=page["next_cursor"])
+        validated = adapter.validate_python(model.model_dump())
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def model():
+        validated = adapter.validate_python(PostListResponse(**page).model_dump())
+        return adapter.dump_json(validated)
+
+    def trusted():
+        return FastJSONResponse(page).body
+
+    assert json.loads(legacy()) == json.loads(trusted())
+    results = {name: per_call_ms(func, args.iterations) for name, func in
+               (("legacy", legacy), ("model", model), ("trusted", trusted))}
+    for name, elapsed in results.items():
+        print(f"{name:8s} {elapsed:8.3f}ms/page | x{results['legacy'] / elapsed:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""워커 부팅 비용: app.main import + create_app() 시간, initialize_database() 왕복 수/시간
+
+    python -m benchmarks.bench_startup [--runs 5]
+    MONGO_URI=... python -m benchmarks.bench_startup --db
+
+import 시간은 매번 새 인터프리터(subprocess)에서 잰다.
+--db는 실제 MongoDB가 필요하며 seed 문서를 만든다 (두 번째부터는 이미 있어서 아무것도 바꾸지 않음).
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from pymongo import monitoring
+
+_IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+app.main.create_app()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+def import_times(runs: int):
+    imports, creates = [], []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET], capture_output=True, text=True, check=True).stdout
+        imported, created = map(float, output.split())
+        imports.append(imported * 1000)
+        creates.append(created * 1000)
+    print(f"import app.main  median {statistics.median(imports):7.1f}ms")
+    print(f"create_app()     median {statistics.median(creates):7.1f}ms")
+
+async def initialize_times(runs: int):
+    counter = CommandCounter()
+    monitoring.register(counter)  # ✅ 클라이언트 생성 전에 등록해야 적용됨
+
+    from app.config import settings
+    from app.core.database import close_database, connect_database, initialize_database
+
+    for seed in (False, True):
+        settings.SEED_DATABASE = seed
+        durations = []
+        for _ in range(runs):
+            connect_database()
+            counter.commands.clear()
+            start = time.perf_counter()
+            await initialize_database()
+            durations.append((time.perf_counter() - start) * 1000)
+            commands = len(counter.commands)
+            close_database()  # ✅ 매번 새 워커처럼 커넥션 풀부터
+        print(f"initialize (seed={seed!s:5}) median {statistics.median(durations):7.1f}ms | {commands} commands")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db", action="store_true", help="initialize_database()도 측정 (MongoDB 필요)")
+    args = parser.parse_args()
+
+    import_times(args.runs)
+    if args.db:
+        asyncio.run(initialize_times(args.runs))
+
+if __name__ == "__main__":
+    main()
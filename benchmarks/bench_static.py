@@ -0,0 +1,55 @@
+"""정적 파일 서빙 처리량 측정 (워커 1개, ASGI 직접 호출 — 네트워크 제외)
+
+    python -m benchmarks.bench_static [--requests 2000] [--size-kb 200]
+
+전체 전송(200), ETag 재검증(304), Range(206)를 기본 StaticFiles와 CachedStaticFiles로 비교한다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+from starlette.applications import Starlette
+from starlette.staticfiles import StaticFiles
+from app.core.static import CachedStaticFiles
+
+CONTENT_NAME = "cd" * 32 + ".jpg"
+
+async def run(app, requests: int, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(f"/static/{CONTENT_NAME}", headers=headers)
+            assert response.status_code < 400, response.status_code
+        return requests / (time.perf_counter() - start)
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--size-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, CONTENT_NAME), "wb") as f:
+            f.write(os.urandom(args.size_kb * 1024))
+
+        for label, static_class in (("StaticFiles", StaticFiles), ("CachedStaticFiles", CachedStaticFiles)):
+            app = Starlette()
+            app.mount("/static", static_class(directory=folder))
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                etag = (await client.get(f"/static/{CONTENT_NAME}")).headers["etag"]
+
+            cases = {
+                "200 full": {},
+                "304 revalidate": {"If-None-Match": etag},
+                "206 range 64KB": {"Range": "bytes=0-65535"},
+            }
+            for case, headers in cases.items():
+                rps = await run(app, args.requests, headers)
+                print(f"{label:>17} | {case:<15} | {rps:8.0f} req/s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
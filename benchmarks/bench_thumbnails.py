@@ -0,0 +1,79 @@
+"""파생 이미지(썸네일/중간 크기) 생성 처리량과 이벤트 루프 지연 측정
+
+    python -m benchmarks.bench_thumbnails [--images 16] [--pool-sizes 1,2,4]
+
+이벤트 루프에서 직접 렌더링하는 경우와 프로세스 풀(`render_variants`)로 넘기는 경우를 비교한다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from app.core.images import render_variants
+
+def make_sources(folder: str, count: int):
+    names = []
+    base = Image.effect_mandelbrot((3000, 2000), (-2.0, -1.0, 1.0, 1.0), 100).convert("RGB")
+    for i in range(count):
+        name = f"{i:064x}.jpg"
+        base.rotate(i * 7).save(os.path.join(folder, name), quality=92)
+        names.append(name)
+    return names
+
+def clear_variants(folder: str):
+    for name in os.listdir(folder):
+        if name.count(".") > 1:
+            os.remove(os.path.join(folder, name))
+
+async def measure(folder: str, names, executor):
+    loop = asyncio.get_running_loop()
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+    tick_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    if executor is None:
+        for name in names:
+            render_variants(os.path.join(folder, name), folder, name)
+            await asyncio.sleep(0)
+    else:
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, render_variants, os.path.join(folder, name), folder, name)
+            for name in names
+        ))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick_task
+    return elapsed, max(lags) if lags else 0.0
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--pool-sizes", default="1,2,4")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        names = make_sources(folder, args.images)
+
+        elapsed, max_lag = await measure(folder, names, None)
+        print(f"  in-loop: {args.images / elapsed:6.1f} images/s | loop lag max {max_lag:7.1f}ms")
+
+        for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+            clear_variants(folder)
+            with ProcessPoolExecutor(pool_size, mp_context=multiprocessing.get_context("spawn")) as executor:
+                await asyncio.get_running_loop().run_in_executor(executor, abs, 0)  # 워커 프로세스 기동 제외
+                elapsed, max_lag = await measure(folder, names, executor)
+            print(f"pool={pool_size:>3}: {args.images / elapsed:6.1f} images/s | loop lag max {max_lag:7.1f}ms")
+            clear_variants(folder)
+
+if __name__ == "__main__":
+    asyncio.run(main())
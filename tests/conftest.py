@@ -1,5 +1,9 @@
 import pytest
+from contextlib import contextmanager
+from datetime import datetime
 from fastapi.testclient import TestClient
+from app.config import settings
+from app.core.profiler import capture_query_profiles
 from app.main import app
 
 @pytest.fixture(scope="module")
@@ -21,3 +25,74 @@ def auth_token(client):
     assert "access_token" in auth_response.json()
 
     return f"Bearer {auth_response.json()['access_token']}"
+
+@pytest.fixture
+def assert_max_queries(monkeypatch):
+    """with assert_max_queries(n): 블록 안의 요청(및 직접 호출한 서비스)마다 Mongo 명령이 n개 이하인지 확인"""
+    monkeypatch.setattr(settings, "DB_PROFILE", "always")
+
+    @contextmanager
+    def check(limit: int):
+        with capture_query_profiles() as profiles:
+            yield profiles
+        over = [f"{label}: {profile.count} ({profile.summary()})" for label, profile in profiles if profile.count > limit]
+        assert not over, f"Mongo commands over {limit}: " + "; ".join(over)
+
+    return check
+
+class FakeUploadsCollection:
+    """uploads 컬렉션 흉내 (참조 수 upsert / 감소 파이프라인 / GC 조회·조건부 삭제만)"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, upsert=False, projection=None, return_document=None):
+        previous = self.docs.get(query["_id"])
+        doc = dict(previous) if previous else ({"_id": query["_id"], **update.get("$setOnInsert", {})} if upsert else None)
+        if doc is None:
+            return None
+        for field, delta in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + delta
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+        self.docs[doc["_id"]] = doc
+        return previous
+
+    async def update_one(self, query, pipeline):
+        """release_upload의 파이프라인: refcount > 0이면 -1, 0이 되면 unreferenced_at 표시"""
+        doc = self.docs.get(query["_id"])
+        if doc and doc.get("refcount", 0) > 0:
+            doc["refcount"] -= 1
+            if doc["refcount"] <= 0:
+                doc["unreferenced_at"] = datetime.utcnow()
+
+    def find(self, query, projection=None):
+        cutoff = query["unreferenced_at"]["$lte"]
+        matches = [
+            {"_id": doc["_id"]} for doc in self.docs.values()
+            if doc.get("refcount", 0) <= 0 and doc.get("unreferenced_at") and doc["unreferenced_at"] <= cutoff
+        ]
+
+        class Cursor:
+            async def to_list(self, length):
+                return matches[:length]
+
+        return Cursor()
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    async def find_one_and_delete(self, query, projection=None):
+        doc = self.docs.get(query["_id"])
+        if doc and doc.get("refcount", 0) <= 0:
+            return self.docs.pop(query["_id"])
+        return None
+
+@pytest.fixture
+def uploads(monkeypatch, tmp_path):
+    """업로드 폴더를 tmp_path로, uploads 컬렉션을 가짜로 바꿈"""
+    from app.services import upload_service
+    collection = FakeUploadsCollection()
+    monkeypatch.setattr(upload_service, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(upload_service, "uploads_collection", collection)
+    return collection
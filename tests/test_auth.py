@@ -12,3 +12,68 @@ def test_google_login():
     assert response.status_code == 200
     assert "auth_url" in response.json()
 
+
+def _use_test_jwt_settings(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "JWT_SECRET", "test-secret")
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "HS256")
+
+def test_verified_token_cache(monkeypatch):
+    """같은 토큰은 한 번만 서명 검증하고, LRU 크기를 넘으면 오래된 토큰부터 제거"""
+    from app.core import security
+    _use_test_jwt_settings(monkeypatch)
+    monkeypatch.setattr(security, "token_cache", security.TokenCache(maxsize=2))
+
+    decode_calls = []
+    original_decode = security.decode_access_token
+
+    def counting_decode(token):
+        decode_calls.append(token)
+        return original_decode(token)
+
+    monkeypatch.setattr(security, "decode_access_token", counting_decode)
+
+    tokens = [security.create_access_token({"email": f"user{i}@example.com"}) for i in range(3)]
+    assert security.verify_access_token(tokens[0])["email"] == "user0@example.com"
+    assert security.verify_access_token(tokens[0])["email"] == "user0@example.com"
+    assert len(decode_calls) == 1
+
+    security.verify_access_token(tokens[1])
+    security.verify_access_token(tokens[2])  # tokens[0] 제거
+    security.verify_access_token(tokens[0])
+    assert len(decode_calls) == 4
+    assert security.verify_access_token("invalid-token") is None
+
+def test_token_cache_respects_exp():
+    """토큰의 exp가 지나면 캐시에서 제공하지 않음"""
+    import time
+    from app.core.security import TokenCache
+
+    cache = TokenCache(maxsize=10)
+    cache.put("expired", {"email": "a@example.com", "exp": time.time() - 1})
+    cache.put("valid", {"email": "b@example.com", "exp": time.time() + 60})
+    cache.put("no-exp", {"email": "c@example.com"})
+    assert cache.get("expired") is None
+    assert cache.get("valid")["email"] == "b@example.com"
+    assert cache.get("no-exp") is None
+
+def test_current_user_dependency(monkeypatch):
+    """Bearer 헤더와 Authorization 쿠키 모두 지원"""
+    from fastapi import FastAPI
+    from app.core.security import CurrentUser, create_access_token
+    _use_test_jwt_settings(monkeypatch)
+
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(user: CurrentUser):
+        return {"email": user["email"]}
+
+    test_client = TestClient(app)
+    token = create_access_token({"email": "test@example.com"})
+
+    assert test_client.get("/whoami").status_code == 401
+    assert test_client.get("/whoami", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert test_client.get("/whoami", headers={"Authorization": f"Bearer {token}"}).json() == {"email": "test@example.com"}
+    test_client.cookies.set("Authorization", f"Bearer {token}")
+    assert test_client.get("/whoami").json() == {"email": "test@example.com"}
@@ -12,8 +12,138 @@ def test_create_category(client, auth_token):
     assert response.status_code == 200
     assert response.json()["name"] == CATEGORY_NAME
 
-def test_get_categories(client):
-    """카테고리 목록 조회 테스트"""
-    response = client.get("/categories/")
+def test_get_categories(client, assert_max_queries):
+    """카테고리 목록 조회 테스트 (ETag 버전 + 캐시가 오래됐으면 버전 확인/다시 로드까지 최대 4회)"""
+    with assert_max_queries(4):
+        response = client.get("/categories/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["categories"], list)
+
+def test_category_catalog_lookup():
+    """카테고리 캐시 조회 테스트"""
+    from bson import ObjectId
+    from app.services.category_catalog import CategoryCatalog
+
+    catalog = CategoryCatalog()
+    category_id = ObjectId()
+    catalog._build([{"_id": category_id, "name": "미분류", "created_by": "system"}], version=3)
+
+    assert catalog.version == 3
+    assert catalog.exists(str(category_id))
+    assert not catalog.exists(str(ObjectId()))
+    assert catalog.find_by_name("미분류", "system") == {"id": str(category_id), "name": "미분류"}
+    assert catalog.all() == [{"id": str(category_id), "name": "미분류"}]
+
+def test_category_tree_caches_until_invalidated(monkeypatch):
+    """트리는 집계 한 번으로 만들고, 무효화 전까지 캐시에서 반환 (스트림도 같은 JSON)"""
+    import asyncio
+    import json
+    from bson import ObjectId
+    from app.services import category_tree as category_tree_module
+    from app.services.category_tree import CategoryTree
+
+    category_id, program_id = ObjectId(), ObjectId()
+    aggregations = []
+
+    class FakeCategories:
+        def aggregate(self, pipeline):
+            aggregations.append(pipeline)
+
+            async def docs():
+                yield {"_id": category_id, "name": "미분류", "programs": [
+                    {"_id": program_id, "name": "사파리", "category_id": str(category_id)},
+                ]}
+                yield {"_id": ObjectId(), "name": "빈 카테고리", "programs": []}
+            return docs()
+
+    async def fake_get_versions(names):
+        return [1, 1]
+
+    monkeypatch.setattr(category_tree_module, "categories_collection", FakeCategories())
+    monkeypatch.setattr(category_tree_module, "get_versions", fake_get_versions)
+    tree = CategoryTree(check_interval=60)
+
+    async def collect_stream():
+        return b"".join([chunk async for chunk in tree.stream()])
+
+    streamed = asyncio.run(collect_stream())
+    body = asyncio.run(tree.body())
+    assert streamed == body
+    assert len(aggregations) == 1
+
+    categories = json.loads(body)["categories"]
+    assert categories[0] == {
+        "id": str(category_id), "name": "미분류", "program_count": 1,
+        "programs": [{"id": str(program_id), "name": "사파리", "category_id": str(category_id)}],
+    }
+    assert categories[1]["program_count"] == 0
+
+    tree.invalidate()
+    asyncio.run(tree.body())
+    assert len(aggregations) == 2
+
+def test_category_tree_refreshes_when_etag_version_moves_ahead(monkeypatch):
+    """다른 워커가 버전을 올리면 확인 주기 안이라도 새 ETag와 함께 새 본문을 만듦 (ETag v2 + 본문 v1 방지)"""
+    import asyncio
+    from app.services import category_tree as category_tree_module
+    from app.services.category_tree import CategoryTree
+
+    versions = [1, 1]
+    aggregations = []
+
+    class FakeCategories:
+        def aggregate(self, pipeline):
+            aggregations.append(list(versions))
+
+            async def docs():
+                yield {"_id": f"v{versions[0]}", "name": f"v{versions[0]}", "programs": []}
+            return docs()
+
+    async def fake_get_versions(names):
+        return list(versions)
+
+    monkeypatch.setattr(category_tree_module, "categories_collection", FakeCategories())
+    monkeypatch.setattr(category_tree_module, "get_versions", fake_get_versions)
+    tree = CategoryTree(check_interval=60)
+
+    asyncio.run(tree.body())
+    tree.observe_versions([1, 1])
+    asyncio.run(tree.body())
+    assert len(aggregations) == 1
+
+    versions[0] = 2  # 다른 워커의 쓰기
+    tree.observe_versions(list(versions))
+    assert b'"v2"' in asyncio.run(tree.body())
+    assert tree.versions == (2, 1)
+
+def test_category_catalog_reloads_when_etag_version_moves_ahead(monkeypatch):
+    """GET /categories/의 ETag 버전이 캐시보다 앞서면 확인 주기 안이라도 다시 로드"""
+    import asyncio
+    from app.services import category_catalog as category_catalog_module
+    from app.services.category_catalog import CategoryCatalog
+
+    version = 1
+
+    async def fake_get_version(name):
+        return version
+
+    class FakeCursor:
+        async def to_list(self, length):
+            return [{"_id": f"c{version}", "name": f"v{version}", "created_by": "system"}]
+
+    class FakeCategories:
+        def find(self, query, projection):
+            return FakeCursor()
+
+    monkeypatch.setattr(category_catalog_module, "get_version", fake_get_version)
+    monkeypatch.setattr(category_catalog_module, "categories_collection", FakeCategories())
+    catalog = CategoryCatalog(check_interval=60)
+    asyncio.run(catalog.refresh_if_stale())
+    assert catalog.all()[0]["name"] == "v1"
+
+    version = 2  # 다른 워커의 쓰기
+    asyncio.run(catalog.refresh_if_stale())
+    assert catalog.all()[0]["name"] == "v1"  # 확인 주기 안
+    catalog.observe_versions([version])
+    asyncio.run(catalog.refresh_if_stale())
+    assert catalog.all()[0]["name"] == "v2"
@@ -0,0 +1,48 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from app.core import conditional
+from app.core.conditional import conditional_get, etag_matches, make_etag
+
+def make_client(monkeypatch, versions):
+    async def fake_get_version(name):
+        return versions[name]
+
+    monkeypatch.setattr(conditional, "get_version", fake_get_version)
+    calls = []
+    app = FastAPI()
+
+    @app.get("/items", dependencies=[Depends(conditional_get("items"))])
+    async def items():
+        calls.append(1)
+        return {"items": [1, 2, 3]}
+
+    return TestClient(app), calls
+
+def test_etag_matches():
+    """ETag는 버전과 쿼리 문자열마다 다르고, If-None-Match 목록/와일드카드/약한 비교를 지원"""
+    etag = make_etag("posts", 3, "limit=20")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(make_etag("posts", 4, "limit=20"), etag)
+    assert make_etag("posts", 3, "limit=10") != etag
+
+def test_conditional_get_returns_304_until_version_changes(monkeypatch):
+    """버전이 같으면 라우트를 실행하지 않고 304, 버전이 바뀌면 200"""
+    versions = {"items": 1}
+    client, calls = make_client(monkeypatch, versions)
+
+    first = client.get("/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = client.get("/items", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert len(calls) == 1
+
+    versions["items"] = 2
+    changed = client.get("/items", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(calls) == 2
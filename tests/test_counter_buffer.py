@@ -0,0 +1,151 @@
+import asyncio
+from bson import ObjectId
+from app.services import counter_buffer as counter_buffer_module
+from app.services.counter_buffer import CounterBuffer
+from app.core.ranking import counter_update
+
+async def _noop_bump(name):
+    return 0
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.bulk_writes = []
+        self.fail = fail
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise RuntimeError("write failed")
+        self.bulk_writes.append(operations)
+
+def test_counter_buffer_merges_increments(monkeypatch):
+    """같은 게시글의 증감은 업데이트 하나로 합쳐서 한 번에 반영"""
+    monkeypatch.setattr(counter_buffer_module, "bump_version", _noop_bump)
+    collection = FakeCollection()
+    buffer = CounterBuffer(collection, enabled=True, interval_ms=1000, max_events=10_000)
+    post_a, post_b = ObjectId(), ObjectId()
+
+    async def run():
+        for _ in range(100):
+            buffer.add(post_a, "like_count", 1)
+        buffer.add(post_a, "scrap_count", 1)
+        buffer.add(post_b, "dislike_count", 1)
+        assert buffer.overlay(post_a, {"like_count": 5, "scrap_count": 0}) == {"like_count": 105, "scrap_count": 1}
+        await buffer.flush()
+
+    asyncio.run(run())
+
+    assert len(collection.bulk_writes) == 1
+    updates = {op._filter["_id"]: op._doc for op in collection.bulk_writes[0]}
+    assert updates == {
+        post_a: counter_update({"like_count": 100, "scrap_count": 1}),
+        post_b: counter_update({"dislike_count": 1}),
+    }
+    assert buffer.stats["last_flush_documents"] == 2
+    assert buffer.stats["last_flush_events"] == 102
+    assert buffer.pending(post_a) == {}
+
+def test_counter_buffer_keeps_deltas_on_failure():
+    """flush 실패 시 증감 값을 버리지 않음"""
+    buffer = CounterBuffer(FakeCollection(fail=True), enabled=True, interval_ms=1000, max_events=10_000)
+    post_id = ObjectId()
+
+    async def run():
+        buffer.add(post_id, "like_count", 1)
+        await buffer.flush()
+
+    asyncio.run(run())
+
+    assert buffer.pending(post_id) == {"like_count": 1}
+    assert buffer.stats["flush_errors"] == 1
+
+def test_counter_buffer_overlays_in_flight_deltas(monkeypatch):
+    """bulk_write 응답 전까지는 flush 중인 증감 값도 조회 결과에 포함"""
+    monkeypatch.setattr(counter_buffer_module, "bump_version", _noop_bump)
+    post_id = ObjectId()
+    seen = []
+
+    class SlowCollection(FakeCollection):
+        async def bulk_write(self, operations, ordered=True):
+            await asyncio.sleep(0)
+            seen.append(buffer.overlay(post_id, {"like_count": 0}))
+            await super().bulk_write(operations, ordered)
+
+    buffer = CounterBuffer(SlowCollection(), enabled=True, interval_ms=1000, max_events=10_000)
+
+    async def run():
+        buffer.add(post_id, "like_count", 2)
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0)
+        buffer.add(post_id, "like_count", 1)  # flush 중 새 증감
+        await flush
+
+    asyncio.run(run())
+
+    assert seen == [{"like_count": 3}]
+    assert buffer.pending(post_id) == {"like_count": 1}
+
+def test_counter_buffer_loop_survives_version_bump_failure(monkeypatch):
+    """버전 증가가 실패해도 주기적 flush는 계속 동작"""
+    async def failing_bump(name):
+        raise RuntimeError("versions unavailable")
+
+    monkeypatch.setattr(counter_buffer_module, "bump_version", failing_bump)
+    collection = FakeCollection()
+    buffer = CounterBuffer(collection, enabled=True, interval_ms=1, max_events=10_000)
+    post_id = ObjectId()
+
+    async def run():
+        await buffer.start()
+        buffer.add(post_id, "like_count", 1)
+        await asyncio.sleep(0.02)
+        buffer.add(post_id, "like_count", 1)
+        await asyncio.sleep(0.02)
+        assert not buffer._loop_task.done()
+        await buffer.stop()
+
+    asyncio.run(run())
+
+    assert len(collection.bulk_writes) == 2
+    assert buffer.stats["flushes"] == 2
+
+def test_counter_buffer_stop_waits_for_running_flush(monkeypatch):
+    """종료 시 진행 중인 bulk_write를 취소하지 않고 끝까지 기다림"""
+    monkeypatch.setattr(counter_buffer_module, "bump_version", _noop_bump)
+    started = []
+
+    class SlowCollection(FakeCollection):
+        async def bulk_write(self, operations, ordered=True):
+            started.append(1)
+            await asyncio.sleep(0.05)
+            await super().bulk_write(operations, ordered)
+
+    collection = SlowCollection()
+    buffer = CounterBuffer(collection, enabled=True, interval_ms=1, max_events=10_000)
+    post_id = ObjectId()
+
+    async def run():
+        await buffer.start()
+        buffer.add(post_id, "like_count", 1)
+        while not started:
+            await asyncio.sleep(0.001)
+        await buffer.stop()  # bulk_write 도중
+
+    asyncio.run(run())
+
+    assert len(collection.bulk_writes) == 1
+    assert buffer.pending(post_id) == {}
+    assert buffer.stats["flushes"] == 1
+
+def test_counter_buffer_stats_are_exported(monkeypatch):
+    """flush 크기/지연 지표가 /metrics 출력에 포함"""
+    from app.core.metrics import render_metrics
+    from app.services.counter_buffer import counter_buffer
+
+    monkeypatch.setitem(counter_buffer.stats, "last_flush_documents", 7)
+    monkeypatch.setitem(counter_buffer.stats, "max_flush_lag_ms", 250.0)
+    monkeypatch.setitem(counter_buffer.stats, "flush_errors", 2)
+    text = render_metrics()
+    assert "counter_buffer_last_flush_documents 7\n" in text
+    assert "counter_buffer_max_flush_lag_seconds 0.25" in text
+    assert "counter_buffer_flush_errors_total 2\n" in text
+    assert "# TYPE counter_buffer_flushes_total counter" in text
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from pymongo.read_preferences import ReadPreference
+from app.config import settings
+from app.core import database
+from app.core.pool_stats import PoolStats
+
+def test_client_options_from_settings(monkeypatch):
+    """Settings의 풀/타임아웃/압축 설정이 클라이언트 옵션으로 (0이면 생략, 설치되지 않은 압축은 제외)"""
+    monkeypatch.setattr(settings, "MONGO_MAX_POOL_SIZE", 50)
+    monkeypatch.setattr(settings, "MONGO_SOCKET_TIMEOUT_MS", 0)
+    monkeypatch.setattr(settings, "MONGO_WAIT_QUEUE_TIMEOUT_MS", 200)
+    monkeypatch.setattr(settings, "MONGO_COMPRESSORS", "zstd,unknown,zlib")
+    options = database.client_options()
+    assert options["maxPoolSize"] == 50
+    assert options["waitQueueTimeoutMS"] == 200
+    assert "socketTimeoutMS" not in options  # 0이면 드라이버 기본값
+    assert options["compressors"].split(",")[-1] == "zlib"  # 설치되지 않은 방식은 제외
+    assert "unknown" not in options["compressors"]
+
+def test_collection_proxy_follows_route_read_preference():
+    """read_preference 의존성이 설정한 요청에서만 secondaryPreferred로 읽음"""
+    proxy = database.CollectionProxy("posts")
+    dependency = database.read_preference("secondaryPreferred")
+
+    async def in_request():
+        await dependency()
+        return proxy.read_preference
+
+    try:
+        assert proxy.read_preference == ReadPreference.PRIMARY
+        assert asyncio.run(in_request()) == ReadPreference.SECONDARY_PREFERRED
+        assert proxy.read_preference == ReadPreference.PRIMARY  # ✅ 다른 요청(컨텍스트)에는 영향 없음
+    finally:
+        database.close_database()
+
+def test_pool_stats_tracks_waits():
+    """커넥션 풀 이벤트로 대기 수/최대 대기/실패/대기 시간 집계"""
+    stats = PoolStats()
+    stats.connection_created(None)
+    stats.connection_check_out_started(None)
+    stats.connection_check_out_started(None)
+    assert stats.snapshot()["waiting"] == 2
+    stats.connection_checked_out(SimpleNamespace(duration=0.004))
+    stats.connection_check_out_failed(SimpleNamespace(duration=0.5))
+    snapshot = stats.snapshot()
+    assert snapshot["checked_out"] == 1 and snapshot["waiting"] == 0
+    assert snapshot["max_waiting"] == 2
+    assert snapshot["checkout_failures"] == 1
+    assert round(snapshot["wait_time_max_ms"]) == 4
+    stats.connection_checked_in(None)
+    assert stats.snapshot()["checked_out"] == 0
+
+def test_initialize_database_skips_seed_unless_enabled(monkeypatch):
+    """seed는 SEED_DATABASE가 켜져 있을 때만 (운영 워커 부팅 시 왕복 없음)"""
+    calls = []
+
+    async def fake_seed():
+        calls.append("seed")
+
+    monkeypatch.setattr(database, "seed_database", fake_seed)
+    monkeypatch.setattr(settings, "APPLY_INDEXES_ON_STARTUP", False)
+    monkeypatch.setattr(settings, "SEED_DATABASE", False)
+    asyncio.run(database.initialize_database())
+    assert calls == []
+
+    monkeypatch.setattr(settings, "SEED_DATABASE", True)
+    asyncio.run(database.initialize_database())
+    assert calls == ["seed"]
+
+def test_create_app_has_no_import_side_effects():
+    """import와 create_app()만으로는 DB 클라이언트를 만들지 않고, app은 처음 참조할 때 한 번만 생성"""
+    import app.main as main
+    assert database._client is None  # ✅ import/create_app만으로는 DB 클라이언트를 만들지 않음
+    application = main.create_app()
+    assert application is not main.create_app()
+    assert main.app is main.app
+    assert any(getattr(route, "path", None) == "/" for route in application.routes)
+
+def test_lifespan_tears_down_started_services_when_startup_fails(monkeypatch):
+    """시작 중 실패해도 이미 시작한 서비스와 DB 클라이언트를 정리"""
+    import app.main as main
+    calls = []
+
+    async def noop(*args):
+        pass
+
+    async def fail():
+        raise RuntimeError("startup failed")
+
+    def record(name):
+        async def stop(*args):
+            calls.append(name)
+        return stop
+
+    monkeypatch.setattr(main, "connect_database", lambda: calls.append("connect"))
+    monkeypatch.setattr(main, "close_database", lambda: calls.append("close"))
+    monkeypatch.setattr(main, "get_database", lambda: None)
+    monkeypatch.setattr(main.slow_query_log, "start", noop)
+    monkeypatch.setattr(main.slow_query_log, "stop", record("slow_query_log"))
+    monkeypatch.setattr(main, "initialize_database", noop)
+    monkeypatch.setattr(main.category_catalog, "load", fail)
+    monkeypatch.setattr(main.counter_buffer, "stop", record("counter_buffer"))
+    monkeypatch.setattr(main.derivative_pipeline, "stop", record("derivative_pipeline"))
+    monkeypatch.setattr(main.post_search, "stop", record("post_search"))
+    monkeypatch.setattr(main.google_oauth, "close", record("google_oauth"))
+
+    async def run():
+        async with main.lifespan(None):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert calls[0] == "connect" and calls[-1] == "close"
+    assert {"slow_query_log", "counter_buffer", "derivative_pipeline", "post_search", "google_oauth"} <= set(calls)
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+from app.config import settings
+from app.services.google_oauth import GoogleOAuthClient, GOOGLE_JWKS_URL, GOOGLE_TOKEN_URL, GOOGLE_USERINFO_URL
+
+CLIENT_ID = "test-client-id.apps.googleusercontent.com"
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+class FakeGoogle:
+    """httpx MockTransport로 흉내 낸 Google OAuth 서버"""
+
+    def __init__(self, audience: str = CLIENT_ID, email_verified: bool = True, with_id_token: bool = True):
+        self.private_pem, self.public_jwk = make_key("key-1")
+        self.audience = audience
+        self.email_verified = email_verified
+        self.with_id_token = with_id_token
+        self.calls = []
+
+    def id_token(self, access_token: str) -> str:
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": self.audience,
+            "sub": "1234567890",
+            "email": "user@example.com",
+            "email_verified": self.email_verified,
+            "name": "테스트 유저",
+            "iat": int(time.time()),
+            "exp": int(time.time()) + 3600,
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": "key-1"}, access_token=access_token)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.calls.append(url)
+        if url == GOOGLE_TOKEN_URL:
+            token = {"access_token": "ya29.token"}
+            if self.with_id_token:
+                token["id_token"] = self.id_token("ya29.token")
+            return httpx.Response(200, json=token)
+        if url == GOOGLE_JWKS_URL:
+            return httpx.Response(200, json={"keys": [self.public_jwk]}, headers={"Cache-Control": "public, max-age=600"})
+        if url.startswith(GOOGLE_USERINFO_URL):
+            return httpx.Response(200, json={"email": "user@example.com", "verified_email": self.email_verified, "name": "userinfo"})
+        return httpx.Response(404)
+
+def test_login_verifies_id_token_locally(monkeypatch):
+    """ID 토큰을 로컬에서 검증하고 userinfo 호출과 JWKS 재조회를 생략"""
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    google = FakeGoogle()
+    client = GoogleOAuthClient(transport=httpx.MockTransport(google.handler))
+
+    async def run():
+        await client.start()
+        first = await client.fetch_user_info("code-1", "http://localhost/callback")
+        second = await client.fetch_user_info("code-2", "http://localhost/callback")
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second == {"email": "user@example.com", "name": "테스트 유저"}
+    assert google.calls.count(GOOGLE_JWKS_URL) == 1
+    assert google.calls.count(GOOGLE_TOKEN_URL) == 2
+    assert not any(call.startswith(GOOGLE_USERINFO_URL) for call in google.calls)
+
+def test_login_rejects_token_for_other_audience(monkeypatch):
+    """다른 클라이언트용으로 발급된 ID 토큰은 거부"""
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    google = FakeGoogle(audience="someone-else")
+    client = GoogleOAuthClient(transport=httpx.MockTransport(google.handler))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(client.fetch_user_info("code", "http://localhost/callback"))
+    assert exc.value.status_code == 400
+
+@pytest.mark.parametrize("with_id_token", [True, False])
+def test_login_rejects_unverified_email(monkeypatch, with_id_token):
+    """이메일이 확인되지 않은 계정은 ID 토큰/userinfo 어느 경로든 400"""
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    google = FakeGoogle(email_verified=False, with_id_token=with_id_token)
+    client = GoogleOAuthClient(transport=httpx.MockTransport(google.handler))
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(client.fetch_user_info("code", "http://localhost/callback"))
+    assert exc.value.status_code == 400
+
+def test_login_reports_unreachable_google(monkeypatch):
+    """Google 연결 실패는 502"""
+    def unreachable(request):
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    client = GoogleOAuthClient(transport=httpx.MockTransport(unreachable))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(client.fetch_user_info("code", "http://localhost/callback"))
+    assert exc.value.status_code == 502
@@ -0,0 +1,22 @@
+from PIL import Image
+from app.core.images import VARIANTS, render_variants, variant_filename
+
+def test_render_variants_resizes_and_strips_exif(tmp_path):
+    """파생 이미지는 크기/용량 제한을 지키고 EXIF가 제거됨"""
+    blob_name = "a" * 64 + ".jpg"
+    source = tmp_path / blob_name
+    exif = Image.Exif()
+    exif[0x010F] = "TestCamera"  # Make
+    exif[0x0112] = 6  # Orientation: 90도 회전
+    Image.linear_gradient("L").resize((2000, 1000)).convert("RGB").save(source, exif=exif)
+
+    variants = render_variants(str(source), str(tmp_path), blob_name)
+
+    assert variants == {variant: variant_filename(blob_name, variant) for variant in VARIANTS}
+    for variant, (max_side, max_bytes) in VARIANTS.items():
+        path = tmp_path / variants[variant]
+        assert path.stat().st_size <= max_bytes
+        with Image.open(path) as image:
+            assert max(image.size) <= max_side
+            assert image.height > image.width  # ✅ EXIF 회전이 픽셀에 반영됨
+            assert len(image.getexif()) == 0
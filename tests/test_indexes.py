@@ -0,0 +1,28 @@
+from pymongo import IndexModel
+from app.core.indexes import INDEXES, diff_indexes
+
+def test_registry_has_unique_user_email():
+    """users.email 유니크 인덱스 정의 확인"""
+    email_index = INDEXES["users"][0].document
+    assert email_index["key"] == {"email": 1}
+    assert email_index["unique"] is True
+
+def test_diff_indexes_missing_and_different():
+    """누락/정의 불일치 인덱스 감지 테스트"""
+    expected = [
+        IndexModel([("email", 1)], name="users_email_unique", unique=True),
+        IndexModel([("name", 1)], name="users_name"),
+    ]
+    existing = {
+        "_id_": {"key": [("_id", 1)], "v": 2},
+        "users_email_unique": {"key": [("email", 1.0)], "v": 2},  # unique 누락
+    }
+    missing, different = diff_indexes(expected, existing)
+    assert [m.document["name"] for m in missing] == ["users_name"]
+    assert [m.document["name"] for m in different] == ["users_email_unique"]
+
+def test_diff_indexes_up_to_date():
+    """정의와 같은 인덱스는 드리프트로 보지 않음"""
+    expected = [IndexModel([("email", 1)], name="users_email_unique", unique=True)]
+    existing = {"users_email_unique": {"key": [("email", 1.0)], "unique": True, "v": 2}}
+    assert diff_indexes(expected, existing) == ([], [])
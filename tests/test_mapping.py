@@ -0,0 +1,63 @@
+from datetime import datetime
+from bson import ObjectId
+from app.core.mapping import DocumentMapper, Field, id_str
+from app.schemas.documents import POST_MAPPER, POST_SUMMARY_MAPPER, PRESET_MAPPER
+
+def test_mapper_renames_id_and_coerces_ids():
+    """_id → id, ObjectId는 문자열로, 중첩 키와 없는 필드는 기본값"""
+    mapper = DocumentMapper("sample", {
+        "id": Field(source="_id", convert=str),
+        "name": Field(default=""),
+        "category_id": Field(convert=id_str),
+        "thumb": Field(source="variants.thumb"),
+    })
+    obj_id, category_id = ObjectId(), ObjectId()
+    assert mapper({"_id": obj_id, "category_id": category_id, "variants": {"thumb": "/t.jpg"}, "extra": 1}) == {
+        "id": str(obj_id), "name": "", "category_id": str(category_id), "thumb": "/t.jpg",
+    }
+    assert mapper({"_id": obj_id, "name": "a", "variants": None}) == {
+        "id": str(obj_id), "name": "a", "category_id": None, "thumb": None,
+    }
+
+def test_post_mappers_match_response_shapes():
+    """게시글 매퍼 결과가 전체/요약 응답 모양과 일치"""
+    obj_id = ObjectId()
+    created_at = datetime(2024, 2, 10, 12, 0, 0)
+    post = {
+        "_id": obj_id, "title": "제목", "content": "본문", "snippet": "본",
+        "image_url": "/static/uploads/a.jpg", "image_variants": {"thumb": "/static/uploads/a.thumb.jpg"},
+        "is_public": True, "like_count": 3, "created_at": created_at, "updated_at": created_at,
+    }
+    full = POST_MAPPER(post)
+    assert full["id"] == str(obj_id)
+    assert full["thumbnail_url"] == "/static/uploads/a.thumb.jpg"
+    assert full["dislike_count"] == 0
+    assert "snippet" not in full
+
+    summary = POST_SUMMARY_MAPPER(post)
+    assert summary["snippet"] == "본" and "content" not in summary
+
+    partial = POST_MAPPER.only(["title", "like_count"])
+    assert partial(post) == {"id": str(obj_id), "title": "제목", "like_count": 3}
+    assert POST_MAPPER.only(["title", "like_count"]) is partial
+
+def test_preset_mapper_defaults():
+    """프리셋 매퍼는 빠진 필드를 기본값으로 채우고 카테고리 ID를 문자열로"""
+    preset = PRESET_MAPPER({"_id": ObjectId(), "category_ids": [ObjectId()]})
+    assert preset["name"] == "" and preset["is_public"] is False
+    assert isinstance(preset["category_ids"][0], str)
+    assert isinstance(preset["created_at"], datetime)
+
+def test_only_cache_is_canonical_and_bounded():
+    """필드 순서가 달라도 같은 매퍼, 조합이 많아도 MAX_SUBSETS개까지만 보관"""
+    from itertools import combinations, permutations
+    from app.core import mapping
+    mapper = DocumentMapper("bounded", {"id": Field(source="_id", convert=str), **{f"f{i}": Field() for i in range(8)}})
+    first = mapper.only(["f1", "f0", "f2"])
+    assert all(mapper.only(order) is first for order in permutations(["f0", "f1", "f2"]))
+    assert list(first.fields) == ["id", "f0", "f1", "f2"]
+
+    for size in range(1, 9):
+        for combination in combinations([f"f{i}" for i in range(8)], size):
+            mapper.only(combination)
+    assert len(mapper._subsets) == mapping.MAX_SUBSETS
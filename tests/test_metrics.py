@@ -0,0 +1,69 @@
+import threading
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.core.metrics import Counter, Histogram, CommandMetrics, MONGO_COMMAND_FAILURES, MONGO_COMMAND_LATENCY, render_metrics
+from app.main import create_app
+
+def test_counter_merges_thread_shards():
+    """스레드마다 따로 기록해도 수집 시 합계는 정확"""
+    counter = Counter("test_thread_total", "test", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(("b",), 2)
+    assert counter.value(("a",)) == 4000
+    assert 'test_thread_total{kind="b"} 2' in render_metrics()
+
+def test_histogram_buckets_are_cumulative():
+    """히스토그램 버킷은 누적(le 이하) 개수로 출력"""
+    histogram = Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/x",), value)
+    text = render_metrics()
+    assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 2' in text  # ✅ 경계값은 le(이하) 버킷
+    assert 'test_latency_seconds_bucket{route="/x",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/x"} 4' in text
+
+def test_requests_are_labeled_by_route_template():
+    """요청 지표는 경로 템플릿으로 라벨링하고 매칭되지 않은 경로는 하나로 묶음"""
+    client = TestClient(create_app())  # lifespan 없이 (DB 불필요)
+    assert client.get("/").status_code == 200
+    client.get("/no-such-path")
+    text = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in text
+    assert 'route="<unmatched>",status="404"' in text  # ✅ 경로별 라벨이 무한히 늘지 않음
+    assert "http_requests_in_flight 1" in text  # /metrics 요청 자신
+
+def test_route_and_method_labels_are_bounded():
+    """include_router prefix 포함 템플릿, 표준이 아닌 메서드는 OTHER"""
+    client = TestClient(create_app(), raise_server_exceptions=False)
+    client.get("/system/db-pool")
+    client.get("/post/not-an-id")
+    for i in range(5):
+        client.request(f"X{i}", "/no-such-path")
+    text = client.get("/metrics").text
+    assert 'route="/system/db-pool",status="200"' in text
+    assert 'route="/post/{post_id}"' in text
+    assert 'http_requests_total{method="OTHER",route="<unmatched>",status="404"} 5' in text
+    assert 'method="X0"' not in text
+
+def test_command_listener_records_collection_and_failures():
+    """Mongo 명령 지연/실패를 컬렉션별로 기록 (getMore는 collection 필드)"""
+    listener = CommandMetrics()
+    started = SimpleNamespace(connection_id=("db", 1), request_id=7, command_name="find", command={"find": "metric_posts"})
+    listener.started(started)
+    listener.failed(SimpleNamespace(connection_id=("db", 1), request_id=7, command_name="find", duration_micros=1500))
+    assert MONGO_COMMAND_FAILURES.value(("metric_posts", "find")) == 1
+    assert MONGO_COMMAND_LATENCY._merged()[("metric_posts", "find")][-1] == 0.0015
+
+    listener.started(SimpleNamespace(connection_id=("db", 1), request_id=8, command_name="getMore", command={"getMore": 123, "collection": "metric_posts"}))
+    listener.succeeded(SimpleNamespace(connection_id=("db", 1), request_id=8, command_name="getMore", duration_micros=10))
+    assert ("metric_posts", "getMore") in MONGO_COMMAND_LATENCY._merged()
@@ -0,0 +1,282 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import MongoClient
+from app.config import settings
+from app.core.utils import encode_cursor, decode_cursor, encode_score_cursor
+from app.core.ranking import HOT_SORT, hot_score
+from app.services import post_service
+from app.services.post_service import build_feed_query, build_post_projection, parse_post_fields, FEED_SORT
+
+def _plan_stages(plan):
+    """explain 결과의 실행 계획에서 stage 이름을 모두 수집"""
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+def test_cursor_roundtrip():
+    """커서 인코딩/디코딩 테스트"""
+    created_at = datetime(2024, 2, 10, 12, 0, 0, 123000)
+    obj_id = ObjectId()
+    assert decode_cursor(encode_cursor(created_at, obj_id)) == (created_at, obj_id)
+
+def test_get_posts_invalid_cursor(client):
+    """잘못된 커서 요청 시 400 반환 테스트"""
+    response = client.get("/post/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_get_posts_pagination(client, assert_max_queries):
+    """게시글 목록 페이지네이션 테스트 (페이지마다 버전 조회 + 목록 조회 2회)"""
+    with assert_max_queries(2):
+        response = client.get("/post/", params={"limit": 1})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["posts"]) <= 1
+        if data["next_cursor"]:
+            next_page = client.get("/post/", params={"limit": 1, "cursor": data["next_cursor"]})
+            assert next_page.status_code == 200
+            assert next_page.json()["posts"][0]["id"] != data["posts"][0]["id"]
+
+def test_feed_query_uses_index_without_sort(client):
+    """피드 쿼리가 메모리 내 SORT 없이 인덱스로 처리되는지 확인"""
+    posts = MongoClient(settings.MONGO_URI)["safari_db"]["posts"]
+    cursor = encode_cursor(datetime.utcnow(), ObjectId())
+    for query in (build_feed_query(), build_feed_query(cursor)):
+        explain = posts.find(query).sort(FEED_SORT).limit(21).explain()
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        assert "SORT" not in stages
+        assert "IXSCAN" in stages
+
+def test_hot_feed_query_uses_index_without_sort(client):
+    """sort=hot 쿼리도 hot_score 인덱스로 정렬 없이 처리되는지 확인"""
+    posts = MongoClient(settings.MONGO_URI)["safari_db"]["posts"]
+    cursor = encode_score_cursor(1.5, ObjectId())
+    for query in (build_feed_query(sort="hot"), build_feed_query(cursor, sort="hot")):
+        explain = posts.find(query).sort(HOT_SORT).limit(21).explain()
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        assert "SORT" not in stages
+        assert "IXSCAN" in stages
+
+def test_hot_score_decays_and_weights_reactions():
+    """반응이 많을수록 높고, 시간이 지날수록 낮아짐 (싫어요가 많아도 0 미만으로 내려가지 않음)"""
+    now = datetime.utcnow()
+    fresh = {"like_count": 10, "comment_count": 2, "created_at": now}
+    assert hot_score(fresh, now) > hot_score({**fresh, "like_count": 5}, now)
+    assert hot_score(fresh, now) > hot_score(fresh, now + timedelta(hours=12)) > 0
+    assert hot_score({"dislike_count": 10, "created_at": now}, now) == 0
+
+def test_parse_post_fields():
+    """fields 파라미터 파싱 테스트"""
+    assert parse_post_fields(None) is None
+    assert parse_post_fields("title, like_count,title") == ["title", "like_count"]
+    with pytest.raises(ValueError):
+        parse_post_fields("title,password")
+
+def test_summary_projection_uses_snippet():
+    """요약 뷰는 본문 대신 서버측 snippet을 projection에 포함"""
+    projection = build_post_projection(view="summary")
+    assert "content" not in projection
+    assert "$substrCP" in projection["snippet"]
+
+def test_get_posts_summary_view(client):
+    """요약 뷰 목록 조회 테스트"""
+    response = client.get("/post/", params={"view": "summary"})
+    assert response.status_code == 200
+    for post in response.json()["posts"]:
+        assert "snippet" in post
+        assert "content" not in post
+
+def test_get_posts_fields(client):
+    """fields로 선택한 필드만 반환하는지 테스트"""
+    response = client.get("/post/", params={"fields": "title,like_count"})
+    assert response.status_code == 200
+    for post in response.json()["posts"]:
+        assert set(post) == {"id", "title", "like_count"}
+
+def test_save_image_streams_and_limits_size(tmp_path, monkeypatch, uploads):
+    """업로드는 원자적으로 저장되고, 최대 크기를 넘으면 임시 파일 없이 중단"""
+    import asyncio
+    import hashlib
+    import io
+    from starlette.datastructures import UploadFile
+    from app.services import upload_service
+
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 4)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 10)
+
+    url = asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(b"123456789"), filename="ok.PNG")))
+    name = hashlib.sha256(b"123456789").hexdigest() + ".png"
+    assert url == f"/static/uploads/{name}"
+    assert (tmp_path / name).read_bytes() == b"123456789"
+
+    with pytest.raises(upload_service.UploadTooLarge):
+        asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(b"x" * 100), filename="big.png")))
+    assert sorted(p.name for p in tmp_path.iterdir()) == [name]
+
+def test_save_image_dedupes_by_content(tmp_path, monkeypatch, uploads):
+    """같은 내용은 이름이 달라도 한 번만 저장"""
+    import asyncio
+    import io
+    from starlette.datastructures import UploadFile
+    from app.services import upload_service
+
+    writes = []
+    original_write = upload_service._write_upload
+
+    async def counting_write(file, file_location):
+        writes.append(file_location)
+        await original_write(file, file_location)
+
+    monkeypatch.setattr(upload_service, "_write_upload", counting_write)
+
+    first = asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(b"meme"), filename="a.jpg")))
+    second = asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(b"meme"), filename="b.jpg")))
+    other = asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(b"other"), filename="a.jpg")))
+
+    assert first == second != other
+    assert len(writes) == 2
+    assert upload_service.blob_name_from_url(first) == first.rsplit("/", 1)[1]
+    assert upload_service.blob_name_from_url("https://example.com/a.jpg") is None
+
+class FakeFeedCursor:
+    """프리셋별 find 커서 흉내 (가져간 문서 수 기록)"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.fetched = 0
+        self._limit = None
+
+    def sort(self, order):
+        self.docs = sorted(self.docs, key=lambda doc: (doc["created_at"], doc["_id"]), reverse=True)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    async def next(self):
+        if self.fetched >= min(len(self.docs), self._limit):
+            raise StopAsyncIteration
+        self.fetched += 1
+        return self.docs[self.fetched - 1]
+
+    async def close(self):
+        pass
+
+class FakeFeedCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.cursors = {}
+
+    def find(self, query, projection=None):
+        matched = [doc for doc in self.docs if doc["preset_id"] == query["preset_id"] and _after(doc, query.get("$or"))]
+        cursor = self.cursors[query["preset_id"]] = FakeFeedCursor(matched)
+        return cursor
+
+def _after(doc, conditions):
+    if not conditions:
+        return True
+    created_at, obj_id = conditions[1]["created_at"], conditions[1]["_id"]["$lt"]
+    return (doc["created_at"], doc["_id"]) < (created_at, obj_id)
+
+def test_preset_feed_merges_and_stops_when_page_is_full(monkeypatch):
+    """프리셋별 커서를 최신순으로 합치고, 페이지가 차면 더 읽지 않음"""
+    start = datetime(2024, 1, 1)
+    docs = []
+    for minute in range(30):
+        preset_id = "a" if minute % 3 else "b"
+        docs.append({
+            "_id": ObjectId(), "preset_id": preset_id, "title": f"{minute}", "content": "",
+            "is_public": True, "created_at": start + timedelta(minutes=minute), "updated_at": start,
+        })
+    docs.append({"_id": ObjectId(), "preset_id": "c", "title": "old", "content": "", "is_public": True,
+                 "created_at": start - timedelta(days=1), "updated_at": start})
+    collection = FakeFeedCollection(docs)
+    monkeypatch.setattr(post_service, "posts_collection", collection)
+
+    posts, cursor = asyncio.run(post_service.get_preset_feed(["a", "b", "c"], limit=5))
+    assert [post["title"] for post in posts] == ["29", "28", "27", "26", "25"]
+    assert sum(preset_cursor.fetched for preset_cursor in collection.cursors.values()) <= 5 + 3
+
+    seen = [post["title"] for post in posts]
+    while cursor:
+        posts, cursor = asyncio.run(post_service.get_preset_feed(["a", "b", "c"], cursor, limit=5))
+        seen += [post["title"] for post in posts]
+    assert seen == [str(minute) for minute in range(29, -1, -1)] + ["old"]
+
+def test_parse_preset_ids():
+    """쉼표로 구분한 프리셋 ID는 중복 없이 순서대로, 비어 있으면 ValueError"""
+    assert post_service.parse_preset_ids("a, b,a") == ["a", "b"]
+    with pytest.raises(ValueError):
+        post_service.parse_preset_ids(" , ")
+
+def test_hot_sweep_runs_only_with_lease(monkeypatch):
+    """hot_score 갱신은 임대를 가진 워커에서만 실행"""
+    from pymongo.errors import DuplicateKeyError
+    from app.core import versions
+
+    holders = {}
+
+    class FakeVersions:
+        async def update_one(self, query, update, upsert=False):
+            current = holders.get(query["_id"])
+            if current is not None and current != query["$or"][0]["holder"]:
+                raise DuplicateKeyError("E11000 duplicate key error")
+            holders[query["_id"]] = update["$set"]["holder"]
+
+    monkeypatch.setattr(versions, "versions_collection", FakeVersions())
+    assert asyncio.run(versions.acquire_lease("hot_sweep", "worker-a", 60))
+    assert asyncio.run(versions.acquire_lease("hot_sweep", "worker-a", 60))  # ✅ 갱신
+    assert not asyncio.run(versions.acquire_lease("hot_sweep", "worker-b", 60))
+
+    sweeps = []
+
+    async def fake_refresh_hot_scores():
+        sweeps.append(1)
+
+    async def run(lease_held):
+        async def fake_acquire_lease(name, holder, seconds):
+            return lease_held
+
+        monkeypatch.setattr(post_service, "acquire_lease", fake_acquire_lease)
+        task = asyncio.create_task(post_service.run_hot_sweep(0.001))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    monkeypatch.setattr(post_service, "refresh_hot_scores", fake_refresh_hot_scores)
+    asyncio.run(run(False))
+    assert not sweeps
+    asyncio.run(run(True))
+    assert sweeps
+
+def test_upload_too_large_maps_to_413(monkeypatch):
+    """서비스의 UploadTooLarge는 라우트에서 413으로 변환"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.core.security import require_current_user
+    from app.routes import post as post_routes
+    from app.services.upload_service import UploadTooLarge
+
+    async def too_large(*args, **kwargs):
+        raise UploadTooLarge("File too large")
+
+    monkeypatch.setattr(post_routes, "create_post", too_large)
+    monkeypatch.setattr(post_routes, "save_image", too_large)
+    app = FastAPI()
+    app.include_router(post_routes.router, prefix="/post")
+    app.dependency_overrides[require_current_user] = lambda: {"email": "user@example.com"}
+
+    with TestClient(app) as client:
+        files = {"file": ("big.png", b"x" * 10, "image/png")}
+        created = client.post("/post/", data={"title": "제목", "content": "본문"}, files=files)
+        updated = client.put(f"/post/{ObjectId()}", data={"title": "제목"}, files=files)
+    assert created.status_code == updated.status_code == 413
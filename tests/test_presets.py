@@ -0,0 +1,72 @@
+import asyncio
+from bson import ObjectId
+from app.services import preset_service
+
+async def _noop_bump(name):
+    return 0
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+class FakeCollection:
+    """DB 왕복 횟수를 세는 가짜 컬렉션"""
+
+    def __init__(self, docs=()):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.round_trips = 0
+
+    def find(self, query, projection=None):
+        self.round_trips += 1
+        ids = query["_id"]["$in"]
+        return FakeCursor([{"_id": _id} for _id in ids if _id in self.docs])
+
+    async def find_one(self, query, projection=None):
+        self.round_trips += 1
+        return self.docs.get(query["_id"])
+
+    async def insert_one(self, doc):
+        self.round_trips += 1
+        doc["_id"] = ObjectId()
+        self.docs[doc["_id"]] = dict(doc)
+
+        class Result:
+            inserted_id = doc["_id"]
+        return Result()
+
+    async def update_one(self, query, update):
+        self.round_trips += 1
+        self.docs[query["_id"]].update(update["$set"])
+
+def test_create_preset_validates_categories_in_one_query(monkeypatch):
+    """카테고리 ID 개수와 상관없이 검증 쿼리는 한 번만 실행"""
+    existing = [ObjectId() for _ in range(50)]
+    categories = FakeCollection({"_id": _id} for _id in existing)
+    monkeypatch.setattr(preset_service, "categories_collection", categories)
+    monkeypatch.setattr(preset_service, "presets_collection", FakeCollection())
+    monkeypatch.setattr(preset_service, "bump_version", _noop_bump)
+
+    requested = [str(_id) for _id in existing] + [str(ObjectId()), "invalid-id"]
+    preset = asyncio.run(preset_service.create_preset("프리셋", None, requested, "test@example.com", True))
+
+    assert categories.round_trips == 1
+    assert preset["category_ids"] == [str(_id) for _id in existing]
+
+def test_update_preset_updates_the_right_document(monkeypatch):
+    """카테고리 검증 후에도 수정 대상 프리셋이 바뀌지 않는지 확인"""
+    category_id = ObjectId()
+    preset_id = ObjectId()
+    categories = FakeCollection([{"_id": category_id}])
+    presets = FakeCollection([{"_id": preset_id, "name": "기존", "category_ids": []}])
+    monkeypatch.setattr(preset_service, "categories_collection", categories)
+    monkeypatch.setattr(preset_service, "presets_collection", presets)
+    monkeypatch.setattr(preset_service, "bump_version", _noop_bump)
+
+    updated = asyncio.run(preset_service.update_preset(str(preset_id), "변경", None, [str(category_id)], None))
+
+    assert categories.round_trips == 1
+    assert updated["id"] == str(preset_id)
+    assert updated["category_ids"] == [str(category_id)]
@@ -0,0 +1,68 @@
+import itertools
+import logging
+from types import SimpleNamespace
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.config import settings
+from app.core.profiler import QueryProfilerMiddleware, profile_queries, query_profiler
+
+_request_ids = itertools.count(1)
+
+def _run_command(collection: str, command: str = "find", duration_micros: int = 1000):
+    """드라이버가 명령 하나를 실행할 때의 리스너 호출 흉내"""
+    event = SimpleNamespace(
+        connection_id=("localhost", 27017), request_id=next(_request_ids), command_name=command,
+        command={command: collection}, duration_micros=duration_micros,
+    )
+    query_profiler.started(event)
+    query_profiler.succeeded(event)
+
+async def n_plus_one(request):
+    _run_command("posts")
+    for _ in range(6):
+        _run_command("users")
+    return PlainTextResponse("ok")
+
+def make_client():
+    app = Starlette(routes=[Route("/posts", n_plus_one)])
+    app.add_middleware(QueryProfilerMiddleware)
+    return TestClient(app)
+
+def test_commands_outside_profile_are_ignored():
+    """프로파일 블록 밖에서 실행된 명령은 기록하지 않음"""
+    _run_command("posts")
+    with profile_queries() as profile:
+        _run_command("posts", duration_micros=2500)
+        _run_command("posts", command="insert")
+    _run_command("posts")
+    assert profile.count == 2
+    assert profile.total_ms == pytest.approx(3.5)
+
+def test_server_timing_only_when_requested(monkeypatch):
+    """header 모드에서는 프로파일 헤더가 있는 요청에만 Server-Timing (반복 명령 포함)"""
+    client = make_client()
+    monkeypatch.setattr(settings, "DB_PROFILE", "header")
+    assert "server-timing" not in client.get("/posts").headers
+
+    timing = client.get("/posts", headers={settings.DB_PROFILE_HEADER: "1"}).headers["server-timing"]
+    assert timing.startswith('db;dur=7.00;desc="7 commands"')
+    assert 'db-repeat;desc="users.find x6"' in timing  # ✅ N+1 의심
+
+def test_repeated_commands_are_logged(monkeypatch, caplog):
+    """같은 명령이 반복되면 라우트 이름과 함께 경고 로그 (N+1 탐지)"""
+    monkeypatch.setattr(settings, "DB_PROFILE", "always")
+    with caplog.at_level(logging.WARNING, logger="app.core.profiler"):
+        make_client().get("/posts")
+    assert "GET /posts" in caplog.text and "users.find x6" in caplog.text
+
+def test_assert_max_queries_fails_over_limit(assert_max_queries):
+    """assert_max_queries는 한도를 넘은 요청을 라우트와 명령 수로 보고"""
+    client = make_client()
+    with assert_max_queries(7):
+        client.get("/posts")
+    with pytest.raises(AssertionError, match="GET /posts: 7"):
+        with assert_max_queries(3):
+            client.get("/posts")
@@ -1,4 +1,10 @@
+import asyncio
 import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.services import program_service
+from app.schemas.base import bulk_response, validate_bulk_items
+from app.schemas.program import ProgramCreate
 
 @pytest.mark.asyncio
 def test_create_program(test_client):
@@ -13,3 +19,79 @@ def test_get_programs(test_client):
     response = test_client.get("/programs/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+async def _noop_bump(name):
+    return 0
+
+class FakeBulkCollection:
+    """insert_many / bulk_write 호출을 기록하고, 지정한 위치를 실패시키는 가짜 컬렉션"""
+
+    def __init__(self, fail_positions=(), existing=()):
+        self.fail_positions = set(fail_positions)
+        self.existing = set(existing)
+        self.calls = []
+
+    def _maybe_fail(self, count):
+        errors = [{"index": position, "errmsg": "duplicate key"} for position in sorted(self.fail_positions) if position < count]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append(("insert_many", len(docs), ordered))
+        for doc in docs:
+            doc["_id"] = ObjectId()
+        self._maybe_fail(len(docs))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.calls.append(("bulk_write", len(operations), ordered))
+        self._maybe_fail(len(operations))
+
+    def find(self, query, projection=None):
+        docs = [{"_id": _id} for _id in query["_id"]["$in"] if _id in self.existing]
+
+        class Cursor:
+            async def to_list(self, length=None):
+                return docs
+        return Cursor()
+
+def test_create_programs_reports_per_item_errors(monkeypatch):
+    """insert_many 한 번으로 생성하고, 실패한 항목만 오류로 보고"""
+    collection = FakeBulkCollection(fail_positions=[1])
+    monkeypatch.setattr(program_service, "programs_collection", collection)
+    monkeypatch.setattr(program_service, "bump_version", _noop_bump)
+
+    results = asyncio.run(program_service.create_programs(
+        [(0, "a", "c1"), (2, "b", "c1"), (3, "c", "c2")], "test@example.com"
+    ))
+    assert collection.calls == [("insert_many", 3, False)]
+    assert [result["index"] for result in results] == [0, 2, 3]
+    assert results[1]["error"] == "duplicate key"
+    assert results[0]["id"] and results[2]["id"]
+
+def test_update_programs_skips_missing(monkeypatch):
+    """일괄 수정은 있는 프로그램만 bulk_write 한 번으로, 없는/잘못된 ID는 항목별 오류"""
+    program_id = ObjectId()
+    collection = FakeBulkCollection(existing=[program_id])
+    monkeypatch.setattr(program_service, "programs_collection", collection)
+    monkeypatch.setattr(program_service, "bump_version", _noop_bump)
+
+    results = asyncio.run(program_service.update_programs(
+        [(0, str(program_id), "새 이름", None), (1, str(ObjectId()), "없음", None), (2, "invalid", "x", None)]
+    ))
+    assert collection.calls == [("bulk_write", 1, False)]
+    assert bulk_response(results) == {
+        "succeeded": 1,
+        "failed": 2,
+        "results": [
+            {"index": 0, "id": str(program_id)},
+            {"index": 1, "error": "Program not found"},
+            {"index": 2, "error": "Program not found"},
+        ],
+    }
+
+def test_validate_bulk_items_reuses_create_validation():
+    """일괄 요청 항목은 생성 스키마로 검증하고 실패한 항목만 오류로 반환"""
+    valid, errors = validate_bulk_items(ProgramCreate, [{"name": "ok"}, {"name": ""}, {}])
+    assert [index for index, _ in valid] == [0]
+    assert [error["index"] for error in errors] == [1, 2]
+    assert errors[0]["error"].startswith("name:")
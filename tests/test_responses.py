@@ -0,0 +1,46 @@
+from datetime import datetime
+import orjson
+from bson import ObjectId
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from app.core import conditional
+from app.core.conditional import conditional_get
+from app.core.responses import FastJSONResponse, trusted_json
+from app.schemas.category import CategoryResponse
+
+def test_fast_json_response_encodes_datetime_and_objectid():
+    """orjson 응답이 datetime/ObjectId/pydantic 모델을 기존 JSON과 같은 모양으로 직렬화"""
+    obj_id = ObjectId()
+    created_at = datetime(2024, 2, 10, 12, 0, 0, 123000)
+    body = FastJSONResponse({
+        "id": obj_id,
+        "created_at": created_at,
+        "category": CategoryResponse(id="c1", name="기타"),
+    }).body
+    assert orjson.loads(body) == {
+        "id": str(obj_id),
+        "created_at": "2024-02-10T12:00:00.123000",
+        "category": {"id": "c1", "name": "기타"},
+    }
+
+def test_trusted_json_keeps_dependency_headers(monkeypatch):
+    """Response를 직접 반환해도 conditional_get이 설정한 ETag가 유지되어야 함"""
+    async def fake_get_version(name):
+        return 1
+
+    monkeypatch.setattr(conditional, "get_version", fake_get_version)
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/items", dependencies=[Depends(conditional_get("items"))])
+    async def items(response: Response):
+        return trusted_json({"items": [{"id": ObjectId("65c7a0f0a1b2c3d4e5f60718")}]}, response)
+
+    client = TestClient(app)
+    first = client.get("/items")
+    assert first.status_code == 200
+    assert first.json() == {"items": [{"id": "65c7a0f0a1b2c3d4e5f60718"}]}
+    assert first.headers["etag"]
+    assert first.headers["content-length"] == str(len(first.content))
+
+    cached = client.get("/items", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
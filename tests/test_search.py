@@ -0,0 +1,150 @@
+from app.core.search import InvertedIndex, tokenize
+
+def test_tokenize_bigrams():
+    """문자 bigram 토큰화 (한 글자 단어는 그대로, 공백만 있으면 빈 목록)"""
+    assert tokenize("테스트 게시글") == ["테스", "스트", "게시", "시글"]
+    assert tokenize("Safari 앱") == ["sa", "af", "fa", "ar", "ri", "앱"]
+    assert tokenize("   ") == []
+
+def test_search_ranks_and_requires_all_terms():
+    """질의의 모든 bigram이 있는 문서만, 제목 일치가 더 높은 점수"""
+    index = InvertedIndex()
+    index.add(1, "사파리 프리셋", "자동 저장 설정")
+    index.add(2, "일상", "오늘 사파리 프리셋을 바꿨다 사파리")
+    index.add(3, "사파리", "관련 없음")
+
+    hits, total = index.search("사파리 프리셋")
+    assert total == 2
+    assert [key for key, _ in hits] == [1, 2]  # ✅ 제목 일치가 더 높은 점수
+    assert index.search("없는 단어")[1] == 0
+
+def test_search_reflects_updates_and_removals():
+    """교체/삭제한 문서는 검색되지 않고, compact 후 posting에서도 빠짐"""
+    index = InvertedIndex()
+    index.add("a", "첫 글", "테스트 게시글")
+    index.add("b", "둘째 글", "테스트 게시글")
+    index.add("a", "첫 글", "수정된 본문")
+    assert [key for key, _ in index.search("테스트")[0]] == ["b"]
+
+    index.remove("b")
+    assert index.search("테스트") == ([], 0)
+    index.compact()
+    assert "테스" not in index._postings
+
+def test_search_paginates():
+    """offset/limit 페이지끼리 겹치지 않고 total은 전체 일치 수"""
+    index = InvertedIndex()
+    for i in range(5):
+        index.add(i, f"게시글 {i}", "검색 " * (i + 1))
+    first, total = index.search("검색", limit=2)
+    second, _ = index.search("검색", limit=2, offset=2)
+    assert total == 5
+    assert len(first) == 2 and len(second) == 2
+    assert not {key for key, _ in first} & {key for key, _ in second}
+
+def test_search_evicts_oldest_and_compacts_in_batches():
+    """오래전에 색인된 문서부터 밀려나고, term 묶음별 정리로도 posting이 모두 정리됨"""
+    index = InvertedIndex()
+    for i in range(5):
+        index.add(i, "검색", f"게시글 {i}")
+    index.evict_oldest(2)
+    assert 0 not in index and 1 not in index and 4 in index
+    assert index.search("검색")[1] == 3
+
+    terms = index.begin_compaction()
+    index.compact_terms(terms[:1])
+    index.compact_terms(terms[1:])
+    assert all(set(posting) <= set(index._docs) for posting in index._postings.values())
+
+def test_post_search_sync_applies_other_workers_deletes(monkeypatch):
+    """다른 워커에서 삭제된 게시글은 post_deletions 기록으로 색인에서 빠짐"""
+    import asyncio
+    from datetime import datetime
+    from bson import ObjectId
+    from app.services import search_service
+    from app.services.search_service import PostSearch
+
+    kept, deleted = ObjectId(), ObjectId()
+
+    class FakeCursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def __aiter__(self):
+            async def iterate():
+                for doc in self.docs:
+                    yield doc
+            return iterate()
+
+    class FakeCollection:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def find(self, query, projection):
+            return FakeCursor(self.docs)
+
+    monkeypatch.setattr(search_service, "posts_collection", FakeCollection([]))
+    monkeypatch.setattr(search_service, "post_deletions_collection", FakeCollection([{"_id": deleted}]))
+
+    async def run():
+        search = PostSearch(sync_interval=0, max_posts=10)
+        search.index_post({"_id": kept, "title": "남은 글", "content": "검색", "is_public": True})
+        search.index_post({"_id": deleted, "title": "지운 글", "content": "검색", "is_public": True})
+        search._synced_at = datetime.utcnow()
+        await search.sync()
+        return search.search("검색", 10, 0)
+
+    assert asyncio.run(run()) == ([kept], 1)
+
+def test_post_search_falls_back_to_older_posts_outside_the_index(monkeypatch):
+    """색인 상한으로 빠진 오래된 글은 경계 이전 구간의 Mongo 조회로 찾고, 이미 색인된 글은 제외"""
+    import asyncio
+    from datetime import datetime
+    from bson import ObjectId
+    from app.services import search_service
+    from app.services.search_service import PostSearch
+
+    old_post = ObjectId.from_datetime(datetime(2020, 1, 1))
+    new_posts = [ObjectId() for _ in range(2)]
+    queries = []
+
+    class FakeCursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        def sort(self, keys):
+            return self
+
+        def skip(self, count):
+            return self
+
+        def limit(self, count):
+            return self
+
+        def max_time_ms(self, ms):
+            return self
+
+        async def to_list(self, length):
+            return self.docs
+
+    class FakePosts:
+        def find(self, query, projection):
+            queries.append(query)
+            return FakeCursor([{"_id": old_post}, {"_id": new_posts[1]}])
+
+    monkeypatch.setattr(search_service, "posts_collection", FakePosts())
+
+    async def run():
+        search = PostSearch(sync_interval=0, max_posts=2)
+        search.index_post({"_id": old_post, "title": "오래된 글", "content": "검색", "is_public": True})
+        for post_id in new_posts:
+            search.index_post({"_id": post_id, "title": "새 글", "content": "검색", "is_public": True})
+        assert old_post not in search.index
+        assert search.indexed_since == datetime(2020, 1, 1)
+        return await search.search_older("검색 Safari", 0, 10, {"title": 1})
+
+    older = asyncio.run(run())
+    assert older == [{"_id": old_post}]  # ✅ 색인에 있는 글은 색인 결과에서만
+    query = queries[0]
+    assert query["created_at"] == {"$lt": datetime(2020, 1, 1)}
+    assert [condition["$or"][0]["title"]["$regex"] for condition in query["$and"]] == ["검색", "safari"]
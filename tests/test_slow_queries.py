@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+import logging
+from datetime import datetime
+from types import SimpleNamespace
+from bson import ObjectId
+from app.core.slow_queries import SlowQueryLog, query_shape, summarize_plan
+
+_request_ids = itertools.count(1)
+
+def _run(log: SlowQueryLog, command: dict, duration_ms: float, reply=None):
+    """드라이버가 명령 하나를 실행할 때의 리스너 호출 흉내"""
+    name = next(iter(command))
+    event = SimpleNamespace(
+        connection_id=("localhost", 27017), request_id=next(_request_ids), command_name=name, command=command,
+        database_name="safari_db", duration_micros=int(duration_ms * 1000),
+        reply=reply if reply is not None else {"cursor": {"firstBatch": [{}, {}]}, "ok": 1},
+    )
+    log.started(event)
+    log.succeeded(event)
+
+class FakeDatabase:
+    """explain 명령을 기록하는 가짜 DB"""
+
+    def __init__(self):
+        self.commands = []
+        self.client = {"safari_db": self}
+
+    async def command(self, command):
+        self.commands.append(command)
+        return {
+            "queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "email_1"}}},
+            "executionStats": {"nReturned": 1, "totalKeysExamined": 1, "totalDocsExamined": 1, "executionTimeMillis": 0},
+        }
+
+def test_query_shape_redacts_values():
+    """조건 값은 타입 이름으로 가리고 배열은 원소 모양 하나로"""
+    shape = query_shape({"email": "a@b.c", "_id": {"$in": [ObjectId(), ObjectId()]}, "created_at": {"$lt": datetime.utcnow()}})
+    assert shape == {"email": "?str", "_id": {"$in": ["?ObjectId"]}, "created_at": {"$lt": "?datetime"}}
+
+def test_slow_command_is_logged_with_shape(caplog):
+    """SLOW_QUERY_MS를 넘은 명령만 조건 모양과 함께 기록 (값은 남기지 않음)"""
+    log = SlowQueryLog(threshold_ms=50, sample_rate=1.0, explains_per_minute=10)
+    with caplog.at_level(logging.WARNING, logger="app.core.slow_queries"):
+        _run(log, {"find": "users", "filter": {"email": "secret@example.com"}, "lsid": {}}, duration_ms=10)
+        _run(log, {"find": "users", "filter": {"email": "secret@example.com"}, "lsid": {}}, duration_ms=80)
+    assert log.stats["slow"] == 1
+    assert '"collection":"users"' in caplog.text and '"filter_shape":{"email":"?str"}' in caplog.text
+    assert '"returned":2' in caplog.text
+    assert "secret@example.com" not in caplog.text  # ✅ 값은 남기지 않음
+
+def test_explain_runs_once_per_shape_within_rate_limit(caplog):
+    """같은 모양은 explain 한 번, 분당 상한을 넘는 모양은 건너뜀"""
+    log = SlowQueryLog(threshold_ms=50, sample_rate=1.0, explains_per_minute=2)
+    database = FakeDatabase()
+
+    async def scenario():
+        await log.start(database)
+        for email in ("a@example.com", "b@example.com"):  # 같은 모양 → explain 한 번
+            _run(log, {"find": "users", "filter": {"email": email}, "lsid": {}, "$db": "safari_db"}, duration_ms=120)
+        for field in ("name", "category_id", "created_by"):  # 서로 다른 모양 3개, 분당 상한 2
+            _run(log, {"find": "programs", "filter": {field: "x"}}, duration_ms=120)
+        await asyncio.sleep(0)  # call_soon_threadsafe로 넘긴 작업 반영
+        await log._queue.join()
+        await log.stop()
+
+    with caplog.at_level(logging.INFO, logger="app.core.slow_queries.plans"):
+        asyncio.run(scenario())
+    assert len(database.commands) == 2
+    assert database.commands[0] == {"explain": {"find": "users", "filter": {"email": "a@example.com"}}, "verbosity": "executionStats"}
+    assert log.stats["deduplicated"] == 1 and log.stats["rate_limited"] == 2
+    assert "IXSCAN(email_1)" in caplog.text
+
+def test_explained_shapes_evict_least_recently_seen():
+    """explain한 모양 목록은 LRU: 다시 느려진 모양은 오래 남고, 가장 오래 안 보인 모양이 밀려남"""
+    log = SlowQueryLog(threshold_ms=50, sample_rate=1.0, explains_per_minute=10, seen_shapes=2)
+    database = FakeDatabase()
+
+    async def scenario():
+        await log.start(database)
+        for field in ("a", "b"):
+            _run(log, {"find": "posts", "filter": {field: 1}}, duration_ms=120)
+            await asyncio.sleep(0)
+            await log._queue.join()
+        _run(log, {"find": "posts", "filter": {"a": 1}}, duration_ms=120)  # a 다시 사용
+        await asyncio.sleep(0)
+        _run(log, {"find": "posts", "filter": {"c": 1}}, duration_ms=120)  # b가 밀려남
+        await asyncio.sleep(0)
+        await log._queue.join()
+        _run(log, {"find": "posts", "filter": {"a": 1}}, duration_ms=120)
+        await asyncio.sleep(0)
+        await log._queue.join()
+        await log.stop()
+
+    asyncio.run(scenario())
+    assert [command["explain"]["filter"] for command in database.commands] == [{"a": 1}, {"b": 1}, {"c": 1}]
+
+def test_summarize_aggregate_plan():
+    """aggregate explain은 첫 $cursor stage에서 계획/실행 통계를 읽음"""
+    explain = {"stages": [{"$cursor": {
+        "queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}}},
+        "executionStats": {"nReturned": 5, "totalKeysExamined": 0, "totalDocsExamined": 5000, "executionTimeMillis": 12},
+    }}]}
+    summary = summarize_plan(explain)
+    assert summary["stages"] == ["COLLSCAN"] and summary["docs_examined"] == 5000
+
+def test_explain_stats_are_exported(monkeypatch):
+    """explain 수집 상태(버림/상한 초과/실패)가 /metrics 출력에 포함"""
+    from app.core.metrics import render_metrics
+    from app.core.slow_queries import slow_query_log
+
+    monkeypatch.setitem(slow_query_log.stats, "dropped", 3)
+    monkeypatch.setitem(slow_query_log.stats, "rate_limited", 5)
+    text = render_metrics()
+    assert "mongodb_slow_query_explains_dropped_total 3\n" in text
+    assert "mongodb_slow_query_explains_rate_limited_total 5\n" in text
+    assert "mongodb_slow_query_explains_failed_total 0\n" in text
@@ -0,0 +1,57 @@
+import gzip
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+from app.core.static import CachedStaticFiles, IMMUTABLE_CACHE_CONTROL
+
+CONTENT_NAME = "ab" * 32 + ".png"
+
+def make_client(tmp_path):
+    (tmp_path / CONTENT_NAME).write_bytes(b"0123456789" * 10)
+    (tmp_path / "legacy.txt").write_bytes(b"hello world")
+    (tmp_path / "legacy.txt.gz").write_bytes(gzip.compress(b"hello world"))
+    app = Starlette()
+    app.mount("/static", CachedStaticFiles(directory=str(tmp_path)))
+    return TestClient(app)
+
+def test_content_named_files_are_immutable(tmp_path):
+    """내용 해시 이름의 파일은 immutable 캐시 + 파일 이름 기반 ETag"""
+    client = make_client(tmp_path)
+    response = client.get(f"/static/{CONTENT_NAME}", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{CONTENT_NAME}"'
+
+    not_modified = client.get(f"/static/{CONTENT_NAME}", headers={"If-None-Match": response.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+def test_range_request(tmp_path):
+    """Range 요청은 206 부분 응답"""
+    client = make_client(tmp_path)
+    response = client.get(f"/static/{CONTENT_NAME}", headers={"Range": "bytes=10-19", "Accept-Encoding": "identity"})
+    assert response.status_code == 206
+    assert response.content == b"0123456789"
+
+def test_precompressed_sibling(tmp_path):
+    """.gz 파일이 있고 클라이언트가 gzip을 허용하면 압축 파일을 그대로 전송"""
+    client = make_client(tmp_path)
+    response = client.get("/static/legacy.txt", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert response.text == "hello world"  # 클라이언트가 압축 해제
+
+    plain = client.get("/static/legacy.txt", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == b"hello world"
+
+def test_uploads_live_under_the_static_mount():
+    """업로드는 /static 마운트 디렉터리(app/static) 안에 저장되고 URL도 같은 경로 (실행 위치와 무관)"""
+    import os
+    from app.core.static import STATIC_DIR, STATIC_URL
+    from app.services import upload_service
+
+    assert os.path.isabs(upload_service.UPLOAD_FOLDER)
+    assert os.path.dirname(upload_service.UPLOAD_FOLDER) == STATIC_DIR
+    assert upload_service.UPLOAD_URL == f"{STATIC_URL}/{os.path.basename(upload_service.UPLOAD_FOLDER)}"
+    assert upload_service.blob_name_from_url(f"{upload_service.UPLOAD_URL}/{CONTENT_NAME}") == CONTENT_NAME
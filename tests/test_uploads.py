@@ -0,0 +1,87 @@
+import asyncio
+import io
+import pytest
+from starlette.datastructures import UploadFile
+from app.core.images import variant_filename
+from app.services import post_service, upload_service
+
+def _save(content: bytes, filename: str = "a.png") -> str:
+    return asyncio.run(upload_service.save_image(UploadFile(io.BytesIO(content), filename=filename)))
+
+def _name(url: str) -> str:
+    return upload_service.blob_name_from_url(url)
+
+def test_save_image_retains_and_release_marks_unreferenced(uploads):
+    """save_image가 돌려준 경로는 참조 1개, 같은 내용을 다시 올리면 참조 수만 증가"""
+    first = _save(b"meme")
+    second = _save(b"meme", "b.png")
+    assert first == second
+    assert uploads.docs[_name(first)]["refcount"] == 2
+
+    asyncio.run(upload_service.release_upload(first))
+    assert "unreferenced_at" not in uploads.docs[_name(first)]
+    asyncio.run(upload_service.release_upload(first))
+    assert uploads.docs[_name(first)]["refcount"] == 0
+    assert "unreferenced_at" in uploads.docs[_name(first)]
+
+def test_gc_removes_only_unreferenced_files_and_variants(uploads, tmp_path):
+    """GC는 참조가 없는 파일과 파생 이미지만 지우고 참조 중인 파일은 남김"""
+    kept = _save(b"kept")
+    dropped = _save(b"dropped")
+    (tmp_path / variant_filename(_name(dropped), "thumb")).write_bytes(b"thumb")
+    asyncio.run(upload_service.release_upload(dropped))
+
+    assert asyncio.run(upload_service.collect_unreferenced_uploads(grace_seconds=0)) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [_name(kept)]
+    assert _name(dropped) not in uploads.docs
+
+def test_save_image_rewrites_file_removed_by_gc(uploads, tmp_path):
+    """GC가 문서와 파일을 지운 뒤 같은 내용을 올리면 파일을 다시 씀"""
+    url = _save(b"again")
+    asyncio.run(upload_service.release_upload(url))
+    asyncio.run(upload_service.collect_unreferenced_uploads(grace_seconds=0))
+    assert not (tmp_path / _name(url)).exists()
+
+    assert _save(b"again") == url
+    assert (tmp_path / _name(url)).read_bytes() == b"again"
+    assert uploads.docs[_name(url)]["refcount"] == 1
+
+def test_gc_restores_file_referenced_during_collection(uploads, tmp_path):
+    """GC가 문서를 지운 직후 save_image가 다시 참조하면 GC는 파일을 되돌림"""
+    url = _save(b"race")
+    asyncio.run(upload_service.release_upload(url))
+    original_delete = uploads.find_one_and_delete
+
+    async def delete_then_reupload(query, projection=None):
+        deleted = await original_delete(query, projection)
+        await upload_service.save_image(UploadFile(io.BytesIO(b"race"), filename="a.png"))
+        return deleted
+
+    uploads.find_one_and_delete = delete_then_reupload
+    assert asyncio.run(upload_service.collect_unreferenced_uploads(grace_seconds=0)) == 0
+    assert (tmp_path / _name(url)).read_bytes() == b"race"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [_name(url)]  # 임시(.gc) 파일 없음
+    assert uploads.docs[_name(url)]["refcount"] == 1
+
+def test_failed_write_releases_reference(uploads, monkeypatch):
+    """파일 쓰기에 실패하면 잡아 둔 참조를 놓아 GC가 정리할 수 있게"""
+    async def failing_write(file, file_location):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(upload_service, "_write_upload", failing_write)
+    with pytest.raises(OSError):
+        _save(b"lost")
+    (doc,) = uploads.docs.values()
+    assert doc["refcount"] == 0 and "unreferenced_at" in doc  # ✅ GC가 정리할 수 있음
+
+def test_create_post_releases_image_when_insert_fails(uploads, monkeypatch):
+    """게시글 저장에 실패하면 업로드한 이미지 참조를 놓음"""
+    class FailingPosts:
+        async def insert_one(self, post):
+            raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(post_service, "posts_collection", FailingPosts())
+    with pytest.raises(RuntimeError):
+        asyncio.run(post_service.create_post("t", "c", None, True, "a@example.com", UploadFile(io.BytesIO(b"img"), filename="a.png")))
+    (doc,) = uploads.docs.values()
+    assert doc["refcount"] == 0